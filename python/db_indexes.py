@@ -0,0 +1,304 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Správa indexov podľa schémy SCUM.db + audit plánov dotazov ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Namiesto slepého CREATE INDEX pri každom štarte:
+#   1. odtlačok schémy (stĺpce tabuliek + verzia hráčskej entity v1.1 / v1.2),
+#   2. z neho odvodené indexy presne pre naše dotazy (covering, prefix idx_aq_),
+#      index sa nevytvára ak ho už pokrýva existujúci index hry alebo primárny kľúč,
+#   3. EXPLAIN QUERY PLAN report do logu,
+#   4. chýbajúce indexy sa stavajú na pozadí vlastným RW spojením s priebehom a zrušením.
+import sqlite3
+import hashlib
+import threading
+import time
+
+# Verzia hráčskej entity podľa class v tabuľke entity
+PRISONER_CLASSES = (("v1.2", "BP_Prisoner_ES"), ("v1.1", "FPrisonerEntity"))
+
+# Tabuľky, ktoré čítame
+WATCHED_TABLES = ("entity", "entity_system", "active_quest", "tracking_data")
+
+# Indexy, ktoré vytvárali staršie verzie modulu. Zmažú sa, len ak ich SQL sedí presne
+# (idx_entity_system_id bol deklarovaný dvakrát - druhý na entity_system(id) nikdy nevznikol).
+LEGACY_INDEXES = {
+    "idx_entity_flags": "CREATE INDEX idx_entity_flags ON entity(flags)",
+    "idx_entity_system_id": "CREATE INDEX idx_entity_system_id ON entity(entity_system_id)",
+    "idx_entity_system_user_profile_id": "CREATE INDEX idx_entity_system_user_profile_id ON entity_system(user_profile_id)",
+    "idx_active_quest_user_profile_id": "CREATE INDEX idx_active_quest_user_profile_id ON active_quest(user_profile_id)",
+    "idx_active_quest_id": "CREATE INDEX idx_active_quest_id ON active_quest(id)",
+    "idx_tracking_data_set_id": "CREATE INDEX idx_tracking_data_set_id ON tracking_data(tracking_data_set_id)",
+}
+
+# Po koľkých VM inštrukciách sa volá progress handler (priebeh / zrušenie)
+PROGRESS_STEPS = 20000
+
+
+# ////---- Odtlačok schémy ----////
+def _table_columns(conn, table):
+    rows = conn.execute(f"PRAGMA table_info({table});").fetchall()
+    # (cid, name, type, notnull, dflt_value, pk)
+    return [(r[1], (r[2] or "").upper(), r[5]) for r in rows]
+
+
+def schema_fingerprint(conn):
+    """
+    Vráti dict: version ("v1.2" / "v1.1" / "unknown"), prisoner_class, tables
+    ({tabuľka: [stĺpce]}), rowid_pk ({tabuľka: stĺpec INTEGER PRIMARY KEY}) a hash.
+    """
+    tables, rowid_pk = {}, {}
+    for table in WATCHED_TABLES:
+        columns = _table_columns(conn, table)
+        if not columns:
+            continue
+        tables[table] = [name for name, _type, _pk in columns]
+        pk_columns = [(name, col_type) for name, col_type, pk in columns if pk]
+        if len(pk_columns) == 1 and pk_columns[0][1] == "INTEGER":
+            rowid_pk[table] = pk_columns[0][0]
+
+    version, prisoner_class = "unknown", None
+    if "class" in tables.get("entity", ()):
+        for candidate_version, candidate_class in PRISONER_CLASSES:
+            row = conn.execute("SELECT 1 FROM entity WHERE class = ? LIMIT 1", (candidate_class,)).fetchone()
+            if row:
+                version, prisoner_class = candidate_version, candidate_class
+                break
+
+    digest = hashlib.sha1(repr((version, sorted(tables.items()), sorted(rowid_pk.items()))).encode("utf-8")).hexdigest()
+    return {
+        "version": version,
+        "prisoner_class": prisoner_class,
+        "tables": tables,
+        "rowid_pk": rowid_pk,
+        "hash": digest[:16],
+    }
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Indexy odvodené z našich dotazov ----////
+class IndexSpec:
+    def __init__(self, name, table, columns, reason):
+        self.name = name
+        self.table = table
+        self.columns = tuple(columns)
+        self.reason = reason
+
+    @property
+    def sql(self):
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table}({', '.join(self.columns)})"
+
+    def __repr__(self):
+        return f"IndexSpec({self.name} ON {self.table}{self.columns})"
+
+
+_INDEX_CANDIDATES = (
+    # detekcia aktívneho hráča: WHERE class = ? AND flags = 0 -> entity_system_id
+    IndexSpec("idx_aq_entity_prisoner", "entity", ("class", "flags", "entity_system_id"), "active player lookup"),
+    # user_profile_id podľa entity_system.id (ak id nie je rowid)
+    IndexSpec("idx_aq_entity_system_id", "entity_system", ("id", "user_profile_id"), "profile by entity_system id"),
+    # čas sveta: WHERE user_profile_id = ? -> timestamp
+    IndexSpec("idx_aq_entity_system_profile", "entity_system", ("user_profile_id", "timestamp"), "world timestamp"),
+    # questy hráča
+    IndexSpec("idx_aq_active_quest_profile", "active_quest", ("user_profile_id",), "active quests"),
+    # tracking BLOBy: WHERE tracking_data_set_id = ? ORDER BY id -> data
+    IndexSpec("idx_aq_tracking_data_set", "tracking_data", ("tracking_data_set_id", "id", "data"), "tracking data"),
+)
+
+
+def required_indexes(fingerprint):
+    """Indexy pre našu schému - len tie, ktorých tabuľka a stĺpce existujú."""
+    tables = fingerprint.get("tables", {})
+    rowid_pk = fingerprint.get("rowid_pk", {})
+    specs = []
+    for spec in _INDEX_CANDIDATES:
+        columns = tables.get(spec.table)
+        if not columns or any(c not in columns for c in spec.columns):
+            continue
+        # vyhľadanie podľa INTEGER PRIMARY KEY je priamo v B-strome tabuľky
+        if rowid_pk.get(spec.table) == spec.columns[0]:
+            continue
+        specs.append(spec)
+    return specs
+
+
+def _existing_indexes(conn, table):
+    """{názov: (stĺpce)} pre všetky indexy tabuľky (vrátane automatických)."""
+    result = {}
+    for row in conn.execute(f"PRAGMA index_list({table});").fetchall():
+        name = row[1]
+        columns = tuple(info[2] for info in conn.execute(f"PRAGMA index_info('{name}');").fetchall())
+        result[name] = columns
+    return result
+
+
+def missing_indexes(conn, specs, ignore=()):
+    """
+    Specs, ktoré nepokrýva žiadny existujúci index (rovnaké stĺpce ako prefix).
+    ignore - indexy, ktoré sa nerátajú ako pokrytie (staré indexy modulu určené na zmazanie).
+    """
+    missing = []
+    cache = {}
+    for spec in specs:
+        if spec.table not in cache:
+            cache[spec.table] = {name: columns for name, columns in _existing_indexes(conn, spec.table).items()
+                                 if name not in ignore}
+        existing = cache[spec.table]
+        if spec.name in existing:
+            continue
+        if any(columns[:len(spec.columns)] == spec.columns for columns in existing.values()):
+            continue
+        missing.append(spec)
+    return missing
+
+
+def legacy_indexes(conn):
+    """Názvy starých indexov modulu, ktoré sa dajú bezpečne zmazať (SQL sa zhoduje)."""
+    found = []
+    for name, expected in LEGACY_INDEXES.items():
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone()
+        if row and row[0] and " ".join(row[0].split()) == expected:
+            found.append(name)
+    return found
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Audit plánov (EXPLAIN QUERY PLAN) ----////
+def audited_queries(fingerprint):
+    """Dotazy zo scan slučky (logic.py) s ukážkovými parametrami."""
+    prisoner_class = fingerprint.get("prisoner_class") or PRISONER_CLASSES[0][1]
+    return (
+        ("active_player", "SELECT entity_system_id FROM entity WHERE class = ? AND flags = 0", (prisoner_class,)),
+        ("profile_by_system", "SELECT user_profile_id FROM entity_system WHERE id = ?", (0,)),
+        ("world_timestamp", "SELECT timestamp FROM entity_system WHERE user_profile_id = ?", (0,)),
+        ("active_quests", "SELECT id, sector, completion_deadline, quest_data_asset_path, auto_complete "
+                          "FROM active_quest WHERE user_profile_id = ?", (0,)),
+        ("tracking_data", "SELECT data FROM tracking_data WHERE tracking_data_set_id = ? ORDER BY id", (0,)),
+    )
+
+
+def explain_report(conn, fingerprint):
+    """
+    Vráti zoznam (názov, plán, ok). ok = False ak dotaz prechádza celú tabuľku
+    alebo triedi cez dočasný B-strom.
+    """
+    report = []
+    for name, sql, params in audited_queries(fingerprint):
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        except sqlite3.Error as e:
+            report.append((name, f"error: {e}", False))
+            continue
+        details = [r[-1] for r in rows]
+        plan = "; ".join(details)
+        ok = not any(d.startswith("SCAN") or "TEMP B-TREE" in d for d in details)
+        report.append((name, plan, ok))
+    return report
+
+
+def report_ok(report):
+    """Všetky auditované dotazy idú cez index (žiadny SCAN / TEMP B-TREE ani chyba)."""
+    return bool(report) and all(ok for _name, _plan, ok in report)
+
+
+def format_report(report):
+    return [f"{'OK  ' if ok else 'SLOW'} {name}: {plan}" for name, plan, ok in report]
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Stavba indexov na pozadí ----////
+class IndexBuilder(threading.Thread):
+    """
+    Vytvorí chýbajúce indexy vlastným krátkym RW spojením. cancel() preruší práve
+    bežiaci CREATE INDEX cez progress handler (SQLite ho vráti späť).
+    """
+
+    def __init__(self, db_path, fingerprint, log=print, drop_legacy=True, timeout=1, on_done=None):
+        super().__init__(name="ActiveQuestsIndexBuilder", daemon=True)
+        self.db_path = db_path
+        self.fingerprint = fingerprint
+        self.log = log
+        self.on_done = on_done
+        self.drop_legacy = drop_legacy
+        self.timeout = timeout
+
+        self.created = []
+        self.dropped = []
+        self.report = []
+        self.error = None
+        self.complete = False
+        self.current = None
+        self.steps = 0
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def _progress(self):
+        self.steps += 1
+        return 1 if self._cancel.is_set() else 0
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout)
+        except sqlite3.Error as e:
+            self.error = e
+            self.log(f"[ActiveQuests] Indexy: nepodarilo sa otvoriť databázu: {e}")
+            return
+        try:
+            conn.set_progress_handler(self._progress, PROGRESS_STEPS)
+            legacy = legacy_indexes(conn) if self.drop_legacy else []
+            # staré indexy sa zmažú, takže ich pokrytie sa nepočíta - inak by po DROP tabuľka ostala bez indexu
+            specs = missing_indexes(conn, required_indexes(self.fingerprint), ignore=legacy)
+
+            for i, spec in enumerate(specs, 1):
+                if self._cancel.is_set():
+                    break
+                self.current = spec.name
+                started = time.perf_counter()
+                self.log(f"[ActiveQuests] Indexy: vytváram {spec.name} ({i}/{len(specs)}, {spec.reason})")
+                conn.execute(spec.sql)
+                conn.commit()
+                self.created.append(spec.name)
+                self.log(f"[ActiveQuests] Indexy: {spec.name} hotový za {time.perf_counter() - started:.2f}s")
+            self.current = None
+
+            # staré indexy len spomaľujú zápisy hry - zmazať až keď nové existujú
+            if not self._cancel.is_set() and len(self.created) == len(specs):
+                for name in legacy:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+                    self.dropped.append(name)
+                conn.commit()
+                if self.dropped:
+                    self.log(f"[ActiveQuests] Indexy: zmazané staré {', '.join(self.dropped)}")
+
+            if self._cancel.is_set():
+                self.log(f"[ActiveQuests] Indexy: zrušené (hotové: {', '.join(self.created) or '-'})")
+            else:
+                self.report = explain_report(conn, self.fingerprint)
+                self.complete = len(self.created) == len(specs) and report_ok(self.report)
+                for line in format_report(self.report):
+                    self.log(f"[ActiveQuests] Plan {line}")
+        except sqlite3.Error as e:
+            self.error = e
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            if self._cancel.is_set():
+                self.log(f"[ActiveQuests] Indexy: zrušené počas {self.current}")
+            else:
+                self.log(f"[ActiveQuests] Indexy: chyba pri {self.current or 'kontrole'}: {e}")
+        finally:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            if self.on_done:
+                try:
+                    self.on_done(self)
+                except Exception as e:
+                    self.log(f"[ActiveQuests] Indexy: chyba v on_done: {e}")
+# ////-----------------------------------------------------------------------------------------
@@ -0,0 +1,96 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Súkromná kópia SCUM.db cez SQLite online backup API ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Voliteľný režim (config "db_snapshot": "memory" / "tmpfs"). Databáza hry sa po krokoch
+# (pages=N, pauza medzi krokmi) kopíruje do pamäte alebo na tmpfs a všetky dotazy bežia nad
+# touto kópiou. Čítanie tak nikdy nečaká na zámky hry a nebrzdí jej checkpointy.
+# Kópia sa obnovuje iba keď sa zdrojová DB zmenila (PRAGMA data_version).
+import os
+import sqlite3
+import tempfile
+
+# Koľkokrát sa môže krokovaný backup reštartovať (hra zapísala počas kopírovania),
+# potom sa DB skopíruje naraz jedným krokom.
+MAX_BACKUP_RESTARTS = 3
+
+
+class _BackupRestarted(Exception):
+    pass
+
+
+def _tmpfs_dir():
+    for candidate in ("/dev/shm", os.environ.get("XDG_RUNTIME_DIR")):
+        if candidate and os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+            return candidate
+    return tempfile.gettempdir()
+
+
+class SnapshotSource:
+    def __init__(self, source_conn, target="memory", pages=1024, step_sleep=0.005):
+        self.source = source_conn
+        self.target = target
+        self.pages = pages
+        self.step_sleep = step_sleep
+        self.refresh_count = 0
+
+        if target == "tmpfs":
+            self.path = os.path.join(_tmpfs_dir(), f"activequests_snapshot_{os.getpid()}.db")
+        else:
+            self.path = ":memory:"
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._data_version = None
+
+    def _data_version_now(self):
+        return self.source.execute("PRAGMA data_version;").fetchone()[0]
+
+    def refresh(self, force=False):
+        """Obnoví kópiu ak sa zdroj zmenil. Vráti True ak sa kopírovalo."""
+        data_version = self._data_version_now()
+        if not force and data_version == self._data_version:
+            return False
+
+        state = {"remaining": None, "restarts": 0}
+
+        def progress(_status, remaining, _total):
+            last = state["remaining"]
+            if last is not None and remaining > last:
+                state["restarts"] += 1
+                if state["restarts"] > MAX_BACKUP_RESTARTS:
+                    raise _BackupRestarted()
+            state["remaining"] = remaining
+
+        try:
+            self.source.backup(self.conn, pages=self.pages, progress=progress, sleep=self.step_sleep)
+        except _BackupRestarted:
+            # hra zapisuje priebežne - skopíruj naraz (jedna krátka čítacia transakcia)
+            self.source.backup(self.conn, pages=-1)
+
+        self._data_version = data_version
+        self.refresh_count += 1
+        return True
+
+    def close(self):
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+        if self.path != ":memory:":
+            for suffix in ("", "-journal", "-wal", "-shm"):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
+
+
+def create_snapshot_source(source_conn, config_json):
+    """Vráti SnapshotSource podľa configu alebo None (režim vypnutý)."""
+    mode = config_json.get("db_snapshot", "off")
+    if mode not in ("memory", "tmpfs"):
+        return None
+    return SnapshotSource(
+        source_conn,
+        target=mode,
+        pages=int(config_json.get("db_snapshot_pages", 1024)),
+        step_sleep=float(config_json.get("db_snapshot_step_sleep", 0.005))
+    )
@@ -0,0 +1,195 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Sledovanie zmien SCUM.db (inotify na Linuxe, inak časový polling) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Na Linuxe (Proton inštalácie) sa sleduje priečinok s SCUM.db cez inotify. Zápis hry do
+# SCUM.db / SCUM.db-wal / SCUM.db-shm zobudí scan vlákno do pár milisekúnd, séria zápisov
+# sa zlúči (debounce) do jedného scanu. Keď hra nič nezapisuje, vlákno spí. Ak inotify nie
+# je k dispozícii alebo je DB na sieťovom FS (udalosti by nechodili), použije sa polling.
+import os
+import time
+import errno
+import select
+import struct
+import platform
+
+# inotify konštanty (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Súborové systémy, kde inotify nedostane zmeny (zápis z iného stroja / hosta)
+UNSUPPORTED_FS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "afs", "ceph", "fuse.sshfs", "fuse.rclone"}
+
+# Ako často sa počas čakania kontroluje stop_event
+STOP_CHECK_INTERVAL = 0.5
+# Maximálne zdržanie scanu počas nepretržitej série zápisov
+MAX_DEBOUNCE = 2.0
+
+
+# ////---- Časový polling (fallback) ----////
+class PollingWatcher:
+    mode = "poll"
+
+    def __init__(self, reason=""):
+        self.reason = reason
+
+    def wait(self, timeout, stop_event=None):
+        """Počká timeout sekúnd (alebo na stop_event). Zmeny nedetekuje - vracia False."""
+        if stop_event is not None:
+            stop_event.wait(timeout)
+        else:
+            time.sleep(timeout)
+        return False
+
+    def close(self):
+        pass
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- inotify ----////
+def _filesystem_type(path):
+    """Typ FS pre cestu podľa /proc/self/mounts (najdlhší mount point)."""
+    try:
+        path = os.path.realpath(path)
+        best, fstype = "", None
+        with open("/proc/self/mounts", "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                mount_point = parts[1].replace("\\040", " ")
+                if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) >= len(best):
+                    best, fstype = mount_point, parts[2]
+        return fstype
+    except Exception:
+        return None
+
+
+class InotifyWatcher:
+    mode = "inotify"
+
+    def __init__(self, db_path, debounce=0.25):
+        import ctypes
+        import ctypes.util
+
+        self.db_path = db_path
+        self.debounce = debounce
+        self.directory = os.path.dirname(os.path.abspath(db_path))
+        base = os.path.basename(db_path)
+        self.names = {base, f"{base}-wal", f"{base}-shm"}
+        self._shm_name = f"{base}-shm"
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        wd = libc.inotify_add_watch(fd, os.fsencode(self.directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch failed for {self.directory}")
+        self._buffer = b""
+
+    def _read_events(self):
+        """Prečíta dostupné udalosti; vráti True ak sa týkali DB súborov."""
+        relevant = False
+        while True:
+            try:
+                chunk = os.read(self._fd, 64 * 1024)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not chunk:
+                break
+            data = self._buffer + chunk
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                end = offset + _EVENT_HEADER.size + length
+                if end > len(data):
+                    break
+                name = data[offset + _EVENT_HEADER.size:end].rstrip(b"\0").decode("utf-8", "replace")
+                offset = end
+                if mask & IN_Q_OVERFLOW:
+                    relevant = True
+                elif name in self.names:
+                    # -shm mení aj čítajúci proces (wal-index) - berieme len vytvorenie/zmazanie
+                    if name == self._shm_name and not (mask & ~(IN_MODIFY | IN_CLOSE_WRITE)):
+                        continue
+                    relevant = True
+            self._buffer = data[offset:]
+        return relevant
+
+    def _select(self, timeout):
+        try:
+            readable, _w, _x = select.select([self._fd], [], [], max(0.0, timeout))
+        except InterruptedError:
+            return False
+        return bool(readable)
+
+    def wait(self, timeout, stop_event=None):
+        """
+        Čaká na zápis hry do DB najviac timeout sekúnd. Po prvej udalosti ešte počká,
+        kým zápisy na debounce sekúnd neutíchnu. Vráti True ak bola zmena.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._select(min(remaining, STOP_CHECK_INTERVAL)) and self._read_events():
+                break
+
+        # debounce - zlúč sériu zápisov do jedného scanu
+        burst_end = time.monotonic() + MAX_DEBOUNCE
+        while time.monotonic() < burst_end:
+            if stop_event is not None and stop_event.is_set():
+                break
+            if not self._select(self.debounce):
+                break
+            self._read_events()
+        return True
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+# ////-----------------------------------------------------------------------------------------
+
+
+def create_watcher(db_path, mode="auto", debounce=0.25):
+    """
+    mode: "auto" (inotify ak sa dá), "inotify" (rovnako, len hlási chybu), "poll".
+    Vráti watcher s atribútom mode a (pri fallbacku) reason.
+    """
+    if mode == "poll":
+        return PollingWatcher("disabled in config")
+    if platform.system() != "Linux":
+        return PollingWatcher(f"inotify not available on {platform.system()}")
+    if not db_path:
+        return PollingWatcher("no database path")
+
+    fstype = _filesystem_type(os.path.dirname(os.path.abspath(db_path)))
+    if fstype in UNSUPPORTED_FS:
+        return PollingWatcher(f"unsupported filesystem {fstype}")
+    try:
+        return InotifyWatcher(db_path, debounce=debounce)
+    except Exception as e:
+        return PollingWatcher(f"inotify failed: {e}")
@@ -0,0 +1,126 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- GameClock - model herného času medzi čítaniami z DB ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Z po sebe idúcich snapshotov (monotonic čas zachytenia, timestamp sveta) sa metódou
+# najmenších štvorcov odhadne rýchlosť a posun herného času. Odľahlé vzorky (skok času,
+# reštart servera, uspanie PC) sa zahodia; ak sa skok potvrdí ďalšou vzorkou, model sa
+# resetuje. Odpočty sa potom dajú plynulo extrapolovať ľubovoľne dlho a scan_interval
+# môže byť oveľa väčší bez zamŕzania alebo driftu časovačov.
+import time
+import math
+from collections import deque
+
+# Povolený rozsah rýchlosti herného času voči reálnemu (ochrana pred nezmyselným fitom)
+MIN_RATE = 0.05
+MAX_RATE = 50.0
+# Po koľkých sekundách bez novej vzorky klesne dôvera na "low"
+STALE_AFTER = 900
+
+
+class GameClock:
+    def __init__(self, window=12, outlier_seconds=30.0):
+        self.window = window
+        self.outlier_seconds = outlier_seconds
+
+        self._samples = deque(maxlen=window)
+        self._pending_outlier = None
+        self.rate = 1.0
+        self.offset = None
+        self.residual = 0.0
+
+    # ////---- Vzorky ----////
+    def reset(self):
+        self._samples.clear()
+        self._pending_outlier = None
+        self.rate = 1.0
+        self.offset = None
+        self.residual = 0.0
+
+    def add_sample(self, world_ts, mono=None):
+        """
+        Pridá dvojicu (monotonic čas zachytenia, timestamp sveta). Vzorky s rovnakým
+        časom sveta ako predchádzajúca sa ignorujú (DB sa medzitým neuložila).
+        Vráti True ak bola vzorka prijatá.
+        """
+        if world_ts is None:
+            return False
+        now = time.monotonic()
+        # čas zachytenia z iného bootu / budúcnosti = nepoužiteľný, použi čas pozorovania
+        if mono is None or mono > now + 1.0 or now - mono > 3600:
+            mono = now
+        world_ts = float(world_ts)
+
+        if self._samples and self._samples[-1][1] == world_ts:
+            return False
+
+        if self.offset is not None and len(self._samples) >= 2:
+            predicted = self.predict(mono)
+            if abs(world_ts - predicted) > self.outlier_seconds:
+                pending = self._pending_outlier
+                if pending is not None and abs((world_ts - pending[1]) - (mono - pending[0]) * self.rate) <= self.outlier_seconds:
+                    # skok sa potvrdil - nový časový rad
+                    self.reset()
+                    self._samples.append(pending)
+                else:
+                    self._pending_outlier = (mono, world_ts)
+                    return False
+        self._pending_outlier = None
+        self._samples.append((mono, world_ts))
+        self._fit()
+        return True
+
+    # ////---- Lineárny fit world = rate * mono + offset ----////
+    def _fit(self):
+        n = len(self._samples)
+        if n == 1:
+            mono, world = self._samples[0]
+            self.rate = 1.0
+            self.offset = world - mono
+            self.residual = 0.0
+            return
+
+        mean_m = sum(m for m, _w in self._samples) / n
+        mean_w = sum(w for _m, w in self._samples) / n
+        var_m = sum((m - mean_m) ** 2 for m, _w in self._samples)
+        if var_m <= 0:
+            return
+        cov = sum((m - mean_m) * (w - mean_w) for m, w in self._samples)
+        rate = min(MAX_RATE, max(MIN_RATE, cov / var_m))
+        self.rate = rate
+        self.offset = mean_w - rate * mean_m
+        self.residual = math.sqrt(sum((w - self.predict(m)) ** 2 for m, w in self._samples) / n)
+
+    # ////---- Odhad ----////
+    def predict(self, mono):
+        if self.offset is None:
+            return None
+        return self.rate * mono + self.offset
+
+    def now(self):
+        """Odhad aktuálneho času sveta (float) alebo None bez vzoriek."""
+        return self.predict(time.monotonic())
+
+    @property
+    def sample_count(self):
+        return len(self._samples)
+
+    def seconds_since_sample(self):
+        if not self._samples:
+            return None
+        return time.monotonic() - self._samples[-1][0]
+
+    def confidence(self):
+        """'none' / 'low' / 'medium' / 'high' - podľa počtu vzoriek a presnosti fitu."""
+        n = len(self._samples)
+        if n == 0:
+            return "none"
+        if n == 1 or self._pending_outlier is not None:
+            return "low"
+        # dlho bez novej vzorky (hra zavretá, DB sa neukladá) - extrapolácia je len odhad
+        if self.seconds_since_sample() > STALE_AFTER:
+            return "low"
+        if n >= 4 and self.residual <= 2.0:
+            return "high"
+        if self.residual <= 10.0:
+            return "medium"
+        return "low"
@@ -0,0 +1,223 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- JsonStore - pamäťový JSON konfig s odloženým (write-behind) zápisom ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Pamäťová kópia je autoritatívna. Zmeny sa zapisujú na disk s oneskorením (debounce),
+# atomicky cez dočasný súbor + os.replace. Po každom vlastnom zápise si store pamätá
+# generáciu a stat súboru, takže vlastné zápisy nespúšťajú reload. Externé úpravy súboru
+# sa zlúčia trojcestne (base / lokálne / disk) pole po poli.
+import os
+import json
+import copy
+import threading
+
+_MISSING = object()
+
+
+# ////---- Trojcestné zlúčenie externých zmien ----////
+def merge_external(base, local, disk):
+    """
+    Zlúči externú úpravu súboru (disk) s lokálnym stavom (local) voči poslednému
+    synchronizovanému stavu (base). Pole zmenené na disku vyhráva, inak ostáva lokálne.
+    Vnorené slovníky sa zlučujú rekurzívne.
+    """
+    base = base if isinstance(base, dict) else {}
+    local = local if isinstance(local, dict) else {}
+    disk = disk if isinstance(disk, dict) else {}
+
+    result = {}
+    keys = list(local.keys()) + [k for k in disk.keys() if k not in local]
+    for key in keys:
+        b = base.get(key, _MISSING)
+        l = local.get(key, _MISSING)
+        d = disk.get(key, _MISSING)
+
+        if isinstance(l, dict) and isinstance(d, dict):
+            result[key] = merge_external(b if isinstance(b, dict) else {}, l, d)
+            continue
+
+        if d is not _MISSING and (b is _MISSING or d != b):
+            # Externá zmena alebo nové pole z disku
+            result[key] = copy.deepcopy(d)
+        elif d is _MISSING and b is not _MISSING and l == b:
+            # Pole bolo externe zmazané a lokálne sa nemenilo
+            continue
+        elif l is not _MISSING:
+            result[key] = l
+    return result
+# ////-----------------------------------------------------------------------------------------
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    except OSError:
+        return None
+
+
+# ////---- Atomický zápis JSON ----////
+def write_json_atomic(path, data, indent=2):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+# ////-----------------------------------------------------------------------------------------
+
+
+class JsonStore:
+    def __init__(self, path, debounce=0.5, indent=2):
+        self.path = path
+        self.debounce = debounce
+        self.indent = indent
+        self.generation = 0
+
+        self._lock = threading.RLock()
+        self._data = {}
+        self._base = {}
+        self._dirty = False
+        self._timer = None
+        self._own_stat = None
+        # počet zlúčení externých zmien (poll aj zápis na pozadí) - vlastník dát podľa neho
+        # zistí, že sa pamäťová kópia zmenila mimo neho
+        self.external = 0
+
+    # ////---- Načítanie ----////
+    def load(self):
+        """Načíta súbor do pamäte a vráti kópiu dát."""
+        with self._lock:
+            disk = self._read_disk()
+            self._data = copy.deepcopy(disk)
+            self._base = disk
+            self._own_stat = _stat_key(self.path)
+            self._dirty = False
+            return copy.deepcopy(self._data)
+
+    def _read_disk(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    # ////---- Prístup k dátam ----////
+    def snapshot(self):
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            return copy.deepcopy(self._data.get(key, default))
+
+    def set(self, key, value):
+        with self._lock:
+            value = copy.deepcopy(value)
+            if self._data.get(key, _MISSING) == value:
+                return
+            self._data[key] = value
+            self._mark_dirty()
+
+    def update(self, mapping):
+        with self._lock:
+            changed = False
+            for key, value in mapping.items():
+                value = copy.deepcopy(value)
+                if self._data.get(key, _MISSING) != value:
+                    self._data[key] = value
+                    changed = True
+            if changed:
+                self._mark_dirty()
+
+    def replace(self, data):
+        """Nahradí celý obsah (napr. zoznam overlayov). Zápis sa naplánuje len pri zmene."""
+        with self._lock:
+            data = copy.deepcopy(data) if isinstance(data, dict) else {}
+            if data == self._data:
+                return
+            self._data = data
+            self._mark_dirty()
+
+    def remove(self, key):
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+                self._mark_dirty()
+
+    # ////---- Odložený zápis ----////
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.debounce, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Okamžite zapíše neuložené zmeny (volá sa aj pri zatváraní widgetu)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return False
+            # Ak medzitým niekto upravil súbor, najprv zlúč jeho zmeny
+            if _stat_key(self.path) != self._own_stat:
+                self._merge_from_disk()
+            try:
+                write_json_atomic(self.path, self._data, indent=self.indent)
+            except Exception as e:
+                print(f"[JsonStore] Error writing {self.path}: {e}")
+                return False
+            self._base = copy.deepcopy(self._data)
+            self._own_stat = _stat_key(self.path)
+            self._dirty = False
+            self.generation += 1
+            return True
+
+    # ////---- Sledovanie externých úprav ----////
+    def poll(self):
+        """
+        Skontroluje, či súbor nezmenil niekto iný. Vlastné zápisy sa ignorujú.
+        Vráti množinu zmenených top-level kľúčov (prázdna = bez zmeny).
+        """
+        with self._lock:
+            if _stat_key(self.path) == self._own_stat:
+                return set()
+            return self._merge_from_disk()
+
+    def _merge_from_disk(self):
+        stat_before = _stat_key(self.path)
+        if stat_before is None:
+            # Súbor zmizol - pri najbližšom zápise sa vytvorí znova
+            self._own_stat = None
+            return set()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                disk = json.load(f)
+        except Exception:
+            # Rozpísaný alebo poškodený súbor - skúsime pri ďalšom polle
+            return set()
+        if not isinstance(disk, dict):
+            return set()
+
+        merged = merge_external(self._base, self._data, disk)
+        changed = {k for k in set(merged) | set(self._data) if merged.get(k, _MISSING) != self._data.get(k, _MISSING)}
+        self._data = merged
+        self._base = disk
+        self._own_stat = stat_before
+        if changed:
+            self.external += 1
+        return changed
+# ////-----------------------------------------------------------------------------------------
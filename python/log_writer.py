@@ -0,0 +1,196 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Neblokujúci logger pre data/log.txt ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Scan vlákno len vloží riadok do fronty, zápis robí vlákno na pozadí: dávkuje riadky,
+# drží súbor otvorený, flushuje po dávke a pri prekročení veľkosti ho rotuje (log.1.txt).
+# Rovnaké opakované správy (napr. zamknutá DB pri každom scane) sa zlúčia do jedného
+# riadku s počtom opakovaní. Posledné riadky sú aj v pamäti (ring buffer) pre GUI widgety.
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+MAX_BYTES = 512 * 1024
+RING_SIZE = 500
+QUEUE_SIZE = 10000
+# Ako dlho sa zlučujú rovnaké správy (potom sa zopakujú s počtom potlačených)
+REPEAT_WINDOW = 60.0
+FLUSH_INTERVAL = 0.5
+
+
+class QueuedLogger:
+    def __init__(self, path, max_bytes=MAX_BYTES, ring_size=RING_SIZE, repeat_window=REPEAT_WINDOW):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.repeat_window = repeat_window
+
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._ring = deque(maxlen=ring_size)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._file = None
+        self.dropped = 0
+
+        self._last_message = None
+        self._last_emitted = 0.0
+        self._suppressed = 0
+
+    # ////---- API pre volajúcich ----////
+    def log(self, message):
+        """Neblokuje - riadok sa zapíše na pozadí."""
+        now = time.monotonic()
+        with self._lock:
+            if message == self._last_message and now - self._last_emitted < self.repeat_window:
+                self._suppressed += 1
+                return
+            if self._suppressed:
+                self._emit(f"(previous message repeated {self._suppressed}x)")
+            self._last_message = message
+            self._last_emitted = now
+            self._suppressed = 0
+            self._emit(message)
+
+    def truncate(self, header=None):
+        """Začne nový log (pri štarte modulu). Poradie s ostatnými riadkami zostáva."""
+        with self._lock:
+            self._ring.clear()
+            self._last_message = None
+            self._suppressed = 0
+            self._enqueue(("truncate", f"{header}\n" if header else ""))
+            if header:
+                self._seq += 1
+                self._ring.append((self._seq, header))
+
+    def records(self, after_seq=0):
+        """Riadky z pamäte s poradovým číslom > after_seq: [(seq, riadok)]."""
+        with self._lock:
+            return [item for item in self._ring if item[0] > after_seq]
+
+    def flush(self, timeout=2.0):
+        """Počká, kým writer zapíše všetko, čo je vo fronte."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._enqueue(("sync", done))
+        done.wait(timeout)
+
+    def close(self, timeout=2.0):
+        with self._lock:
+            if self._suppressed:
+                self._emit(f"(previous message repeated {self._suppressed}x)")
+                self._suppressed = 0
+        if self._thread is not None and self._thread.is_alive():
+            self._enqueue(("stop", None))
+            self._thread.join(timeout)
+        self._thread = None
+
+    # ////---- Interné ----////
+    def _emit(self, message):
+        line = f"[{datetime.now().strftime('%H:%M:%S')}] {message}"
+        self._seq += 1
+        self._ring.append((self._seq, line))
+        self._enqueue(("line", line + "\n"))
+
+    def _enqueue(self, item):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._writer, name="ActiveQuestsLogWriter", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    # vždy "a" (O_APPEND) a truncate(0) - zápis nikdy nepokračuje od starej pozície, ak
+    # súbor medzitým niekto skrátil (log podprocesu aj tak zapisuje hostiteľ, logic_process.py)
+    def _open(self, truncate=False):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if truncate:
+            self._file.truncate(0)
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        root, ext = os.path.splitext(self.path)
+        os.replace(self.path, f"{root}.1{ext}")
+        self._open()
+
+    def _writer(self):
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=FLUSH_INTERVAL)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            pending, syncs = [], []
+            try:
+                for kind, payload in batch:
+                    if kind == "line":
+                        pending.append(payload)
+                    elif kind == "truncate":
+                        pending.clear()
+                        self._open(truncate=True)
+                        if payload:
+                            pending.append(payload)
+                    elif kind == "sync":
+                        syncs.append(payload)
+                    elif kind == "stop":
+                        running = False
+
+                if pending:
+                    if self._file is None:
+                        self._open()
+                    self._file.write("".join(pending))
+                    self._file.flush()
+                    if self._file.tell() > self.max_bytes:
+                        self._rotate()
+            except Exception as e:
+                print(f"[LOGIC] Chyba pri zápise do log.txt: {e}")
+                # zavrieť pred zahodením - inak by každá chyba nechala otvorený deskriptor
+                if self._file is not None:
+                    try:
+                        self._file.close()
+                    except OSError:
+                        pass
+                self._file = None
+            finally:
+                for done in syncs:
+                    done.set()
+
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+_LOGGERS = {}
+_LOGGERS_LOCK = threading.Lock()
+
+
+def get_logger(path):
+    """Jeden logger na súbor v rámci procesu (logika aj widgety)."""
+    path = os.path.abspath(path)
+    with _LOGGERS_LOCK:
+        logger = _LOGGERS.get(path)
+        if logger is None:
+            logger = QueuedLogger(path)
+            _LOGGERS[path] = logger
+        return logger
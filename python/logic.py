@@ -5,9 +5,12 @@ import sqlite3
 import time
 import configparser
 import os
+import sys
 import json
+import pathlib
 import platform
-from datetime import datetime
+import importlib.util
+from types import MappingProxyType
 
 # ////---- Cesty k súborom ----////
 module_root = os.path.dirname(os.path.dirname(__file__))
@@ -15,17 +18,52 @@ config_path = os.path.join(module_root, 'config', 'config.json')
 data_path = os.path.join(module_root, 'data', 'quest.json')
 log_path = os.path.join(module_root, 'data', 'log.txt')
 path_ini_path = os.path.join(module_root, 'config', 'path.ini')
+translate_path = os.path.join(module_root, 'data', 'translate.json')
+startup_cache_path = os.path.join(module_root, 'data', 'startup_cache.json')
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Pomocné moduly z python/ (zdieľané s widgetmi, jedna inštancia na proces) ----////
+def _load_sibling(name):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        path = os.path.join(module_root, 'python', f"{name}.py")
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        try:
+            spec.loader.exec_module(mod)
+        except Exception:
+            sys.modules.pop(key, None)
+            raise
+    return mod
+
+log_writer = _load_sibling("log_writer")
+db_watcher = _load_sibling("db_watcher")
+db_snapshot = _load_sibling("db_snapshot")
+db_indexes = _load_sibling("db_indexes")
+startup_cache = _load_sibling("startup_cache")
+steam_paths = _load_sibling("steam_paths")
+tracer = _load_sibling("tracer")
+trace = tracer.get_tracer()
+session_recorder = _load_sibling("session_recorder")
+recorder = session_recorder.get_recorder()
+logic_process = _load_sibling("logic_process")
+translations = _load_sibling("translations")
+render_core = _load_sibling("render_core")
 # ////-----------------------------------------------------------------------------------------
 
 # ////---- Logovanie do log.txt ktorý si načíta GUI widget console ----////
+# Zápis robí vlákno na pozadí (python/log_writer.py) - dávky, rotácia, zlúčenie opakovaní
+# V podprocese (--child) zapisuje do log.txt len hostiteľ - riadky idú cez stdout (python/logic_process.py)
+_child_mode = False
+
+
 def log_to_console(message, color=None):
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    line = f"[{timestamp}] {message}\n"
-    try:
-        with open(log_path, 'a', encoding='utf-8') as f:
-            f.write(line)
-    except Exception as e:
-        print(f"[LOGIC] Chyba pri zápise do log.txt: {e}")
+    if _child_mode:
+        logic_process.child_log(message)
+        return
+    log_writer.get_logger(log_path).log(message)
 # ////-----------------------------------------------------------------------------------------
 
 # ////---- Automatická detekcia cesty k SCUM.db ----////
@@ -45,57 +83,114 @@ def detect_db_path():
         if os.path.exists(default_win):
             return default_win
     elif system == 'Linux':
-        candidates = [
-            os.path.expanduser("~/Steam/steamapps/compatdata/513710/pfx/drive_c/users/steamuser/AppData/Local/SCUM/Saved/SaveFiles/SCUM.db"),
-            os.path.expanduser("~/.var/app/com.valvesoftware.Steam/.steam/steam/steamapps/compatdata/513710/pfx/drive_c/users/steamuser/AppData/Local/SCUM/Saved/SaveFiles/SCUM.db")
-        ]
-        for path in candidates:
-            if os.path.exists(path):
-                return path
+        # všetky Steam knižnice (natívny / Flatpak / Snap root + libraryfolders.vdf), paralelne
+        started = time.perf_counter()
+        db_path, results = steam_paths.discover_db_path()
+        for r in results:
+            state = "found" if r["found"] else "missing"
+            log_to_console(f"[ActiveQuests] DB candidate ({state}, {r['ms']:.1f} ms): {r['path']}")
+        log_to_console(f"[ActiveQuests] Steam discovery: {len(results)} candidates in {(time.perf_counter() - started) * 1000:.1f} ms")
+        if db_path:
+            return db_path
 
     log_to_console("[ActiveQuests] SCUM.db nebol nájdený. Prosím zadajte cestu ručne do config/path.ini [paths] db_path=...")
     return None
 # ////-----------------------------------------------------------------------------------------
 
-# ////---- Zabezpečenie indexov v databáze pre rýchlejšie vyhľadávanie ----////
-def ensure_indexes(conn):
+# ////---- Indexy v databáze podľa schémy (python/db_indexes.py) ----////
+def start_index_maintenance(conn, db_path, config_json, cache=None):
+    """
+    Odtlačok schémy a audit plánov na čítacom spojení. Chýbajúce indexy sa stavajú
+    na pozadí krátkym RW spojením. Vráti (fingerprint, builder alebo None).
+    Pri teplom štarte s rovnakým odtlačkom a hotovými indexmi sa kontrola preskočí.
+    """
     try:
-        cursor = conn.cursor()
-
-        # entity – pre detekciu aktívneho hráča
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_flags ON entity(flags);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_system_id ON entity(entity_system_id);")
-
-        # entity_system – pre prepojenie s user_profile
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_system_id ON entity_system(id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_system_user_profile_id ON entity_system(user_profile_id);")
-
-        # active_quest – rýchly prístup k questom hráča
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_active_quest_user_profile_id ON active_quest(user_profile_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_active_quest_id ON active_quest(id);")
-
-        # tracking_data – rýchly prístup podľa quest ID
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracking_data_set_id ON tracking_data(tracking_data_set_id);")
-
-        conn.commit()
+        fingerprint = db_indexes.schema_fingerprint(conn)
+        # cache sa overí lacným PRAGMA index_list - index mohol zmiznúť (hra, iný nástroj, starý bug)
+        if cache and cache.indexes_ready(fingerprint) and not db_indexes.missing_indexes(conn, db_indexes.required_indexes(fingerprint)):
+            log_to_console(f"[ActiveQuests] Schema: {fingerprint['version']} ({fingerprint['hash']}), indexes OK (startup cache)")
+            return fingerprint, None
+        legacy = db_indexes.legacy_indexes(conn)
+        create = config_json.get("db_create_indexes", True)
+        # staré indexy builder zmaže - ich pokrytie sa nepočíta
+        missing = db_indexes.missing_indexes(conn, db_indexes.required_indexes(fingerprint), ignore=legacy if create else ())
     except sqlite3.Error as e:
-        log_to_console(f"[ActiveQuests] Chyba pri vytváraní indexov: {e}")
+        log_to_console(f"[ActiveQuests] Chyba pri kontrole schémy: {e}")
+        return None, None
+
+    log_to_console(
+        f"[ActiveQuests] Schema: {fingerprint['version']} ({fingerprint['prisoner_class'] or 'no prisoner'}, "
+        f"{fingerprint['hash']}), missing indexes: {', '.join(s.name for s in missing) or 'none'}"
+    )
+
+    if (missing or legacy) and create:
+        on_done = (lambda b: cache.set_schema(fingerprint, b.complete)) if cache else None
+        builder = db_indexes.IndexBuilder(db_path, fingerprint, log=log_to_console, on_done=on_done)
+        builder.start()
+        return fingerprint, builder
+
+    report = db_indexes.explain_report(conn, fingerprint)
+    for line in db_indexes.format_report(report):
+        log_to_console(f"[ActiveQuests] Plan {line}")
+    if cache:
+        cache.set_schema(fingerprint, not missing and db_indexes.report_ok(report))
+    return fingerprint, None
 # ////-----------------------------------------------------------------------------------------
 
 # ////---- Otvorenie spojenia s databázou ----////
-def open_db_connection(db_path):
+# Profily spojenia:
+#   readonly  - file:...?mode=ro URI, PRAGMA query_only, mmap_size a cache_size z configu.
+#               Databázu hry nikdy nemeníme a nedržíme zápisový zámok.
+#   readwrite - obyčajné RW spojenie bez zmeny pragiem hry (fallback ak ro zlyhá).
+DB_PROFILES = ("readonly", "readwrite")
+
+def _db_uri(db_path, mode):
+    return pathlib.Path(os.path.abspath(db_path)).as_uri() + f"?mode={mode}"
+
+def report_db_profile(conn, profile):
+    """Zaloguje, ktorý profil spojenia je naozaj aktívny."""
     try:
-        conn = sqlite3.connect(db_path, timeout=1)
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA locking_mode=NORMAL;")
-        conn.execute("PRAGMA synchronous=NORMAL;")
-        conn.execute("PRAGMA read_uncommitted = true;")
-        conn.row_factory = sqlite3.Row
-        ensure_indexes(conn)
-        return conn
+        query_only = conn.execute("PRAGMA query_only;").fetchone()[0]
+        mmap_size = conn.execute("PRAGMA mmap_size;").fetchone()[0]
+        cache_size = conn.execute("PRAGMA cache_size;").fetchone()[0]
+        journal_mode = conn.execute("PRAGMA journal_mode;").fetchone()[0]
+        log_to_console(
+            f"[ActiveQuests] DB profile: {profile} (query_only={query_only}, mmap_size={mmap_size}, "
+            f"cache_size={cache_size}, journal_mode={journal_mode})"
+        )
     except sqlite3.Error as e:
-        log_to_console(f"[ActiveQuests] Chyba pri otváraní databázy: {e}")
-        return None
+        log_to_console(f"[ActiveQuests] DB profile: {profile} (pragma check failed: {e})")
+
+def open_db_connection(db_path, config_json=None):
+    config_json = config_json or load_or_create_config()
+    profile = config_json.get("db_profile", "readonly")
+    if profile not in DB_PROFILES:
+        log_to_console(f"[ActiveQuests] Neznámy db_profile '{profile}', používam readonly.")
+        profile = "readonly"
+
+    conn = None
+    if profile == "readonly":
+        try:
+            conn = sqlite3.connect(_db_uri(db_path, "ro"), uri=True, timeout=1)
+            conn.execute("PRAGMA query_only = 1;")
+            conn.execute(f"PRAGMA mmap_size = {int(config_json.get('db_mmap_size', 268435456))};")
+            conn.execute(f"PRAGMA cache_size = {-abs(int(config_json.get('db_cache_size_kib', 16384)))};")
+        except sqlite3.Error as e:
+            log_to_console(f"[ActiveQuests] Read-only spojenie zlyhalo ({e}), používam readwrite profil.")
+            close_db_connection(conn)
+            conn = None
+            profile = "readwrite"
+
+    if conn is None:
+        try:
+            conn = sqlite3.connect(db_path, timeout=1)
+        except sqlite3.Error as e:
+            log_to_console(f"[ActiveQuests] Chyba pri otváraní databázy: {e}")
+            return None
+
+    conn.row_factory = sqlite3.Row
+    report_db_profile(conn, profile)
+    return conn
 # ////-----------------------------------------------------------------------------------------
 
 # ////---- Zatvorenie spojenia s databázou ----////
@@ -110,7 +205,21 @@ def close_db_connection(conn):
 # ////---- Načítanie alebo vytvorenie config.json ----////
 def load_or_create_config():
     default_config = {
-        "scan_interval": 4
+        "scan_interval": 4,
+        "db_watch": "auto",
+        "db_watch_debounce": 0.25,
+        "db_watch_max_idle": 60,
+        "db_profile": "readonly",
+        "db_mmap_size": 268435456,
+        "db_cache_size_kib": 16384,
+        "db_create_indexes": True,
+        "db_snapshot": "off",
+        "db_snapshot_pages": 1024,
+        "db_snapshot_step_sleep": 0.005,
+        "trace": False,
+        "trace_buffer": 20000,
+        "record_session": False,
+        "logic_process": "thread"
     }
     if not os.path.exists(config_path):
         with open(config_path, 'w', encoding='utf-8') as f:
@@ -264,6 +373,7 @@ def save_quests_to_json(user_profile_id, timestamp, quests):
     {
         "user_profile_id": ...,
         "timestamp": ...,
+        "captured_monotonic": ...,
         "quests": [
             {
                 "id": ...,
@@ -280,11 +390,17 @@ def save_quests_to_json(user_profile_id, timestamp, quests):
         data = {
             "user_profile_id": user_profile_id,
             "timestamp": timestamp,
+            # čas zachytenia pre model herného času vo widgete (GameClock)
+            "captured_monotonic": time.monotonic(),
             "quests": quests
         }
 
-        with open(data_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with trace.span("serialise"):
+            text = json.dumps(data, indent=4, ensure_ascii=False)
+        with trace.span("write", bytes=len(text)):
+            with open(data_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        recorder.snapshot(user_profile_id, timestamp, quests)
 
     except Exception as e:
         log_to_console(f"[ActiveQuests] Chyba pri zápise do quest.json: {e}")
@@ -299,63 +415,400 @@ def clear_quest_json():
                 "timestamp": None,
                 "quests": []
             }, f, indent=4)
+        recorder.snapshot(None, None, [])
     except Exception as e:
         log_to_console(f"[ActiveQuests] Chyba pri čistení quest.json: {e}")
 # ////-----------------------------------------------------------------------------------------
 
+# ////---- Posledný snapshot z warm-start cache (označený ako stale) ----////
+def write_stale_quest_json(snapshot):
+    """Zapíše snapshot do quest.json s "stale": true - widget ho hneď vykreslí."""
+    if not snapshot or not snapshot.get("quests"):
+        return
+    try:
+        data = {
+            "user_profile_id": snapshot.get("user_profile_id"),
+            "timestamp": snapshot.get("timestamp"),
+            "stale": True,
+            "quests": snapshot.get("quests")
+        }
+        with open(data_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+    except Exception as e:
+        log_to_console(f"[ActiveQuests] Chyba pri zápise stale quest.json: {e}")
+
+def quest_json_has_quests():
+    try:
+        with open(data_path, 'r', encoding='utf-8') as f:
+            return bool(json.load(f).get("quests"))
+    except Exception:
+        return False
+# ////-----------------------------------------------------------------------------------------
+
 # /////////////////////////////////////////////////////////////////////////////////////////////
-# ////---- Hlavná slučka ----////
+# ////---- Streamovacie API - snapshoty questov ako generátory ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
-def main_loop(conn=None, stop_event=None):
-    config_json = load_or_create_config()
-    SCAN_INTERVAL = config_json.get("scan_interval", 4)
+# reader = open_reader(db_path)
+# for snapshot in reader.iter_snapshots(interval=2, stop_event=stop):   # len pri zmene
+#     ...
+# Ďalšie kroky sa skladajú ako generátory nad snapshotmi (export, upozornenia, štatistiky):
+# iter_progress(snapshots) dekóduje tracking dáta, iter_deltas(snapshots) počíta rozdiely.
+# main_loop je len jeden taký konzument (quest.json + startup cache).
+def _freeze_quest(quest):
+    return MappingProxyType({k: tuple(v) if isinstance(v, list) else v for k, v in quest.items()})
 
-    while not (stop_event and stop_event.is_set()):
-        try:
-            user_profile_id = get_active_user_profile_id(conn)
 
+class QuestSnapshot:
+    """
+    Nemenný výsledok jedného scanu. quests je tuple read-only máp (multi-item data ako tuple),
+    quest_list() vráti obyčajné dict / list kópie pre JSON.
+    """
+    __slots__ = ("user_profile_id", "timestamp", "quests", "captured_monotonic")
+
+    def __init__(self, user_profile_id, timestamp, quests, captured_monotonic=None):
+        object.__setattr__(self, "user_profile_id", user_profile_id)
+        object.__setattr__(self, "timestamp", timestamp)
+        object.__setattr__(self, "quests", tuple(_freeze_quest(q) for q in quests or ()))
+        object.__setattr__(self, "captured_monotonic",
+                           time.monotonic() if captured_monotonic is None else captured_monotonic)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("QuestSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("QuestSnapshot is immutable")
+
+    def __repr__(self):
+        return f"QuestSnapshot(user_profile_id={self.user_profile_id!r}, timestamp={self.timestamp!r}, quests={len(self.quests)})"
+
+    def quest_list(self):
+        return [{k: list(v) if isinstance(v, tuple) else v for k, v in q.items()} for q in self.quests]
+
+    def by_id(self):
+        return {q.get("id"): q for q in self.quests}
+
+
+class QuestReader:
+    """
+    Čítanie questov zo SCUM.db bez zápisu. read() = jeden scan, iter_snapshots() = generátor,
+    ktorý vráti snapshot len ak sa zmenil hráč, čas sveta alebo questy.
+    """
+
+    def __init__(self, conn, db_path=None, config_json=None, owns_conn=False):
+        self.conn = conn
+        self.db_path = db_path
+        self.config = config_json or load_or_create_config()
+        self.owns_conn = owns_conn
+        self.last = None
+
+        # Voliteľná súkromná kópia DB (backup API) - dotazy potom nedržia zámky nad SCUM.db
+        self.source = None
+        try:
+            self.source = db_snapshot.create_snapshot_source(conn, self.config)
+        except Exception as e:
+            log_to_console(f"[ActiveQuests] DB snapshot nedostupný, čítam priamo: {e}")
+        if self.source:
+            log_to_console(f"[ActiveQuests] DB snapshot: {self.source.target} ({self.source.path}, pages={self.source.pages})")
+
+    def _scan(self):
+        """(user_profile_id, timestamp, quests) - questy ako obyčajné dict, bez snapshotu."""
+        with trace.span("scan") as scan_span:
+            if self.source:
+                # kópia sa obnoví len ak hra od posledného scanu niečo zapísala
+                with trace.span("snapshot_refresh"):
+                    self.source.refresh()
+            query_conn = self.source.conn if self.source else self.conn
+
+            with trace.span("profile_lookup"):
+                user_profile_id = get_active_user_profile_id(query_conn)
             if not user_profile_id:
-                # log_to_console("[ActiveQuests] Nebol nájdený aktívny hráč. Quest.json bude vyčistený.")
-                clear_quest_json()
+                return None, None, []
+
+            with trace.span("quest_query"):
+                quests = get_active_quests(query_conn, user_profile_id)
+            with trace.span("tracking_attach", quests=len(quests)):
+                quests = attach_tracking_data(query_conn, quests)
+            with trace.span("timestamp"):
+                timestamp = get_world_timestamp(query_conn, user_profile_id)
+            scan_span.set(quests=len(quests))
+            return user_profile_id, timestamp, quests
+
+    def read(self):
+        self.last = QuestSnapshot(*self._scan())
+        return self.last
+
+    def iter_snapshots(self, interval=None, stop_event=None):
+        """
+        Scan každých interval sekúnd (predvolene scan_interval z configu), pri inotify hneď po
+        zápise hry. Chyba scanu sa zaloguje a slučka pokračuje; končí sa nastavením stop_event.
+        """
+        interval = interval or self.config.get("scan_interval", 4)
+
+        # Čakanie medzi scanmi - inotify zobudí scan hneď po zápise hry, inak polling
+        watcher = db_watcher.create_watcher(
+            self.db_path,
+            mode=self.config.get("db_watch", "auto"),
+            debounce=self.config.get("db_watch_debounce", 0.25)
+        )
+        if watcher.mode == "inotify":
+            wait_timeout = self.config.get("db_watch_max_idle", 60)
+            log_to_console(f"[ActiveQuests] DB watcher: inotify ({watcher.directory})")
+        else:
+            wait_timeout = interval
+            log_to_console(f"[ActiveQuests] DB watcher: polling every {interval}s ({watcher.reason})")
+
+        last_state = None
+        try:
+            while not (stop_event and stop_event.is_set()):
+                try:
+                    state = self._scan()
+                except Exception as e:
+                    log_to_console(f"[ActiveQuests] Chyba: {e}")
+                else:
+                    if state != last_state:
+                        last_state = state
+                        self.last = QuestSnapshot(*state)
+                        yield self.last
+
+                if stop_event and stop_event.is_set():
+                    break
+                with trace.span("wait", cat="idle"):
+                    watcher.wait(wait_timeout, stop_event)
+        finally:
+            watcher.close()
+
+    def close(self):
+        if self.source:
+            self.source.close()
+            self.source = None
+        if self.owns_conn and self.conn:
+            close_db_connection(self.conn)
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+        return False
+
+
+def open_reader(db_path, config_json=None):
+    """Otvorí SCUM.db s profilom z configu; None ak sa databáza nedá otvoriť."""
+    config_json = config_json or load_or_create_config()
+    conn = open_db_connection(db_path, config_json)
+    if not conn:
+        return None
+    return QuestReader(conn, db_path, config_json, owns_conn=True)
+
+
+# pokrok tracking položiek - rovnaké dekodéry ako overlay (python/render_core.py)
+QuestProgress = render_core.QuestProgress
+decode_progress = render_core.decode_progress
+
+
+def iter_progress(snapshots, provider=None, language=translations.DEFAULT_LANGUAGE):
+    """
+    Ku každému snapshotu pridá pokrok questov: yield (snapshot, {quest_id: (QuestProgress, ...)}).
+    Quest s rovnakými dátami ako v minulom snapshote sa znovu nedekóduje.
+    """
+    provider = provider or translations.get_provider(translate_path)
+    entries = provider.wait(language)
+    decoded = {}
+    for snapshot in snapshots:
+        entries = provider.quests(language) or entries
+        current = {}
+        for quest in snapshot.quests:
+            quest_id = quest.get("id")
+            cached = decoded.get(quest_id)
+            if cached and cached[0] == quest.get("data") and cached[1] == quest.get("quest_data_asset_path"):
+                current[quest_id] = cached
             else:
-                quests = get_active_quests(conn, user_profile_id)
-                quests = attach_tracking_data(conn, quests)
-                timestamp = get_world_timestamp(conn, user_profile_id)
-                save_quests_to_json(user_profile_id, timestamp, quests)
-                # log_to_console(f"[ActiveQuests] Načítaných {len(quests)} aktívnych questov pre hráča ID {user_profile_id}.")
+                entry = entries.get(quest.get("quest_data_asset_path"), {})
+                current[quest_id] = (quest.get("data"), quest.get("quest_data_asset_path"), decode_progress(quest, entry))
+        decoded = current
+        yield snapshot, {quest_id: cached[2] for quest_id, cached in decoded.items()}
 
-        except Exception as e:
-            log_to_console(f"[ActiveQuests] Chyba: {e}")
 
-        if stop_event and stop_event.is_set():
-            break
-        time.sleep(SCAN_INTERVAL)
+class QuestDelta:
+    """Rozdiel dvoch po sebe idúcich snapshotov (previous je None pri prvom)."""
+    __slots__ = ("previous", "current", "added", "removed", "changed")
+
+    def __init__(self, previous, current, added, removed, changed):
+        object.__setattr__(self, "previous", previous)
+        object.__setattr__(self, "current", current)
+        object.__setattr__(self, "added", added)
+        object.__setattr__(self, "removed", removed)
+        object.__setattr__(self, "changed", changed)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("QuestDelta is immutable")
+
+    @property
+    def player_changed(self):
+        return self.previous is not None and self.previous.user_profile_id != self.current.user_profile_id
+
+    @property
+    def quests_changed(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"QuestDelta(added={len(self.added)}, removed={len(self.removed)}, changed={len(self.changed)})"
+
+
+def iter_deltas(snapshots):
+    """
+    yield QuestDelta pre každý snapshot: added / changed sú tuple questov z current,
+    removed tuple questov z previous (porovnáva sa podľa id).
+    """
+    previous, previous_by_id = None, {}
+    for snapshot in snapshots:
+        current_by_id = snapshot.by_id()
+        added = tuple(q for quest_id, q in current_by_id.items() if quest_id not in previous_by_id)
+        changed = tuple(q for quest_id, q in current_by_id.items()
+                        if quest_id in previous_by_id and previous_by_id[quest_id] != q)
+        removed = tuple(q for quest_id, q in previous_by_id.items() if quest_id not in current_by_id)
+        yield QuestDelta(previous, snapshot, added, removed, changed)
+        previous, previous_by_id = snapshot, current_by_id
 # ////-----------------------------------------------------------------------------------------
 
-# ////---- Inicializácia modulu ----////
-def logic_main_init(stop_event=None):
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Hlavná slučka ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+def main_loop(conn=None, stop_event=None, db_path=None, cache=None):
+    # quest.json sa zapíše len pri zmene snapshotu (widget berie vzorku času len pri zmene timestampu)
+    reader = QuestReader(conn, db_path, load_or_create_config())
+    last_snapshot = None
+    try:
+        for snapshot in reader.iter_snapshots(stop_event=stop_event):
+            if not snapshot.user_profile_id:
+                # log_to_console("[ActiveQuests] Nebol nájdený aktívny hráč. Quest.json bude vyčistený.")
+                clear_quest_json()
+                continue
+            quests = snapshot.quest_list()
+            save_quests_to_json(snapshot.user_profile_id, snapshot.timestamp, quests)
+            last_snapshot = (snapshot.user_profile_id, snapshot.timestamp, quests)
+            if cache:
+                cache.set_snapshot(snapshot.user_profile_id, snapshot.timestamp, quests)
+            # log_to_console(f"[ActiveQuests] Načítaných {len(quests)} aktívnych questov pre hráča ID {snapshot.user_profile_id}.")
+    finally:
+        reader.close()
+
+    if cache and last_snapshot:
+        # posledný čas sveta (počas behu sa cache prepisuje len pri zmene questov)
+        cache.set_snapshot(*last_snapshot, final=True)
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Záznam relácie (tools/replay_session.py) ----////
+def start_session_recording(config_json):
+    """Začne záznam snapshotov, shortcut akcií a zmien configu do data/session_<čas>.jsonl.gz."""
+    configs = {"config.json": config_json}
+    try:
+        with open(os.path.join(os.path.dirname(config_path), 'quest.json'), 'r', encoding='utf-8') as f:
+            configs["quest.json"] = json.load(f)
+    except Exception:
+        pass
     try:
-        with open(log_path, 'w', encoding='utf-8') as f:
-            f.write("[ActiveQuests] Module Loaded...\n")
+        path = recorder.start(os.path.dirname(data_path), configs)
+        log_to_console(f"[ActiveQuests] Recording session: {path}")
     except Exception as e:
-        print(f"[LOGIC] Nepodarilo sa vytvoriť log.txt: {e}")
+        log_to_console(f"[ActiveQuests] Chyba pri spustení záznamu relácie: {e}")
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Inicializácia modulu ----////
+def logic_main_init(stop_event=None):
+    logger = log_writer.get_logger(log_path)
+    logger.truncate("[ActiveQuests] Module Loaded...")
+
+    config_json = load_or_create_config()
+    if config_json.get("logic_process", "thread") == "subprocess":
+        ok, reason = logic_process.supported()
+        if ok:
+            # tracer hostiteľa (spany widgetov, shortcut dump_trace) - scan spany má dieťa vo vlastnom
+            configure_tracing(config_json)
+            supervisor = logic_process.LogicSupervisor(os.path.abspath(__file__), log=log_to_console)
+            supervisor.run(stop_event)
+            dump_trace()
+            logger.flush()
+            return
+        log_to_console(f"[ActiveQuests] Logic subprocess not available ({reason}), running in-process")
+
+    run_logic(stop_event)
+    logger.flush()
+
+
+def run_logic(stop_event=None):
+    """Celá logika (scan slučka) v aktuálnom procese - vlákno hostiteľa alebo podproces --child."""
+    # Teplý štart - cesta k DB (overená cez inode) a posledný snapshot z data/startup_cache.json
+    cache = startup_cache.StartupCache(startup_cache_path)
+    db_path = cache.db_path(path_ini_path)
+    if db_path:
+        log_to_console(f"[ActiveQuests] Warm start: {db_path}")
+        if not quest_json_has_quests():
+            write_stale_quest_json(cache.snapshot())
+    else:
+        db_path = detect_db_path()
 
-    db_path = detect_db_path()
     if not db_path or not os.path.exists(db_path):
         log_to_console("[ActiveQuests] SCUM.db file not found or disk disconnected. Please fix path.ini.")
         clear_quest_json()
         return
+    cache.set_db_path(db_path, path_ini_path)
 
-    conn = open_db_connection(db_path)
+    config_json = load_or_create_config()
+    configure_tracing(config_json)
+    if config_json.get("record_session", False):
+        start_session_recording(config_json)
+    conn = open_db_connection(db_path, config_json)
     if not conn:
         log_to_console("[ActiveQuests] Nepodarilo sa otvoriť databázu.")
         return
 
-    main_loop(conn, stop_event)
+    _fingerprint, index_builder = start_index_maintenance(conn, db_path, config_json, cache)
+
+    main_loop(conn, stop_event, db_path, cache)
+
+    if index_builder:
+        index_builder.cancel()
+        index_builder.join(timeout=2)
     close_db_connection(conn)
+
+    # pri ďalšom štarte sa posledné dáta zobrazia hneď, ale ako stale
+    snapshot = cache.snapshot()
+    if snapshot and quest_json_has_quests():
+        write_stale_quest_json(snapshot)
+    cache.flush()
+
+    if recorder.enabled:
+        recorder.close()
+        log_to_console(f"[ActiveQuests] Session saved: {recorder.path} ({recorder.events} events)")
+
+    dump_trace("logic" if _child_mode else None)
+
+
+def configure_tracing(config_json):
+    trace.configure(config_json.get("trace", False), config_json.get("trace_buffer"))
+    if trace.enabled:
+        log_to_console("[ActiveQuests] Tracing enabled (dump: shortcut dump_trace or on shutdown)")
+
+
+def dump_trace(tag=None):
+    if not trace.enabled:
+        return
+    try:
+        trace_path = trace.dump(os.path.dirname(data_path), tag)
+        if trace_path:
+            log_to_console(f"[ActiveQuests] Trace saved: {trace_path}")
+    except Exception as e:
+        log_to_console(f"[ActiveQuests] Chyba pri ukladaní trace: {e}")
 # ////-----------------------------------------------------------------------------------------
 
 # ////---- Spustenie priamo ----////
 if __name__ == "__main__":
-    logic_main_init()
+    if "--child" in sys.argv[1:]:
+        # podproces pod dohľadom python/logic_process.py - log.txt (aj rotáciu) má len hostiteľ
+        _child_mode = True
+        run_logic(logic_process.child_stop_event())
+    else:
+        logic_main_init()
 
@@ -0,0 +1,262 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Logika v samostatnom procese pod dohľadom (config.json "logic_process") ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# "thread" (predvolené) - logic_main_init beží vo vlákne hostiteľa ako doteraz.
+# "subprocess"          - hostiteľ spustí len supervisor: ten štartuje python/logic.py --child
+#                         ako podproces, stop posiela cez stdin (EOF = hostiteľ skončil),
+#                         pád reštartuje s exponenciálnym backoffom a loguje CPU / RSS dieťaťa.
+# Snapshoty idú ďalej cez data/quest.json (widget sa nemení), scan, sqlite aj JSON
+# serializácia tak nesúperia s GUI vláknom o GIL.
+# Dieťa do data/log.txt nezapisuje - správy posiela na stdout ako riadky "@log <json>"
+# a zapisuje (aj rotuje) ich len hostiteľ, takže dva procesy nesúperia o jeden súbor.
+# Zmrazený hostiteľ (PyInstaller a pod.) nemá interpreter na spustenie skriptu -> vlákno.
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+
+STOP_COMMAND = "stop"
+LOG_PREFIX = "@log "
+STOP_TIMEOUT = 8.0
+BACKOFF_START = 1.0
+BACKOFF_MAX = 60.0
+# dieťa, ktoré bežalo aspoň takto dlho, sa považuje za stabilné (backoff sa resetuje)
+STABLE_AFTER = 60.0
+REPORT_INTERVAL = 300.0
+
+
+def supported():
+    """(True, None) ak sa dá spustiť podproces, inak (False, dôvod)."""
+    if getattr(sys, "frozen", False):
+        return False, "frozen host (no Python interpreter for the child)"
+    if not sys.executable or not os.path.exists(sys.executable):
+        return False, "sys.executable not available"
+    return True, None
+
+
+# ////---- CPU / RSS podprocesu ----////
+def _linux_usage(pid):
+    with open(f"/proc/{pid}/stat", "r", encoding="ascii") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    rss_kib = None
+    with open(f"/proc/{pid}/status", "r", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss_kib = int(line.split()[1])
+                break
+    return cpu, rss_kib
+
+
+def _windows_usage(pid):
+    import ctypes
+    from ctypes import wintypes
+
+    class FILETIME(ctypes.Structure):
+        _fields_ = [("low", wintypes.DWORD), ("high", wintypes.DWORD)]
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handle = kernel32.OpenProcess(0x1000 | 0x0010, False, pid)  # QUERY_LIMITED_INFORMATION | VM_READ
+    if not handle:
+        raise OSError(ctypes.get_last_error(), "OpenProcess failed")
+    try:
+        created, exited, kernel, user = FILETIME(), FILETIME(), FILETIME(), FILETIME()
+        if not kernel32.GetProcessTimes(handle, ctypes.byref(created), ctypes.byref(exited), ctypes.byref(kernel), ctypes.byref(user)):
+            raise OSError(ctypes.get_last_error(), "GetProcessTimes failed")
+        cpu = sum((t.high << 32 | t.low) for t in (kernel, user)) / 1e7
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        rss_kib = None
+        if kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            rss_kib = counters.WorkingSetSize // 1024
+        return cpu, rss_kib
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def process_usage(pid):
+    """(CPU sekundy spolu, RSS v KiB) procesu alebo None, ak to platforma nevie zistiť."""
+    try:
+        if sys.platform.startswith("linux"):
+            return _linux_usage(pid)
+        if sys.platform == "win32":
+            return _windows_usage(pid)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return None
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Supervisor (proces hostiteľa) ----////
+class LogicSupervisor:
+    def __init__(self, script_path, log=print, report_interval=REPORT_INTERVAL):
+        self.script_path = script_path
+        self.log = log
+        self.report_interval = report_interval
+        self.proc = None
+        self.restarts = 0
+        self.last_usage = None
+        self._reader = None
+
+    def _spawn(self):
+        creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0) if sys.platform == "win32" else 0
+        self.proc = subprocess.Popen(
+            [sys.executable, self.script_path, "--child"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(self.script_path))),
+            creationflags=creationflags,
+        )
+        self._reader = threading.Thread(target=self._read_output, args=(self.proc.stdout,),
+                                        name="ActiveQuestsChildOutput", daemon=True)
+        self._reader.start()
+        self.log(f"[ActiveQuests] Logic process started (pid {self.proc.pid})")
+
+    def _read_output(self, stream):
+        """Správy dieťaťa ("@log <json>") idú do logu hostiteľa, ostatný výstup na jeho stdout."""
+        try:
+            for raw in stream:
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                if line.startswith(LOG_PREFIX):
+                    try:
+                        self.log(json.loads(line[len(LOG_PREFIX):]))
+                        continue
+                    except ValueError:
+                        pass
+                print(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+
+    def _join_reader(self):
+        # po skončení dieťaťa dočítať zvyšok výstupu (posledné správy pred pádom)
+        if self._reader is not None:
+            self._reader.join(2.0)
+            self._reader = None
+
+    def _report(self, started, cpu_before):
+        usage = process_usage(self.proc.pid)
+        if not usage:
+            return cpu_before
+        cpu, rss_kib = usage
+        elapsed = max(1e-6, time.monotonic() - started)
+        share = (cpu - cpu_before[0]) / max(1e-6, elapsed - cpu_before[1]) * 100.0
+        self.last_usage = {"pid": self.proc.pid, "cpu_seconds": round(cpu, 2), "cpu_percent": round(share, 1),
+                           "rss_kib": rss_kib}
+        rss = f"{rss_kib / 1024:.1f} MiB" if rss_kib else "n/a"
+        self.log(f"[ActiveQuests] Logic process pid {self.proc.pid}: CPU {share:.1f}% (total {cpu:.1f}s), RSS {rss}")
+        return cpu, elapsed
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        proc = self.proc
+        if proc is None or proc.poll() is not None:
+            return
+        try:
+            proc.stdin.write(f"{STOP_COMMAND}\n".encode("ascii"))
+            proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.log(f"[ActiveQuests] Logic process did not stop in {timeout:.0f}s, terminating")
+            proc.terminate()
+            try:
+                proc.wait(2.0)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def run(self, stop_event):
+        """Blokuje, kým nie je nastavený stop_event alebo dieťa neskončí samo (kód 0)."""
+        stop_event = stop_event or threading.Event()
+        backoff = BACKOFF_START
+        while not stop_event.is_set():
+            try:
+                self._spawn()
+            except OSError as e:
+                self.log(f"[ActiveQuests] Logic process failed to start: {e}")
+                if stop_event.wait(backoff):
+                    break
+                backoff = min(BACKOFF_MAX, backoff * 2)
+                continue
+
+            started = time.monotonic()
+            cpu_before = (0.0, 0.0)
+            next_report = started + self.report_interval
+            while self.proc.poll() is None:
+                if stop_event.wait(0.5):
+                    break
+                if self.report_interval and time.monotonic() >= next_report:
+                    cpu_before = self._report(started, cpu_before)
+                    next_report = time.monotonic() + self.report_interval
+
+            if stop_event.is_set():
+                self.stop()
+                break
+
+            self._join_reader()
+            code = self.proc.returncode
+            runtime = time.monotonic() - started
+            if code == 0:
+                # logic_main_init skončil sám (napr. DB neexistuje) - ako vlákno v režime "thread"
+                self.log("[ActiveQuests] Logic process finished")
+                break
+            if runtime >= STABLE_AFTER:
+                backoff = BACKOFF_START
+            self.restarts += 1
+            self.log(f"[ActiveQuests] Logic process exited with code {code} after {runtime:.1f}s, "
+                     f"restart #{self.restarts} in {backoff:.1f}s")
+            if stop_event.wait(backoff):
+                break
+            backoff = min(BACKOFF_MAX, backoff * 2)
+        self.stop()
+        self._join_reader()
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Strana dieťaťa ----////
+def child_stop_event():
+    """Event nastavený príkazom "stop" alebo zatvorením stdin (hostiteľ skončil / spadol)."""
+    stop_event = threading.Event()
+
+    def watch_stdin():
+        try:
+            for line in sys.stdin:
+                if line.strip() == STOP_COMMAND:
+                    break
+        except (OSError, ValueError):
+            pass
+        stop_event.set()
+
+    threading.Thread(target=watch_stdin, name="ActiveQuestsStopPipe", daemon=True).start()
+    return stop_event
+
+
+_child_log_lock = threading.Lock()
+
+
+def child_log(message):
+    """Pošle správu hostiteľovi (zapíše ju do log.txt); bez hostiteľa sa stratí ticho."""
+    line = f"{LOG_PREFIX}{json.dumps(str(message), ensure_ascii=False)}\n".encode("utf-8")
+    with _child_log_lock:
+        try:
+            sys.stdout.buffer.write(line)
+            sys.stdout.buffer.flush()
+        except (OSError, ValueError, AttributeError):
+            pass
+# ////-----------------------------------------------------------------------------------------
@@ -0,0 +1,273 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Udalosti životného cyklu questov na shortcut_manager bridge ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# QuestFeed číta data/quest.json pri zmene a odovzdá snapshot publisheru; ten porovná stav
+# s minulým snapshotom a na bridge vyšle udalosti (bridge.emit(názov, payload)). Feed poháňa
+# časovač v GUI vlákne (widgets/quest.py start_background), nie tick widgetu - udalosti chodia
+# aj keď je quest overlay skrytý, ešte nevytvorený (lazy) alebo jeho widget čaká v poole.
+# Časovač beží, kým existuje aspoň jeden quest overlay alebo inštancia widgetu.
+#   quest.new       - quest pribudol
+#   quest.completed - všetky požiadavky splnené (rovnaká detekcia ako %completion_text%)
+#   quest.expiring  - do completion_deadline ostáva < 1 h (raz na quest)
+#   quest.progress  - zmenil sa pokrok tracking položiek (type1 dekodéry)
+# Poslucháč: bridge.on("quest.completed", lambda event: ...). Prvý snapshot (a po zmene hráča)
+# je len základ bez udalostí; stale snapshot z warm-start cache sa ignoruje.
+import os
+import sys
+import json
+import threading
+import importlib.util
+
+
+def _load_sibling(name):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{name}.py")
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        try:
+            spec.loader.exec_module(mod)
+        except Exception:
+            sys.modules.pop(key, None)
+            raise
+    return mod
+
+render_core = _load_sibling("render_core")
+translations = _load_sibling("translations")
+
+EVENT_NEW = "quest.new"
+EVENT_COMPLETED = "quest.completed"
+EVENT_EXPIRING = "quest.expiring"
+EVENT_PROGRESS = "quest.progress"
+EXPIRING_SECONDS = 3600
+
+
+# ////---- Payloady udalostí ----////
+class QuestEvent:
+    """Spoločné polia všetkých udalostí; payload je nemenný."""
+    name = None
+    __slots__ = ("quest_id", "quest_key", "sector", "user_profile_id", "timestamp")
+
+    def __init__(self, quest, user_profile_id, timestamp, **extra):
+        object.__setattr__(self, "quest_id", quest.get("id"))
+        object.__setattr__(self, "quest_key", quest.get("quest_data_asset_path"))
+        object.__setattr__(self, "sector", quest.get("sector"))
+        object.__setattr__(self, "user_profile_id", user_profile_id)
+        object.__setattr__(self, "timestamp", timestamp)
+        for key, value in extra.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def to_dict(self):
+        slots = [slot for cls in type(self).__mro__ for slot in getattr(cls, "__slots__", ())]
+        return {"event": self.name, **{slot: getattr(self, slot) for slot in slots}}
+
+    def __repr__(self):
+        return f"{type(self).__name__}(quest_id={self.quest_id!r}, quest_key={self.quest_key!r})"
+
+
+class QuestNew(QuestEvent):
+    name = EVENT_NEW
+    __slots__ = ()
+
+
+class QuestCompleted(QuestEvent):
+    name = EVENT_COMPLETED
+    __slots__ = ()
+
+
+class QuestExpiring(QuestEvent):
+    """seconds_left - zostávajúci herný čas v čase snapshotu."""
+    name = EVENT_EXPIRING
+    __slots__ = ("seconds_left",)
+
+
+class QuestProgressChanged(QuestEvent):
+    """previous / current - tuple render_core.QuestProgress (položka, complete, required)."""
+    name = EVENT_PROGRESS
+    __slots__ = ("previous", "current")
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Porovnanie snapshotov ----////
+class QuestEventTracker:
+    def __init__(self, expiring_seconds=EXPIRING_SECONDS):
+        self.expiring_seconds = expiring_seconds
+        self._user_profile_id = None
+        # quest_id -> (data, progress, complete, expiring)
+        self._state = None
+
+    def reset(self):
+        self._user_profile_id = None
+        self._state = None
+
+    def _completion(self, quest, text_source, translations, language):
+        entry = translations.get(quest.get("quest_data_asset_path"), {})
+        progress = render_core.decode_progress(quest, entry)
+        merged = render_core.merge_translated_fields(dict(quest), text_source, language)
+        return progress, render_core.is_quest_complete(merged)
+
+    def _remaining(self, quest, timestamp):
+        deadline = quest.get("completion_deadline") or 0
+        if not deadline or timestamp is None:
+            return None
+        return int(deadline - timestamp)
+
+    def update(self, user_profile_id, timestamp, quests, text_source, language="en"):
+        """Vráti zoznam udalostí voči minulému snapshotu (prvý snapshot hráča = len základ)."""
+        translations = render_core.load_translations(text_source)
+        if not translations:
+            # bez prekladov by sa pokrok a dokončenie javili ako zmena po ich načítaní
+            return []
+        baseline = self._state is None or user_profile_id != self._user_profile_id
+        previous = self._state or {}
+        current, events = {}, []
+        for quest in quests or []:
+            quest_id = quest.get("id")
+            data = quest.get("data")
+            if isinstance(data, list):
+                data = tuple(data)
+            old = previous.get(quest_id)
+            if old is not None and old[0] == data:
+                # rovnaké tracking dáta - pokrok ani dokončenie sa nezmenili
+                progress, complete = old[1], old[2]
+            else:
+                progress, complete = self._completion(quest, text_source, translations, language)
+            remaining = self._remaining(quest, timestamp)
+            expiring = remaining is not None and 0 < remaining <= self.expiring_seconds
+            current[quest_id] = (data, progress, complete, expiring)
+            if baseline:
+                continue
+
+            if old is None:
+                events.append(QuestNew(quest, user_profile_id, timestamp))
+                old = (None, progress, complete, False)
+            elif progress and progress != old[1]:
+                events.append(QuestProgressChanged(quest, user_profile_id, timestamp, previous=old[1], current=progress))
+            if complete and not old[2]:
+                events.append(QuestCompleted(quest, user_profile_id, timestamp))
+            if expiring and not old[3]:
+                events.append(QuestExpiring(quest, user_profile_id, timestamp, seconds_left=remaining))
+        self._state = current
+        self._user_profile_id = user_profile_id
+        return events
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Publisher (jeden na proces) ----////
+class QuestEventPublisher:
+    def __init__(self, tracker=None):
+        self.tracker = tracker or QuestEventTracker()
+        self.published = 0
+        self._lock = threading.Lock()
+        self._last_key = None
+        self._warned = False
+
+    def publish(self, bridge, key, data, text_source, language="en"):
+        """
+        Spracuje snapshot quest.json (data) a vyšle udalosti na bridge. key identifikuje
+        snapshot (mtime + hráč + timestamp) - rovnaký snapshot sa druhýkrát nespracuje.
+        """
+        emit = getattr(bridge, "emit", None)
+        if emit is None:
+            if bridge is not None and not self._warned:
+                self._warned = True
+                print("[QuestEvents] Bridge has no emit(), quest events disabled")
+            return []
+        with self._lock:
+            if key == self._last_key or data.get("stale"):
+                # stale = warm-start snapshot z cache, nie aktuálny stav hry
+                return []
+            self._last_key = key
+            events = self.tracker.update(data.get("user_profile_id"), data.get("timestamp"),
+                                         data.get("quests"), text_source, language)
+        for event in events:
+            try:
+                emit(event.name, event)
+                self.published += 1
+            except Exception as e:
+                print(f"[QuestEvents] Error emitting {event.name}: {e}")
+        return events
+
+
+_PUBLISHER = None
+_publisher_lock = threading.Lock()
+
+
+def get_publisher():
+    """Jeden publisher na proces - zdieľajú ho všetky inštancie widgetu."""
+    global _PUBLISHER
+    with _publisher_lock:
+        if _PUBLISHER is None:
+            _PUBLISHER = QuestEventPublisher()
+        return _PUBLISHER
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Sledovanie data/quest.json (nezávisle od widgetov) ----////
+class _TranslationSource:
+    """text_source pre render_core - index prekladov z translate.json vedľa quest.json."""
+    def __init__(self, translate_path):
+        self._provider = translations.get_provider(translate_path)
+        self.language = "en"
+
+    def get_cached_translations(self):
+        try:
+            return self._provider.quests(self.language)
+        except Exception:
+            return {}
+
+
+class QuestFeed:
+    """
+    Číta quest.json iba pri zmene mtime a publikuje ho. owners / timer spravuje hostiteľ
+    časovača (widgets/quest.py), feed je jeden na proces aj po hot-reloade widget modulu.
+    """
+    def __init__(self, data_path, publisher=None):
+        self.data_path = data_path
+        self.publisher = publisher or get_publisher()
+        self.owners = set()
+        self.timer = None
+        self._last_mtime = None
+        self._source = None
+
+    def poll(self, bridge, language="en"):
+        try:
+            mtime = os.path.getmtime(self.data_path)
+        except OSError:
+            return []
+        if mtime == self._last_mtime:
+            return []
+        try:
+            with open(self.data_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # súbor sa práve prepisuje - skús znova pri ďalšom poll()
+            return []
+        self._last_mtime = mtime
+        if not isinstance(data, dict):
+            return []
+        if self._source is None:
+            self._source = _TranslationSource(os.path.join(os.path.dirname(self.data_path), "translate.json"))
+        self._source.language = language
+        key = (mtime, data.get("user_profile_id"), data.get("timestamp"))
+        return self.publisher.publish(bridge, key, data, self._source, language)
+
+
+_FEEDS = {}
+_feeds_lock = threading.Lock()
+
+
+def get_feed(data_path):
+    """Jeden feed na quest.json v procese."""
+    path = os.path.abspath(data_path)
+    with _feeds_lock:
+        feed = _FEEDS.get(path)
+        if feed is None:
+            feed = _FEEDS[path] = QuestFeed(path)
+        return feed
+# ////-----------------------------------------------------------------------------------------
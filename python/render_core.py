@@ -0,0 +1,970 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Render core - čisté (Qt-free) vykresľovanie questov do HTML ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Všetko, čo widgets/quest.py potrebuje na premenu questov na HTML, bez PySide6 a bez
+# shortcut_manager: zlúčenie prekladov, dekodéry tracking dát, filter/triedenie, šablóny
+# -> HTML. Widget volá tieto funkcie so svojím stavom; tools/bench_render.py ich meria
+# headless a porovnáva výstup s referenciou.
+import os
+import sys
+import json
+import html
+import re
+import importlib.util
+
+
+def _load_sibling(name):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{name}.py")
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        try:
+            spec.loader.exec_module(mod)
+        except Exception:
+            sys.modules.pop(key, None)
+            raise
+    return mod
+
+translations = _load_sibling("translations")
+
+
+def format_time_remaining(seconds, fmt="%dd %hh %mm %ss"):
+    if seconds is None:
+        return "N/A"
+    if seconds < 0:
+        seconds = 0
+    days = seconds // 86400
+    hours = (seconds % 86400) // 3600
+    minutes = (seconds % 3600) // 60
+    secs = seconds % 60
+    return (
+        fmt.replace("%dd", f"{days:02}d")
+        .replace("%hh", f"{hours:02}h")
+        .replace("%mm", f"{minutes:02}m")
+        .replace("%ss", f"{secs:02}s")
+        .replace("%d", f"{days:02}")
+        .replace("%h", f"{hours:02}")
+        .replace("%m", f"{minutes:02}")
+        .replace("%s", f"{secs:02}")
+    )
+
+
+def get_time_color(seconds_left, color_rules):
+    try:
+        keys = sorted([int(k) for k in color_rules.keys()], reverse=True)
+        for k in keys:
+            if seconds_left >= k:
+                return color_rules[str(k)]
+        return color_rules[str(keys[-1])] if keys else "#ffffff"
+    except Exception:
+        return "#ffffff"
+
+
+def load_translations(widget):
+    try:
+        if hasattr(widget, 'get_cached_translations'):
+            return widget.get_cached_translations()
+        
+        base_path = getattr(widget, "_data_path", None)
+        if not base_path:
+            return {}
+        folder = os.path.dirname(base_path)
+        translate_path = os.path.join(folder, "translate.json")
+
+        if not os.path.exists(translate_path):
+            return {}
+
+        with open(translate_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("quests", {}) if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+def merge_quest_texts(widget, combined, language="en"):
+    quest_id = None
+    for candidate in ("quest_data_asset_path", "translate_key", "quest_key", "id"):
+        if isinstance(combined, dict) and combined.get(candidate):
+            quest_id = combined.get(candidate)
+            break
+    if not quest_id:
+        return {}
+
+    base = quest_id.replace("QuestSetup:", "")
+    parts = base.split("_")
+
+    tier = parts[0] if len(parts) > 0 else ""
+    shop = parts[1] if len(parts) > 1 else ""
+    raw_name = "_".join(parts[2:]) if len(parts) > 2 else ""
+    fallback_name = raw_name.replace("_", " ").strip()
+
+    result = {
+        "tier": tier,
+        "shop": shop,
+        "name": fallback_name,
+        "description": "",
+        "requirements": "",
+        "rewards": "",
+        "req_data": {}
+    }
+
+    translations = load_translations(widget)
+    entry = translations.get(quest_id, {}) if isinstance(translations, dict) else {}
+
+    if entry:
+        if isinstance(entry.get("name"), dict):
+            result["name"] = entry["name"].get(language, fallback_name)
+        else:
+            if isinstance(entry.get("name"), str):
+                result["name"] = entry.get("name")
+
+        desc_val = entry.get("description")
+        if isinstance(desc_val, dict):
+            result["description"] = desc_val.get(language, "")
+        elif isinstance(desc_val, str):
+            result["description"] = desc_val
+
+        if isinstance(entry.get("requirements"), dict):
+            result["requirements"] = entry["requirements"].get(language, "")
+        elif isinstance(entry.get("requirements"), str):
+            result["requirements"] = entry.get("requirements")
+
+        for k, v in entry.items():
+            if isinstance(k, str) and k.startswith("requirements_"):
+                if isinstance(v, dict):
+                    result[k] = v.get(language, "")
+                else:
+                    result[k] = v
+
+        if isinstance(entry.get("rewards"), dict):
+            result["rewards"] = entry["rewards"].get(language, "")
+        elif isinstance(entry.get("rewards"), str):
+            result["rewards"] = entry.get("rewards")
+
+        if isinstance(entry.get("translate_data"), dict):
+            td = entry.get("translate_data")
+            result["req_data"] = td
+            for inner_k, inner_v in td.items():
+                if inner_k == "completion_text":
+                    result["completion_text"] = inner_v
+                    continue
+                result[inner_k] = inner_v
+
+    return result
+
+
+def apply_translation(quest, translations, language="en"):
+    if not isinstance(quest, dict):
+        return quest
+    q_key = quest.get("quest_key") or quest.get("id")
+    entry = translations.get(q_key, {}) if translations else {}
+
+    for key in ["name", "description", "requirements", "rewards"]:
+        if key in entry:
+            val = entry[key].get(language) if isinstance(entry[key], dict) else entry[key]
+            if val:
+                quest[key] = val
+
+    if "tier" in entry:
+        quest.setdefault("tier", entry.get("tier"))
+    if "rewards" in entry:
+        quest.setdefault("rewards", entry.get("rewards"))
+    if "req_data" in entry:
+        quest.setdefault("req_data", entry.get("req_data"))
+
+    return quest
+
+# ============================================================================
+# Smart Binary Data Parser
+# ============================================================================
+
+def parse_smart_translate_key(hex_data: str, translate_key: str, flat: dict) -> str:
+    """
+    Parsuje špeciálne translate kľúče typu:
+    "type1:0,1,8,9": "template|completion_suffix"
+    """
+    try:
+        decoder = translations.get_decoder(translate_key)
+        if decoder is None:
+            return None
+        
+        _parser_type, complete_pos, required_pos = decoder
+        
+        if not hex_data or len(hex_data) % 2 != 0:
+            return None
+        
+        bytes_data = bytes.fromhex(hex_data)
+        
+        if complete_pos[1] >= len(bytes_data):
+            return None
+        complete_bytes = bytes_data[complete_pos[0]:complete_pos[1]+1]
+        complete = int.from_bytes(complete_bytes, byteorder='little')
+        
+        if required_pos[1] >= len(bytes_data):
+            return None
+        required_bytes = bytes_data[required_pos[0]:required_pos[1]+1]
+        required = int.from_bytes(required_bytes, byteorder='little')
+        
+        return {
+            "complete": complete,
+            "required": required,
+            "is_complete": complete >= required
+        }
+        
+    except Exception as e:
+        print(f"[SmartParser] Error parsing {translate_key}: {e}")
+        return None
+
+
+class QuestProgress:
+    """Pokrok jednej tracking položky questu (item od 1)."""
+    __slots__ = ("item", "complete", "required")
+
+    def __init__(self, item, complete, required):
+        object.__setattr__(self, "item", item)
+        object.__setattr__(self, "complete", complete)
+        object.__setattr__(self, "required", required)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("QuestProgress is immutable")
+
+    @property
+    def is_complete(self):
+        return self.complete >= self.required
+
+    def __eq__(self, other):
+        return isinstance(other, QuestProgress) and (self.item, self.complete, self.required) == (other.item, other.complete, other.required)
+
+    def __hash__(self):
+        return hash((self.item, self.complete, self.required))
+
+    def __repr__(self):
+        return f"QuestProgress({self.item}, {self.complete}/{self.required})"
+
+
+def decode_progress(quest, entry):
+    """
+    Pokrok tracking položiek questu cez type1 dekodéry z translate.json (rovnako ako widget):
+    single -> translate_data, multi -> translate_data_N s fallbackom na translate_data.
+    Vráti tuple QuestProgress (položky bez dekodéra sa vynechajú).
+    """
+    data = quest.get("data")
+    if not data or not isinstance(entry, dict):
+        return ()
+    items = data if isinstance(data, (list, tuple)) else (data,)
+    result = []
+    for idx, hex_data in enumerate(items):
+        translate_data = entry.get(f"translate_data_{idx + 1}") if len(items) > 1 else None
+        if not isinstance(translate_data, dict):
+            translate_data = entry.get("translate_data")
+        if not hex_data or not isinstance(translate_data, dict):
+            continue
+        for translate_key in translate_data:
+            if translate_key.startswith("type1:"):
+                parsed = parse_smart_translate_key(hex_data, translate_key, entry)
+                if parsed:
+                    result.append(QuestProgress(idx + 1, parsed["complete"], parsed["required"]))
+                    break
+    return tuple(result)
+
+
+def apply_smart_template(template: str, parsed_data: dict, flat: dict) -> str:
+    """
+    Aplikuje šablónu s inteligentnými tokenmi.
+    """
+    parts = template.split(" ## ", 1)
+    incomplete_template = parts[0]
+    complete_suffix = parts[1] if len(parts) > 1 else ""
+    
+    if parsed_data["is_complete"] and complete_suffix:
+        result = complete_suffix
+    else:
+        result = incomplete_template
+    
+    result = result.replace("%complete%", str(parsed_data["complete"]))
+    result = result.replace("%required%", str(parsed_data["required"]))
+    
+    for key, val in flat.items():
+        token = f"%{key}%"
+        if token in result:
+            result = result.replace(token, str(val) if val is not None else "")
+    
+    return result
+
+# ============================================================================
+# 🔧 FIX: MULTI-ITEM QUEST SUPPORT - pridaný fallback na hlavný translate_data
+# ============================================================================
+
+def check_all_requirements_complete(quest_data_list: list, flat: dict) -> bool:
+    """
+    Skontroluje či sú všetky requirements splnené.
+    🆕 NOVÉ: Podporuje fallback na hlavný translate_data ak neexistujú translate_data_X
+    """
+    if not isinstance(quest_data_list, list) or not quest_data_list:
+        return False
+    
+    for idx, hex_data in enumerate(quest_data_list):
+        key = f"translate_data_{idx + 1}"
+        
+        # 🆕 FALLBACK: Ak neexistuje translate_data_X, skús hlavný translate_data
+        if key not in flat:
+            if "translate_data" in flat and isinstance(flat["translate_data"], dict):
+                translate_data = flat["translate_data"]
+            else:
+                return False
+        else:
+            translate_data = flat[key]
+        
+        if not isinstance(translate_data, dict):
+            continue
+        
+        is_complete = False
+        for translate_key, translate_template in translate_data.items():
+            if translate_key.startswith("type1:"):
+                parsed = parse_smart_translate_key(hex_data, translate_key, flat)
+                if parsed and parsed.get("is_complete", False):
+                    is_complete = True
+                    break
+        
+        if not is_complete:
+            return False
+    
+    return True
+
+
+def process_multi_item_quest(quest_data_list: list, flat: dict) -> str:
+    """
+    Spracuje quest s viacerými tracking items.
+    """
+    result_parts = []
+    
+    for idx, hex_data in enumerate(quest_data_list):
+        req_key = f"requirements_{idx + 1}"
+        data_key = f"translate_data_{idx + 1}"
+        
+        requirement_text = flat.get(req_key, "")
+        
+        if data_key not in flat:
+            if requirement_text:
+                result_parts.append(f"{requirement_text}: {hex_data}")
+            continue
+        
+        translate_data = flat[data_key]
+        if not isinstance(translate_data, dict):
+            continue
+        
+        matched_value = None
+        for translate_key, translate_template in translate_data.items():
+            if translate_key.startswith("type1:"):
+                parsed = parse_smart_translate_key(hex_data, translate_key, flat)
+                if parsed:
+                    matched_value = apply_smart_template(translate_template, parsed, flat)
+                    break
+        
+        if matched_value is None and hex_data in translate_data:
+            matched_value = translate_data[hex_data]
+        
+        if matched_value is None and hex_data:
+            matched_value = translations.longest_prefix_value(translate_data, hex_data)
+        
+        if requirement_text:
+            item_result = f"{requirement_text}: {matched_value if matched_value else hex_data}"
+        else:
+            item_result = matched_value if matched_value else hex_data
+        
+        result_parts.append(item_result)
+    
+    result = "<br>".join(result_parts)
+    flat["requirements"] = ""
+    
+    return result
+
+
+# ============================================================================
+# 🔧 OPRAVA: completion_text s vnorénymi tokenmi a dvoma režimami farieb
+# ============================================================================
+
+# REŽIM 1: token_colors["completion_text"] JE nastavená
+# → Celý completion_text má túto farbu (vrátane vnorených tokenov)
+# Príklad: "TURN IN TO C1 ARMORER" → celé zelené
+
+# REŽIM 2: token_colors["completion_text"] NIE JE nastavená
+# → completion_text má line_color, ale vnorené tokeny majú svoje farby
+# Príklad: "TURN IN TO C1 ARMORER" → "TURN IN TO" (biela) "C1" (žltá) "ARMORER" (biela)
+
+# ============================================================================
+# NÁJDI replace_tokens_html_simple() A UPRAV SPRACOVANIE TOKENOV:
+# ============================================================================
+
+def replace_tokens_html_simple(template: str, combined: dict, globals_dict: dict, cfg: dict, remaining=None, line_color=None):
+    token_colors = cfg.get("token_colors", {}) if isinstance(cfg, dict) else {}
+    out = html.escape(template)
+
+    out = out.replace("\r\n", "\n").replace("\r", "\n").replace("\n", "<br>")
+
+    flat = {}
+    if isinstance(globals_dict, dict):
+        flat.update(globals_dict)
+    if isinstance(combined, dict):
+        flat.update(combined)
+
+    widget_instance = cfg.get("widget_instance") if isinstance(cfg, dict) else None
+    candidate_keys = ("quest_data_asset_path", "translate_key", "quest_key", "id")
+    if widget_instance and any(k in flat for k in candidate_keys):
+        try:
+            quest_texts = {}
+            if hasattr(widget_instance, "get_quest_texts"):
+                qid = None
+                for k in candidate_keys:
+                    if flat.get(k):
+                        qid = flat.get(k)
+                        break
+                quest_texts = widget_instance.get_quest_texts(qid, language=cfg.get("language", "en")) or {}
+            else:
+                quest_texts = merge_quest_texts(widget_instance, flat, language=cfg.get("language", "en"))
+            if isinstance(quest_texts, dict):
+                for k, v in quest_texts.items():
+                    if k not in flat or not flat.get(k):
+                        flat[k] = v
+        except Exception:
+            pass
+
+    if "time_remaining" in flat and remaining is not None:
+        flat["time_remaining_seconds"] = remaining
+
+    for key, val in list(flat.items()):
+        token = f"%{key}%"
+        if token in out:
+            # 🆕 ŠPECIÁLNE SPRACOVANIE PRE completion_text
+            if key == "completion_text" and isinstance(val, str):
+                completion_token_color = token_colors.get("completion_text")
+                
+                if completion_token_color:
+                    # 🎨 REŽIM 1: Celý text jednou farbou (token_colors["completion_text"])
+                    # Najprv nahraď všetky vnorené tokeny (bez ich farieb)
+                    processed = val
+                    for sub_key, sub_val in flat.items():
+                        token2 = f"%{sub_key}%"
+                        if token2 in processed:
+                            sub_val_str = str(sub_val) if sub_val is not None else ""
+                            processed = processed.replace(token2, sub_val_str)
+                    
+                    safe = html.escape(processed)
+                    safe = safe.replace("&lt;br&gt;", "<br>")
+                    # Celý text má farbu z token_colors
+                    safe = f"<span style=\"color:{completion_token_color};\">{safe}</span>"
+                    out = out.replace(token, safe)
+                    continue
+                
+                else:
+                    # 🎨 REŽIM 2: Vnorené tokeny majú svoje farby, zvyšok má line_color
+                    # Rozdeľ text na časti a identifikuj tokeny
+                    import re
+                    
+                    # Najprv escapuj celý text
+                    safe_text = html.escape(val)
+                    
+                    # Nájdi všetky tokeny vo forme %xxx%
+                    token_pattern = r'%([a-zA-Z_][a-zA-Z0-9_]*)%'
+                    
+                    def replace_nested_token(match):
+                        token_name = match.group(1)
+                        token_value = flat.get(token_name, match.group(0))
+                        
+                        if token_value == match.group(0):
+                            # Token nebol nájdený, nechaj ho tak
+                            return html.escape(match.group(0))
+                        
+                        # Získaj hodnotu a escapuj ju
+                        token_value_str = str(token_value) if token_value is not None else ""
+                        safe_value = html.escape(token_value_str)
+                        
+                        # Aplikuj farbu tokenu ak existuje
+                        sub_color = token_colors.get(token_name)
+                        if sub_color:
+                            return f"<span style=\"color:{sub_color};\">{safe_value}</span>"
+                        else:
+                            return safe_value
+                    
+                    # Nahraď všetky vnorené tokeny
+                    result = re.sub(token_pattern, replace_nested_token, val)
+                    
+                    # Escapuj HTML značky (ale nie naše span tagy)
+                    # Už máme escapované cez replace_nested_token
+                    safe = result.replace("<br>", "<br>")  # Zachovaj <br>
+                    
+                    out = out.replace(token, safe)
+                    continue
+            
+            # ŠTANDARDNÉ SPRACOVANIE PRE req_data
+            if key == "req_data" and isinstance(val, dict):
+                quest_data = flat.get("data")
+                
+                if isinstance(quest_data, list):
+                    matched_value = process_multi_item_quest(quest_data, flat)
+                else:
+                    quest_data_key = quest_data if isinstance(quest_data, str) else ""
+                    matched_value = None
+                    
+                    for translate_key, translate_template in val.items():
+                        if translate_key.startswith("type1:"):
+                            parsed = parse_smart_translate_key(quest_data_key, translate_key, flat)
+                            if parsed:
+                                matched_value = apply_smart_template(translate_template, parsed, flat)
+                                break
+                    
+                    if matched_value is None and quest_data_key in val:
+                        matched_value = val[quest_data_key]
+                    
+                    if matched_value is None and quest_data_key:
+                        # najdlhší hex prefix cez trie (cachované pre každý blob)
+                        matched_value = translations.longest_prefix_value(val, quest_data_key)
+                    
+                    if matched_value is None:
+                        matched_value = quest_data_key if quest_data_key else ""
+                
+                if matched_value:
+                    val = matched_value
+                    if isinstance(val, str):
+                        for sub_key, sub_val in flat.items():
+                            token2 = f"%{sub_key}%"
+                            if token2 in val:
+                                val = val.replace(token2, str(sub_val))
+                else:
+                    val = ""
+            
+            # ŠTANDARDNÉ SPRACOVANIE PRE rewards a requirements
+            elif key in ["rewards", "requirements"] and isinstance(val, str):
+                for sub_key, sub_val in flat.items():
+                    token2 = f"%{sub_key}%"
+                    if token2 in val:
+                        val = val.replace(token2, str(sub_val))
+
+            # ŠTANDARDNÉ SPRACOVANIE PRE OSTATNÉ TOKENY
+            raw_val = "" if val is None else str(val)
+            safe = html.escape(raw_val)
+            safe = safe.replace("&lt;br&gt;", "<br>")
+
+            color = token_colors.get(key)
+            if color == "dynamic" and key == "time_remaining":
+                color = get_time_color(int(remaining or 0), cfg.get("time_remaining_colors", {}))
+
+            if color:
+                safe = f"<span style=\"color:{color};\">{safe}</span>"
+
+            out = out.replace(token, safe)
+
+    if line_color:
+        out = f'<span style="color:{line_color};">{out}</span>'
+
+    out = out.replace('&amp;#37;', '%')
+
+    return out
+
+
+# ============================================================================
+# Príprava questov, filter a triedenie
+# ============================================================================
+
+def prepare_quests(quests):
+    """Doplní tier / shop / sort_name z quest_data_asset_path (QuestSetup:T1_AR_Name)."""
+    for q in quests:
+        ap = q.get("quest_data_asset_path", "")
+        if ap and ":" in ap:
+            try:
+                _, raw = ap.split(":", 1)
+                parts = raw.split("_")
+                if len(parts) >= 3:
+                    q["tier"] = parts[0]
+                    q["shop"] = parts[1]
+                    q["sort_name"] = " ".join(parts[2:]).replace("_", " ")
+                else:
+                    q.setdefault("tier", "")
+                    q.setdefault("shop", "")
+                    q.setdefault("sort_name", raw)
+            except Exception:
+                q.setdefault("tier", "")
+                q.setdefault("shop", "")
+                q.setdefault("sort_name", ap)
+    return quests
+
+
+def active_filter_set(cfg, group):
+    """Zapnuté sektory / obchody z cfg["filter"][group] ako množina (veľké písmená)."""
+    try:
+        mapping = cfg.get("filter", {}).get(group, {})
+        if isinstance(mapping, dict):
+            return {k.upper() for k, v in mapping.items() if v}
+    except Exception:
+        pass
+    return set()
+
+
+def filter_quests(quests, cfg, active_sectors=(), active_shops=()):
+    if not isinstance(quests, list):
+        return []
+    filt = cfg.get("filter", {})
+    enabled = bool(filt.get("enabled", False))
+    result = []
+    for q in quests:
+        include = True
+
+        sec = str(q.get("sector", "")).upper()
+        if enabled:
+            cfg_sectors = filt.get("sectors", {})
+            if isinstance(cfg_sectors, dict) and any(cfg_sectors.values()):
+                if sec not in active_sectors:
+                    include = False
+
+        shop = str(q.get("shop", "")).upper()
+        if enabled and include:
+            cfg_shops = filt.get("shops", {})
+            if isinstance(cfg_shops, dict) and any(cfg_shops.values()):
+                if shop not in active_shops:
+                    include = False
+
+        if include:
+            result.append(q)
+    return result
+
+def sort_quests(quests, cfg, current_world_ts=None):
+    sort_cfg = cfg.get("sort", {}) or {}
+    keys = sort_cfg.get("keys", [])
+    if isinstance(keys, str):
+        keys = [keys]
+    if not keys:
+        return quests
+    order_asc = sort_cfg.get("order", "asc").lower() == "asc"
+
+    def sort_value(q, key):
+        if key == "time_remaining":
+            completion = q.get("completion_deadline", 0) or 0
+            current_ts = current_world_ts or 0
+            try:
+                return int(completion) - int(current_ts)
+            except Exception:
+                return 0
+        val = q.get(key, "")
+        try:
+            return float(val)
+        except Exception:
+            return str(val).lower()
+
+    try:
+        return sorted(quests, key=lambda q: tuple(sort_value(q, k) for k in keys), reverse=not order_asc)
+    except Exception:
+        return quests
+
+
+# ============================================================================
+# Shortcut akcie (widget aj replay)
+# ============================================================================
+
+SORT_KEY_OPTIONS = [
+    "id",
+    "tier",
+    "sector",
+    "shop",
+    "time_remaining",
+    "sort_name"
+]
+
+DISPLAY_TOGGLE_OPTIONS = [
+    "show_name",
+    "show_description",
+    "show_requirements",
+    "show_rewards",
+    "show_data"
+]
+
+SORT_ACTIONS = ("sort_order_asc", "sort_order_desc", "cycle_sort_key", "add_sort_key", "clear_sort_keys")
+
+
+class ViewState:
+    """Stav zobrazenia mimo configu: stránka, veľkosť stránky, aktívne sektory / obchody."""
+
+    def __init__(self, page=0, page_size=10, active_sectors=None, active_shops=None):
+        self.page = page
+        self.page_size = page_size
+        self.active_sectors = active_sectors if active_sectors is not None else set()
+        self.active_shops = active_shops if active_shops is not None else set()
+        self.total_pages = None
+
+
+def apply_action(action_name, cfg, view, visible_count=None):
+    """
+    Vykoná shortcut akciu nad cfg a view. Vráti, čo sa zmenilo ("filter", "sort",
+    "display", "page_size", "page") alebo None pre neznámu akciu.
+    visible_count() vráti počet questov po filtri (potrebné pre next_page).
+    """
+    if action_name == "toggle_filter":
+        cfg["filter"]["enabled"] = not cfg["filter"].get("enabled", False)
+        return "filter"
+
+    if action_name.startswith("toggle_sector_"):
+        sector_code = action_name.replace("toggle_sector_", "").upper()
+        sectors = cfg.setdefault("filter", {}).setdefault("sectors", {})
+        sectors[sector_code] = not sectors.get(sector_code, False)
+        if sectors[sector_code]:
+            view.active_sectors.add(sector_code)
+        else:
+            view.active_sectors.discard(sector_code)
+        return "filter"
+
+    if action_name.startswith("toggle_shop_"):
+        shop_code = action_name.replace("toggle_shop_", "").upper()
+        shops = cfg.setdefault("filter", {}).setdefault("shops", {})
+        shops[shop_code] = not shops.get(shop_code, False)
+        if shops[shop_code]:
+            view.active_shops.add(shop_code)
+        else:
+            view.active_shops.discard(shop_code)
+        return "filter"
+
+    if action_name == "sort_order_asc":
+        cfg.setdefault("sort", {})["order"] = "asc"
+        return "sort"
+
+    if action_name == "sort_order_desc":
+        cfg.setdefault("sort", {})["order"] = "desc"
+        return "sort"
+
+    if action_name == "cycle_sort_key":
+        keys = cfg.setdefault("sort", {}).setdefault("keys", [])
+        if not keys:
+            keys.append("id")
+        else:
+            last_idx = len(keys) - 1
+            try:
+                current_idx = SORT_KEY_OPTIONS.index(keys[last_idx])
+                keys[last_idx] = SORT_KEY_OPTIONS[(current_idx + 1) % len(SORT_KEY_OPTIONS)]
+            except ValueError:
+                keys[last_idx] = "id"
+        cfg["sort"]["keys"] = keys
+        return "sort"
+
+    if action_name == "add_sort_key":
+        keys = cfg.setdefault("sort", {}).setdefault("keys", [])
+        for k in SORT_KEY_OPTIONS:
+            if k not in keys:
+                keys.append(k)
+                break
+        cfg["sort"]["keys"] = keys
+        return "sort"
+
+    if action_name == "clear_sort_keys":
+        cfg.setdefault("sort", {})["keys"] = ["id"]
+        return "sort"
+
+    if action_name.startswith("toggle_display_"):
+        display_key = action_name.replace("toggle_display_", "")
+        if display_key in DISPLAY_TOGGLE_OPTIONS:
+            cfg.setdefault("display", {})[display_key] = not cfg.get("display", {}).get(display_key, True)
+            return "display"
+        return None
+
+    if action_name == "next_page":
+        count = visible_count() if visible_count else 0
+        view.total_pages = max(1, (count + view.page_size - 1) // view.page_size)
+        view.page = min(view.page + 1, view.total_pages - 1)
+        return "page"
+
+    if action_name == "prev_page":
+        view.page = max(0, view.page - 1)
+        return "page"
+
+    if action_name in ("increase_page_size", "decrease_page_size"):
+        if action_name == "increase_page_size":
+            view.page_size = min(50, view.page_size + 1)
+        else:
+            view.page_size = max(1, view.page_size - 1)
+        view.page = 0
+        cfg["page_size"] = view.page_size
+        return "page_size"
+
+    return None
+
+
+# ============================================================================
+# Šablóny -> HTML
+# ============================================================================
+
+def merge_translated_fields(q_copy, text_source, language="en"):
+    """Doplní do kópie questu texty a translate dáta z prekladov (prázdne polia prepíše)."""
+    try:
+        translations_for_q = {}
+        if hasattr(text_source, "get_quest_texts"):
+            translations_for_q = text_source.get_quest_texts(q_copy.get("quest_data_asset_path") or q_copy.get("quest_key") or q_copy.get("id"), language=language) or {}
+        else:
+            translations_for_q = merge_quest_texts(text_source, q_copy, language=language) or {}
+        if isinstance(translations_for_q, dict):
+            for tk, tv in translations_for_q.items():
+                if tk not in q_copy or not q_copy.get(tk):
+                    q_copy[tk] = tv
+    except Exception:
+        pass
+    return q_copy
+
+
+def is_quest_complete(q_copy):
+    """Quest so zlúčenými prekladmi (merge_translated_fields) má splnené všetky požiadavky."""
+    # Detekcia pre MULTI-ITEM quest
+    if isinstance(q_copy.get("data"), list):
+        try:
+            return bool(check_all_requirements_complete(q_copy.get("data", []), q_copy))
+        except Exception:
+            return False
+
+    # Detekcia pre SINGLE-ITEM quest
+    try:
+        quest_data_str = q_copy.get("data") if isinstance(q_copy.get("data"), str) else ""
+        req_data = q_copy.get("req_data") if isinstance(q_copy.get("req_data"), dict) else {}
+
+        for translate_key in req_data.keys():
+            if translate_key.startswith("type1:"):
+                parsed = parse_smart_translate_key(quest_data_str, translate_key, q_copy)
+                if parsed and parsed.get("is_complete", False):
+                    return True
+    except Exception:
+        pass
+    return False
+
+
+def generate_full_html(quests, current_ts, cfg, text_source=None, page=0, page_size=10,
+                       active_sectors=(), active_shops=(), extra_globals=None):
+    """
+    Celé HTML overlayu: hlavička + questy aktuálnej stránky. text_source je objekt
+    s get_cached_translations() alebo get_quest_texts() (widget, headless zdroj).
+    extra_globals dopĺňa tokeny hlavičky (napr. stav herných hodín).
+    """
+    header_cfg = cfg.get("header", [])
+    lines_cfg = cfg.get("lines", [])
+    display_cfg = cfg.get("display", {})
+    if "auto_complete" not in display_cfg and "show_data" in display_cfg:
+        display_cfg["auto_complete"] = display_cfg.get("show_data", True)
+
+    parts = []
+    base_font = cfg.get("font_family", "Consolas")
+    base_size = cfg.get("default_font_size", 10)
+
+    parts.append(f"<div style='font-family: {base_font}; font-size: {base_size}pt; color: #ffffff;'>")
+
+    # Pagination info
+    total_quests = len(quests)
+    total_pages = max(1, (total_quests + page_size - 1) // page_size)
+    current_page_display = min(page + 1, total_pages)
+
+    globals_dict = {
+        "quest_count": total_quests,
+        "timestamp": current_ts,
+        "filter_enabled": str(bool(cfg.get("filter", {}).get("enabled", False))),
+        "filter_active_sectors": ", ".join(sorted(list(active_sectors))) if active_sectors else "ALL",
+        "filter_active_shops": ", ".join(sorted(list(active_shops))) if active_shops else "ALL",
+        "sort_keys": ", ".join(cfg.get("sort", {}).get("keys", [])) if cfg.get("sort", {}).get("keys") else "",
+        "sort_order": cfg.get("sort", {}).get("order", ""),
+        "page_size": page_size,
+        "current_page": current_page_display,
+        "total_pages": total_pages,
+        "page_info": f"Page {current_page_display}/{total_pages} ({page_size}/page)",
+        "display_name": "✓" if display_cfg.get("show_name", True) else "✗",
+        "display_description": "✓" if display_cfg.get("show_description", True) else "✗",
+        "display_requirements": "✓" if display_cfg.get("show_requirements", True) else "✗",
+        "display_rewards": "✓" if display_cfg.get("show_rewards", True) else "✗",
+        "display_data": "✓" if display_cfg.get("show_data", True) else "✗"
+    }
+    if extra_globals:
+        globals_dict.update(extra_globals)
+
+    for h in header_cfg:
+        raw = h.get("data", "")
+        html_line = replace_tokens_html_simple(raw, {}, globals_dict, cfg, remaining=None, line_color=h.get("color"))
+        style = f"font-family:{h.get('font', base_font)}; font-size:{h.get('size', base_size)}pt; color:{h.get('color','#ffffff')};"
+        parts.append(f"<div style='{style} margin:2px 0;'>{html_line}</div>")
+
+    parts.append("<hr style='border: none; border-top: 1px solid #333; margin:6px 0;'/>")
+
+    # Paginate quests
+    start_idx = page * page_size
+    end_idx = start_idx + page_size
+    quests_on_page = quests[start_idx:end_idx]
+
+    for q in quests_on_page:
+        completion = q.get("completion_deadline", 0) or 0
+        if current_ts is not None:
+            remaining = int(completion - current_ts)
+        else:
+            remaining = 0
+
+        q_copy = dict(q)
+        q_copy["time_remaining"] = format_time_remaining(remaining, cfg.get("time_remaining_format", "%dd %hh %mm %ss"))
+        q_copy["time_remaining_seconds"] = remaining
+
+        # Merge translation texts
+        merge_translated_fields(q_copy, text_source, cfg.get("language", "en"))
+
+        parts.append("<div style='padding:4px 0;'>")
+
+        # 🆕 KROK 1: ZISTI ČI JE QUEST DOKONČENÝ (PRED renderovaním lines)
+        quest_is_complete = is_quest_complete(q_copy)
+
+        # 🆕 KROK 2: Pridaj quest_is_complete do q_copy aby bol dostupný v tokenoch
+        q_copy["quest_is_complete"] = quest_is_complete
+
+        # Renderovanie riadkov
+        for line in lines_cfg:
+            raw = line.get("data", "")
+            line_color = line.get("color")
+
+            # 🆕 KROK 3: Ak riadok obsahuje %completion_text%, zobraz ho LEN ak je quest dokončený
+            if "%completion_text%" in raw:
+                if not quest_is_complete:
+                    continue  # Preskoč tento riadok ak quest NIE JE dokončený
+
+            # Display checks pre ostatné tokeny
+            if ("%name%" in raw and not display_cfg.get("show_name", True)) or \
+            ("%description%" in raw and not display_cfg.get("show_description", True)) or \
+            ("%requirements%" in raw and not display_cfg.get("show_requirements", True)) or \
+            ("%rewards%" in raw and not display_cfg.get("show_rewards", True)) or \
+            ("%data%" in raw and not display_cfg.get("show_data", True)):
+                continue
+
+            # MULTI-ITEM QUEST
+            if isinstance(q_copy.get("data"), list) and any(tok in raw for tok in ("%data%", "%req_data%", "%requirements%", "%translate_data%")):
+                for idx_item, item_hex in enumerate(q_copy.get("data")):
+                    per_item = dict(q_copy)
+                    per_item["data"] = item_hex
+                    try:
+                        td_key = f"translate_data_{idx_item + 1}"
+                        req_key = f"requirements_{idx_item + 1}"
+
+                        if td_key in per_item and isinstance(per_item[td_key], dict):
+                            per_item["req_data"] = per_item[td_key]
+                        elif "translate_data" in per_item and isinstance(per_item["translate_data"], dict):
+                            per_item["req_data"] = per_item["translate_data"]
+                        else:
+                            rd = per_item.get("req_data")
+                            if isinstance(rd, dict) and td_key in rd and isinstance(rd[td_key], dict):
+                                per_item["req_data"] = rd[td_key]
+
+                        if req_key in per_item:
+                            per_item["requirements"] = per_item.get(req_key) or per_item.get("requirements", "")
+                    except Exception:
+                        pass
+
+                    html_line = replace_tokens_html_simple(raw, per_item, globals_dict, cfg, remaining=remaining, line_color=line_color)
+                    style = f"font-family:{line.get('font', base_font)}; font-size:{line.get('size', base_size)}pt; color:{line.get('color','#ffffff')};"
+                    parts.append(f"<div style='{style} margin:1px 0;'>{html_line}</div>")
+
+            # SINGLE-ITEM QUEST alebo riadok s completion_text
+            else:
+                html_line = replace_tokens_html_simple(raw, q_copy, globals_dict, cfg, remaining=remaining, line_color=line_color)
+                style = f"font-family:{line.get('font', base_font)}; font-size:{line.get('size', base_size)}pt; color:{line.get('color','#ffffff')};"
+                parts.append(f"<div style='{style} margin:1px 0;'>{html_line}</div>")
+
+        parts.append("</div>")
+        parts.append("<hr style='border: none; border-top: 1px solid rgba(255,255,255,0.03); margin:6px 0;'/>")
+
+    parts.append("</div>")
+    return "".join(parts)
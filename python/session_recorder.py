@@ -0,0 +1,182 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Záznam relácie pre deterministický replay (tools/replay_session.py) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Zapína sa v config/config.json ("record_session": true). Do data/session_<čas>.jsonl.gz
+# sa zapisuje prúd udalostí s časom od začiatku záznamu:
+#   header   - verzia formátu + kópia config.json a quest.json pri štarte,
+#   snapshot - výstup save_quests_to_json ako delta voči predošlému (zmenené / zmiznuté questy),
+#   action   - shortcut akcie widgetu,
+#   config   - externá zmena quest.json (po zlúčení v JsonStore).
+# Jeden recorder na proces (logika aj widgety), vypnutý nič nezapisuje ani nealokuje.
+import os
+import json
+import gzip
+import time
+import threading
+from datetime import datetime
+
+FORMAT_VERSION = 1
+# Nad túto veľkosť (nekomprimovaných dát) sa záznam ukončí
+MAX_BYTES = 256 * 1024 * 1024
+FLUSH_INTERVAL = 2.0
+
+
+class SessionRecorder:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.events = 0
+        self._file = None
+        self._origin = 0.0
+        self._written = 0
+        self._last_flush = 0.0
+        self._last_quests = {}
+        self._last_order = []
+        self._lock = threading.Lock()
+
+    def start(self, folder, configs=None, max_bytes=MAX_BYTES):
+        """Otvorí nový súbor záznamu a zapíše hlavičku. Vráti cestu."""
+        with self._lock:
+            self._close_locked()
+            os.makedirs(folder, exist_ok=True)
+            self.path = os.path.join(folder, f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz")
+            self._file = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=6)
+            self._origin = time.monotonic()
+            self._written = 0
+            self._max_bytes = max_bytes
+            self._last_quests = {}
+            self._last_order = []
+            self.events = 0
+            self.enabled = True
+            self._write_locked({
+                "kind": "header",
+                "version": FORMAT_VERSION,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "configs": configs or {},
+            })
+            return self.path
+
+    def close(self):
+        with self._lock:
+            self._close_locked()
+
+    # ////---- Udalosti ----////
+    def snapshot(self, user_profile_id, timestamp, quests):
+        """Stav quest.json; ukladajú sa len questy, ktoré sa od minulého snapshotu zmenili."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if not self.enabled:
+                return
+            current, order, changed = {}, [], []
+            for q in quests or []:
+                quest_id = q.get("id")
+                text = json.dumps(q, sort_keys=True, ensure_ascii=False)
+                current[quest_id] = text
+                order.append(quest_id)
+                if self._last_quests.get(quest_id) != text:
+                    changed.append(q)
+            event = {
+                "kind": "snapshot",
+                "uid": user_profile_id,
+                "ts": timestamp,
+                "set": changed,
+                "drop": [quest_id for quest_id in self._last_quests if quest_id not in current],
+            }
+            if order != self._last_order:
+                event["order"] = order
+            self._last_quests = current
+            self._last_order = order
+            self._write_locked(event)
+
+    def action(self, name, owner="QuestWidget"):
+        if self.enabled:
+            with self._lock:
+                self._write_locked({"kind": "action", "name": name, "owner": owner})
+
+    def config(self, name, data):
+        if self.enabled:
+            with self._lock:
+                self._write_locked({"kind": "config", "name": name, "data": data})
+
+    # ////---- Interné ----////
+    def _write_locked(self, event):
+        if self._file is None:
+            return
+        now = time.monotonic()
+        event["t"] = round(now - self._origin, 4)
+        try:
+            line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+            self._file.write(line)
+            self._written += len(line)
+            self.events += 1
+            if now - self._last_flush >= FLUSH_INTERVAL:
+                self._file.flush()
+                self._last_flush = now
+            if self._written > self._max_bytes:
+                print(f"[SessionRecorder] Limit {self._max_bytes} B reached, recording stopped: {self.path}")
+                self._close_locked()
+        except Exception as e:
+            print(f"[SessionRecorder] Write error, recording stopped: {e}")
+            self._close_locked()
+
+    def _close_locked(self):
+        self.enabled = False
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+
+def read_session(path):
+    """(hlavička, [udalosti]) zo záznamu."""
+    header, events = None, []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # posledný riadok môže byť neúplný (proces bol ukončený)
+                break
+            if event.get("kind") == "header" and header is None:
+                header = event
+            else:
+                events.append(event)
+    if header is None or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"unsupported session file: {path}")
+    return header, events
+
+
+class SnapshotState:
+    """Poskladá plné snapshoty z delta udalostí (replay)."""
+
+    def __init__(self):
+        self.user_profile_id = None
+        self.timestamp = None
+        self._quests = {}
+        self._order = []
+
+    def apply(self, event):
+        self.user_profile_id = event.get("uid")
+        self.timestamp = event.get("ts")
+        for quest_id in event.get("drop", ()):
+            self._quests.pop(quest_id, None)
+        for q in event.get("set", ()):
+            self._quests[q.get("id")] = q
+        if "order" in event:
+            self._order = event["order"]
+
+    def quests(self):
+        return [self._quests[quest_id] for quest_id in self._order if quest_id in self._quests]
+
+
+_RECORDER = SessionRecorder()
+
+
+def get_recorder():
+    return _RECORDER
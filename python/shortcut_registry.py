@@ -0,0 +1,89 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- ShortcutRegistry - rozdielová registrácia skratiek na QtBridge ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Widgety si držia mapu combo -> akcia. Pri zmene konfigurácie sa porovná stará a nová mapa
+# a na bridge sa odregistrujú/zaregistrujú iba zmenené väzby. Nezmenené handlery ostávajú,
+# takže reload konfigurácie ani otvorenie panelu nespôsobí výpadok stlačení kláves.
+import threading
+
+# ////---- Zdieľaná tabuľka normalizovaných skratiek (pre všetky widgety) ----////
+_NORMALIZED_COMBOS = {}
+_normalize_lock = threading.Lock()
+
+
+def normalize_combo(combo):
+    """'Ctrl + Alt+F' -> 'ctrl+alt+f'. Výsledok sa cachuje v zdieľanej tabuľke."""
+    if not combo:
+        return ""
+    cached = _NORMALIZED_COMBOS.get(combo)
+    if cached is not None:
+        return cached
+    s = combo.replace(" ", "").lower()
+    normalized = "+".join(p for p in s.split("+") if p)
+    with _normalize_lock:
+        _NORMALIZED_COMBOS[combo] = normalized
+    return normalized
+# ////-----------------------------------------------------------------------------------------
+
+
+class ShortcutRegistry:
+    def __init__(self, bridge, callback, owner="ShortcutRegistry"):
+        """
+        bridge   - QtBridge z shortcut_manager.get_bridge()
+        callback - volá sa ako callback(action, combo_norm) pri stlačení skratky
+        """
+        self.bridge = bridge
+        self.callback = callback
+        self.owner = owner
+        # combo_norm -> (action, handler)
+        self._bindings = {}
+
+    def _make_handler(self, action, combo_norm):
+        def handler(*_args):
+            self.callback(action, combo_norm)
+        return handler
+
+    def _off(self, combo_norm, handler):
+        try:
+            self.bridge.off(f"shortcut.{combo_norm}", handler)
+        except Exception:
+            pass
+
+    def sync(self, mapping):
+        """
+        Zosynchronizuje väzby s mapou {akcia: combo}. Pri duplicitnej skratke vyhráva
+        posledná akcia (rovnako ako doteraz). Vráti (pridané, odobrané) počty.
+        """
+        wanted = {}
+        for action, combo in (mapping or {}).items():
+            combo_norm = normalize_combo(combo)
+            if combo_norm:
+                wanted[combo_norm] = action
+
+        removed = 0
+        for combo_norm, (action, handler) in list(self._bindings.items()):
+            if wanted.get(combo_norm) != action:
+                self._off(combo_norm, handler)
+                del self._bindings[combo_norm]
+                removed += 1
+
+        added = 0
+        for combo_norm, action in wanted.items():
+            if combo_norm in self._bindings:
+                continue
+            handler = self._make_handler(action, combo_norm)
+            try:
+                self.bridge.on(f"shortcut.{combo_norm}", handler)
+                self._bindings[combo_norm] = (action, handler)
+                added += 1
+            except Exception as e:
+                print(f"[{self.owner}] Failed to register {action}: {e}")
+        return added, removed
+
+    def bindings(self):
+        return {combo_norm: action for combo_norm, (action, _h) in self._bindings.items()}
+
+    def clear(self):
+        for combo_norm, (_action, handler) in list(self._bindings.items()):
+            self._off(combo_norm, handler)
+        self._bindings.clear()
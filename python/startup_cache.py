@@ -0,0 +1,135 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Warm-start cache (data/startup_cache.json) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Zapamätá si medzi spusteniami:
+#   db       - nájdenú cestu k SCUM.db + inode/zariadenie a mtime config/path.ini,
+#   schema   - odtlačok schémy (db_indexes.schema_fingerprint),
+#   indexes  - či sú indexy pre daný odtlačok hotové,
+#   snapshot - posledný platný obsah quest.json (user_profile_id, timestamp, questy).
+# Pri teplom štarte sa preskočí detekcia cesty a kontrola indexov a widget hneď vykreslí
+# posledný snapshot označený ako "stale", kým logika nedodá čerstvé dáta.
+import os
+import sys
+import time
+import importlib.util
+
+CACHE_VERSION = 1
+# Odložený zápis - snapshot sa mení len keď sa zmenia questy
+SAVE_DEBOUNCE = 2.0
+
+
+def _load_sibling(name):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{name}.py")
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        try:
+            spec.loader.exec_module(mod)
+        except Exception:
+            sys.modules.pop(key, None)
+            raise
+    return mod
+
+json_store = _load_sibling("json_store")
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def file_identity(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return {"path": os.path.abspath(path), "ino": st.st_ino, "dev": st.st_dev}
+
+
+class StartupCache:
+    def __init__(self, path):
+        self.path = path
+        self._store = json_store.JsonStore(path, debounce=SAVE_DEBOUNCE)
+        data = self._store.load()
+        if data.get("version") != CACHE_VERSION:
+            self._store.replace({"version": CACHE_VERSION})
+
+    # ////---- Cesta k DB ----////
+    def db_path(self, path_ini_path):
+        """Cesta z cache, ak súbor stále existuje (rovnaký inode) a path.ini sa nezmenil."""
+        db = self._store.get("db") or {}
+        path = db.get("path")
+        if not path or db.get("path_ini_mtime") != _mtime_ns(path_ini_path):
+            return None
+        identity = file_identity(path)
+        if not identity or identity["ino"] != db.get("ino") or identity["dev"] != db.get("dev"):
+            return None
+        return path
+
+    def set_db_path(self, db_path, path_ini_path):
+        identity = file_identity(db_path)
+        if identity:
+            identity["path_ini_mtime"] = _mtime_ns(path_ini_path)
+            self._store.set("db", identity)
+
+    # ////---- Schéma a indexy ----////
+    def indexes_ready(self, fingerprint):
+        """
+        True ak pri rovnakom odtlačku schémy boli indexy naposledy kompletné. Volajúci ešte
+        overí, že indexy v DB naozaj sú (db_indexes.missing_indexes).
+        """
+        indexes = self._store.get("indexes") or {}
+        return bool(fingerprint) and indexes.get("schema_hash") == fingerprint.get("hash") and indexes.get("complete") is True
+
+    def set_schema(self, fingerprint, indexes_complete):
+        if not fingerprint:
+            return
+        self._store.set("schema", {
+            "hash": fingerprint.get("hash"),
+            "version": fingerprint.get("version"),
+            "prisoner_class": fingerprint.get("prisoner_class"),
+        })
+        self._store.set("indexes", {"schema_hash": fingerprint.get("hash"), "complete": bool(indexes_complete)})
+
+    # ////---- Posledný platný snapshot questov ----////
+    def snapshot(self):
+        snap = self._store.get("snapshot")
+        if not isinstance(snap, dict) or not snap.get("quests"):
+            return None
+        return snap
+
+    def set_snapshot(self, user_profile_id, timestamp, quests, final=False):
+        """
+        Uloží snapshot, ak sa zmenili questy (samotný posun času sa nezapisuje,
+        inak by sa cache prepisovala pri každom scane). final=True zapíše vždy.
+        """
+        if not quests:
+            return
+        current = self._store.get("snapshot") or {}
+        if not final and current.get("quests") == quests and current.get("user_profile_id") == user_profile_id:
+            return
+        self._store.set("snapshot", {
+            "user_profile_id": user_profile_id,
+            "timestamp": timestamp,
+            "saved_at": time.time(),
+            "quests": quests,
+        })
+
+    def flush(self):
+        return self._store.flush()
+
+
+def read_snapshot(path):
+    """Len na čítanie (widget) - vráti posledný snapshot bez vytvárania súboru."""
+    data = json_store.JsonStore(path).load()
+    if data.get("version") != CACHE_VERSION:
+        return None
+    snap = data.get("snapshot")
+    if not isinstance(snap, dict) or not snap.get("quests"):
+        return None
+    return snap
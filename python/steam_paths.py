@@ -0,0 +1,194 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Hľadanie SCUM.db v Steam knižniciach (Linux / Proton) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Prejde známe Steam rooty (natívny, Flatpak, Snap), z libraryfolders.vdf načíta všetky
+# knižnice (aj na ďalších diskoch) a v každej paralelne overí compatdata/513710.
+# Víťaz sa cachuje v data/startup_cache.json (startup_cache.py, overenie cez inode).
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SCUM_APP_ID = "513710"
+PREFIX_DB_PATH = ("pfx", "drive_c", "users", "steamuser", "AppData", "Local", "SCUM", "Saved", "SaveFiles", "SCUM.db")
+
+STEAM_ROOTS = (
+    "~/.steam/steam",
+    "~/.steam/root",
+    "~/.local/share/Steam",
+    "~/Steam",
+    # Flatpak
+    "~/.var/app/com.valvesoftware.Steam/.local/share/Steam",
+    "~/.var/app/com.valvesoftware.Steam/.steam/steam",
+    # Snap
+    "~/snap/steam/common/.local/share/Steam",
+    "~/snap/steam/common/.steam/steam",
+)
+
+MAX_PROBE_WORKERS = 8
+
+
+# ////---- Minimálny parser Valve KeyValues (VDF) ----////
+def _vdf_tokens(text):
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c.isspace():
+            i += 1
+        elif c == "/" and text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end < 0 else end + 1
+        elif c in "{}":
+            yield c
+            i += 1
+        elif c == '"':
+            i += 1
+            out = []
+            while i < n and text[i] != '"':
+                if text[i] == "\\" and i + 1 < n:
+                    i += 1
+                    out.append({"n": "\n", "t": "\t"}.get(text[i], text[i]))
+                else:
+                    out.append(text[i])
+                i += 1
+            i += 1
+            yield ("str", "".join(out))
+        else:
+            start = i
+            while i < n and not text[i].isspace() and text[i] not in '{}"':
+                i += 1
+            yield ("str", text[start:i])
+
+
+def parse_vdf(text):
+    """Vráti vnorený dict (kľúče bez ohľadu na veľkosť písmen sa neupravujú)."""
+    root = {}
+    stack = [root]
+    key = None
+    for token in _vdf_tokens(text):
+        if token == "{":
+            child = {}
+            if key is not None:
+                stack[-1][key] = child
+            stack.append(child)
+            key = None
+        elif token == "}":
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        elif key is None:
+            key = token[1]
+        else:
+            stack[-1][key] = token[1]
+            key = None
+    return root
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Knižnice ----////
+def steam_roots():
+    roots, seen = [], set()
+    for root in STEAM_ROOTS:
+        path = os.path.expanduser(root)
+        if not os.path.isdir(path):
+            continue
+        real = os.path.realpath(path)
+        if real in seen:
+            continue
+        seen.add(real)
+        roots.append(real)
+    return roots
+
+
+def _libraries_from_vdf(vdf_path):
+    """[(cesta, má_scum)] z libraryfolders.vdf (nový aj starý formát)."""
+    try:
+        with open(vdf_path, "r", encoding="utf-8", errors="replace") as f:
+            data = parse_vdf(f.read())
+    except OSError:
+        return []
+    folders = None
+    for key, value in data.items():
+        if key.lower() == "libraryfolders" and isinstance(value, dict):
+            folders = value
+            break
+    if not folders:
+        return []
+
+    result = []
+    for key, value in folders.items():
+        if not key.isdigit():
+            continue
+        if isinstance(value, dict):
+            path = value.get("path")
+            apps = value.get("apps")
+            has_scum = isinstance(apps, dict) and SCUM_APP_ID in apps
+        else:
+            path, has_scum = value, False
+        if path:
+            result.append((path, has_scum))
+    return result
+
+
+def library_folders():
+    """Všetky knižnice, tie s SCUM (podľa "apps" vo vdf) ako prvé."""
+    libraries, seen = [], set()
+
+    def add(path, has_scum):
+        real = os.path.realpath(os.path.expanduser(path))
+        if real in seen:
+            if has_scum:
+                libraries[:] = [(p, h or p == real) for p, h in libraries]
+            return
+        seen.add(real)
+        libraries.append((real, has_scum))
+
+    for root in steam_roots():
+        add(root, False)
+        for vdf in (os.path.join(root, "steamapps", "libraryfolders.vdf"), os.path.join(root, "config", "libraryfolders.vdf")):
+            for path, has_scum in _libraries_from_vdf(vdf):
+                add(path, has_scum)
+
+    libraries.sort(key=lambda item: not item[1])
+    return [path for path, _has_scum in libraries]
+
+
+def candidate_path(library):
+    return os.path.join(library, "steamapps", "compatdata", SCUM_APP_ID, *PREFIX_DB_PATH)
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Paralelné overenie kandidátov ----////
+def _probe(path):
+    started = time.perf_counter()
+    try:
+        st = os.stat(path)
+        found, mtime = True, st.st_mtime
+    except OSError:
+        found, mtime = False, None
+    return {"path": path, "found": found, "mtime": mtime, "ms": (time.perf_counter() - started) * 1000.0}
+
+
+def probe_candidates(paths):
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(MAX_PROBE_WORKERS, len(paths))) as pool:
+        return list(pool.map(_probe, paths))
+
+
+def discover_db_path(extra_candidates=()):
+    """
+    Vráti (cesta alebo None, zoznam výsledkov probe). Pri viacerých nájdených
+    SCUM.db vyhrá naposledy zapisovaná.
+    """
+    paths = list(extra_candidates)
+    for library in library_folders():
+        path = candidate_path(library)
+        if path not in paths:
+            paths.append(path)
+
+    results = probe_candidates(paths)
+    found = [r for r in results if r["found"]]
+    if not found:
+        return None, results
+    winner = max(found, key=lambda r: r["mtime"] or 0)
+    return winner["path"], results
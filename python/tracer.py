@@ -0,0 +1,137 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Voliteľný tracer fáz scanu a renderu (Chrome trace-event export) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Jeden tracer na proces (logika aj widgety), zapína sa v config/config.json ("trace": true).
+# Spany (názov, kategória, začiatok, trvanie, vlákno) sa ukladajú do ring buffera a dajú sa
+# vypísať ako JSON pre chrome://tracing / Perfetto - shortcut "dump_trace" alebo pri ukončení.
+# Vypnutý tracer vracia zdieľaný prázdny span, takže v scan slučke nič nestojí.
+import os
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+
+DEFAULT_CAPACITY = 20000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def set(self, **_args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, _exc, _tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args = dict(self.args or {}, error=exc_type.__name__)
+        self.tracer._record(self.name, self.cat, self.start, end - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        """Doplní argumenty spanu (napr. počet questov) - zobrazia sa v detaile."""
+        self.args = dict(self.args or {}, **args)
+
+
+class Tracer:
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.enabled = False
+        self._events = deque(maxlen=capacity)
+        self._threads = {}
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def configure(self, enabled, capacity=None):
+        with self._lock:
+            if capacity and capacity != self._events.maxlen:
+                self._events = deque(self._events, maxlen=int(capacity))
+            self.enabled = bool(enabled)
+
+    def span(self, name, cat="scan", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args or None)
+
+    def _record(self, name, cat, start_ns, dur_ns, args):
+        thread = threading.current_thread()
+        tid = thread.ident
+        event = (name, cat, start_ns, dur_ns, tid, args)
+        with self._lock:
+            if tid not in self._threads:
+                self._threads[tid] = thread.name
+            self._events.append(event)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    # ////---- Export ----////
+    def to_chrome(self):
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        pid = os.getpid()
+        out = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        for name, cat, start_ns, dur_ns, tid, args in events:
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start_ns - self._origin) / 1000.0,
+                "dur": dur_ns / 1000.0,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            out.append(event)
+        return {"traceEvents": out, "displayTimeUnit": "ms"}
+
+    def dump(self, folder, tag=None):
+        """
+        Zapíše trace_<čas>.json (trace_<čas>_<tag>.json) do priečinka a vráti cestu
+        (None ak nie je čo zapísať). tag odlíši súbory procesov, ktoré končia naraz.
+        """
+        trace = self.to_chrome()
+        if not any(e["ph"] == "X" for e in trace["traceEvents"]):
+            return None
+        os.makedirs(folder, exist_ok=True)
+        suffix = f"_{tag}" if tag else ""
+        path = os.path.join(folder, f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, default=str)
+        return path
+
+
+_TRACER = Tracer()
+
+
+def get_tracer():
+    return _TRACER
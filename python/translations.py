@@ -0,0 +1,361 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Preklady questov - predkompilovaná cache pre data/translate.json ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# translate.json sa skompiluje do binárnych balíčkov (pickle) vedľa zdrojového súboru,
+# jeden na jazyk (translate.<lang>.cache). Balíček je kľúčovaný mtime + veľkosťou + SHA1
+# zdroja a obsahuje index questov iba pre daný jazyk aj predparsované dekodéry
+# "type1:a,b,c,d". Reťazce sú internované a rovnaké translate_data šablóny sú zdieľané
+# (jeden objekt pre všetky questy), pickle túto zdieľanosť zachová aj po načítaní.
+# Načítanie aj prestavba bežia na pozadí, widget sa nikdy nezablokuje na parsovaní JSON.
+# Pri zmene zdroja sa balíčky prestavia mimo GUI vlákna a dovtedy sa používa starý index.
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import threading
+
+CACHE_VERSION = 2
+CHECK_INTERVAL = 1.0
+DEFAULT_LANGUAGE = "en"
+# Koľko jazykových balíčkov ostáva v pamäti (aktuálny + predchádzajúci pri prepnutí)
+MAX_LOADED_LANGUAGES = 2
+TEXT_FIELDS = ("name", "description", "requirements", "rewards")
+
+
+# ////---- Dekodéry translate_data kľúčov ----////
+_DECODERS = {}
+
+
+def parse_decoder_key(translate_key):
+    """'type1:8,9,12,13' -> ('type1', (8, 9), (12, 13)); iné kľúče -> None."""
+    if not isinstance(translate_key, str) or ":" not in translate_key:
+        return None
+    parser_type, positions = translate_key.split(":", 1)
+    if parser_type != "type1":
+        return None
+    pos_parts = positions.split(",")
+    if len(pos_parts) != 4:
+        return None
+    try:
+        p = [int(x) for x in pos_parts]
+    except ValueError:
+        return None
+    return ("type1", (p[0], p[1]), (p[2], p[3]))
+
+
+def get_decoder(translate_key):
+    """Vráti predparsovaný dekodér; nepoznaný kľúč sa naparsuje raz a zapamätá."""
+    try:
+        return _DECODERS[translate_key]
+    except KeyError:
+        decoder = parse_decoder_key(translate_key)
+        _DECODERS[translate_key] = decoder
+        return decoder
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Prefixový trie pre hex kľúče translate_data ----////
+_HEX_CHARS = frozenset("0123456789abcdefABCDEF")
+_TERMINAL = None
+PREFIX_CACHE_LIMIT = 256
+PREFIX_TRIES_LIMIT = 1024
+
+
+class HexPrefixTrie:
+    """
+    Trie nad hex kľúčmi jedného translate_data (uzol = jeden hex znak). Najdlhší prefix
+    sa nájde za O(dĺžka kľúča) bez ohľadu na počet variantov. Výsledok sa cachuje pre
+    každý blob, lebo rovnaké dáta sa vyhodnocujú pri každom ticku.
+    """
+    __slots__ = ("_root", "_cache")
+
+    def __init__(self, translate_data):
+        self._root = {}
+        self._cache = {}
+        for key in translate_data.keys():
+            # type1 dekodéry, completion_text, prázdny kľúč a pod. nikdy nie sú prefixom hex dát
+            if not isinstance(key, str) or not key or not _HEX_CHARS.issuperset(key):
+                continue
+            node = self._root
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_TERMINAL] = key
+
+    def longest(self, hex_data):
+        """Vráti najdlhší kľúč, ktorý je prefixom hex_data, alebo None."""
+        try:
+            return self._cache[hex_data]
+        except KeyError:
+            pass
+        best = None
+        node = self._root
+        for ch in hex_data:
+            node = node.get(ch)
+            if node is None:
+                break
+            if _TERMINAL in node:
+                best = node[_TERMINAL]
+        if len(self._cache) >= PREFIX_CACHE_LIMIT:
+            self._cache.clear()
+        self._cache[hex_data] = best
+        return best
+
+
+# id(translate_data) -> (translate_data, trie); referencia drží objekt nažive, takže id je platné
+_PREFIX_TRIES = {}
+
+
+def longest_prefix_value(translate_data, hex_data):
+    """Hodnota translate_data pre najdlhší hex prefix dát (None ak žiadny nesedí)."""
+    if not hex_data or not isinstance(translate_data, dict):
+        return None
+    entry = _PREFIX_TRIES.get(id(translate_data))
+    if entry is None or entry[0] is not translate_data:
+        if len(_PREFIX_TRIES) >= PREFIX_TRIES_LIMIT:
+            _PREFIX_TRIES.clear()
+        entry = (translate_data, HexPrefixTrie(translate_data))
+        _PREFIX_TRIES[id(translate_data)] = entry
+    key = entry[1].longest(hex_data)
+    return translate_data[key] if key is not None else None
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Kompilácia translate.json ----////
+def _source_key(path, with_hash=True):
+    st = os.stat(path)
+    digest = None
+    if with_hash:
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha1": digest}
+
+
+def _intern_value(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {_intern_value(k): _intern_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern_value(v) for v in value]
+    return value
+
+
+def _is_text_field(key):
+    return key in TEXT_FIELDS or key.startswith("requirements_")
+
+
+def _is_translate_data(key):
+    return key == "translate_data" or key.startswith("translate_data_")
+
+
+def compile_translations(source_path, languages=()):
+    """
+    Rozdelí translate.json na jazykové balíčky:
+    {lang: {"quests": {quest_id: {"name": "...", "translate_data": {...}, ...}}, "decoders": {...}}}
+    Texty {lang: text} sa zredukujú na text pre daný jazyk, ostatné polia sa zdieľajú.
+    """
+    with open(source_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    quests = data.get("quests", {}) if isinstance(data, dict) else {}
+    if not isinstance(quests, dict):
+        quests = {}
+
+    languages = {DEFAULT_LANGUAGE, *languages}
+    for entry in quests.values():
+        if isinstance(entry, dict):
+            for key, val in entry.items():
+                if _is_text_field(key) and isinstance(val, dict):
+                    languages.update(k for k in val.keys() if isinstance(k, str) and k)
+
+    # Zdieľané translate_data šablóny - rovnaký obsah = rovnaký objekt
+    shared_templates = {}
+    decoders = {}
+
+    def share_template(td):
+        canonical = json.dumps(td, sort_keys=True, ensure_ascii=False)
+        shared = shared_templates.get(canonical)
+        if shared is None:
+            shared = _intern_value(td)
+            shared_templates[canonical] = shared
+            for td_key in shared.keys():
+                if td_key not in decoders:
+                    decoders[td_key] = parse_decoder_key(td_key)
+        return shared
+
+    packs = {lang: {"quests": {}, "decoders": decoders} for lang in languages}
+    for quest_id, entry in quests.items():
+        if not isinstance(entry, dict):
+            continue
+        quest_id = sys.intern(quest_id)
+        common = {}
+        texts = {}
+        for key, val in entry.items():
+            key = sys.intern(key)
+            if _is_text_field(key) and isinstance(val, dict):
+                texts[key] = val
+            elif _is_translate_data(key) and isinstance(val, dict):
+                common[key] = share_template(val)
+            else:
+                common[key] = _intern_value(val)
+
+        for lang, pack in packs.items():
+            merged = dict(common)
+            for key, per_lang in texts.items():
+                text = per_lang.get(lang)
+                if text is not None:
+                    merged[key] = _intern_value(text)
+            pack["quests"][quest_id] = merged
+    return packs
+
+
+def cache_path_for(cache_base, language):
+    return f"{cache_base}.{language}.cache"
+
+
+def write_cache(cache_path, header, payload):
+    tmp_path = f"{cache_path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def read_cache(cache_path, source_path):
+    """Vráti payload z cache ak sedí so zdrojom, inak None."""
+    try:
+        with open(cache_path, "rb") as f:
+            header = pickle.load(f)
+            if not isinstance(header, dict) or header.get("version") != CACHE_VERSION:
+                return None
+            cached = header.get("source", {})
+            current = _source_key(source_path, with_hash=False)
+            if cached.get("mtime_ns") != current["mtime_ns"] or cached.get("size") != current["size"]:
+                # mtime sa zmenil - ak je obsah rovnaký (napr. touch), cache je stále platná
+                if cached.get("size") != current["size"] or cached.get("sha1") != _source_key(source_path)["sha1"]:
+                    return None
+            return pickle.load(f)
+    except Exception:
+        return None
+# ////-----------------------------------------------------------------------------------------
+
+
+class TranslationProvider:
+    def __init__(self, source_path, cache_base=None):
+        self.source_path = source_path
+        self.cache_base = cache_base or os.path.splitext(source_path)[0]
+        self.version = 0
+
+        self._lock = threading.Lock()
+        # lang -> quests; poradie = poradie použitia (posledný = najnovší)
+        self._packs = {}
+        self._pack_stats = {}
+        self._workers = {}
+        self._last_check = {}
+
+    # ////---- Verejné API ----////
+    def quests(self, language=DEFAULT_LANGUAGE):
+        """
+        Neblokujúci prístup k indexu questov pre jazyk. Kým sa balíček načítava, vráti
+        posledný platný index (alebo {} pri prvom štarte / prvom prepnutí jazyka).
+        """
+        language = language or DEFAULT_LANGUAGE
+        now = time.monotonic()
+        pack = self._packs.get(language)
+        if pack is None or now - self._last_check.get(language, 0.0) >= CHECK_INTERVAL:
+            self._last_check[language] = now
+            self._check(language)
+            pack = self._packs.get(language)
+        if pack is None and self._packs:
+            # prepnutie jazyka - kým sa nový balíček načíta, slúži posledný načítaný
+            pack = next(reversed(self._packs.values()))
+        return pack or {}
+
+    def wait(self, language=DEFAULT_LANGUAGE, timeout=None):
+        """Počká na dokončenie načítania (nástroje a benchmarky, nie GUI)."""
+        self._check(language)
+        worker = self._workers.get(language)
+        if worker is not None:
+            worker.join(timeout)
+        return self._packs.get(language) or {}
+
+    def loaded_languages(self):
+        return list(self._packs.keys())
+
+    # ////---- Kontrola zdroja a prestavba na pozadí ----////
+    def _stat(self):
+        try:
+            st = os.stat(self.source_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _check(self, language):
+        stat = self._stat()
+        with self._lock:
+            worker = self._workers.get(language)
+            if worker is not None and worker.is_alive():
+                return
+            if stat is None:
+                self._packs.setdefault(language, {})
+                return
+            if stat == self._pack_stats.get(language) and language in self._packs:
+                return
+            worker = threading.Thread(target=self._load, args=(language, stat),
+                                      name=f"TranslationCache-{language}", daemon=True)
+            self._workers[language] = worker
+            worker.start()
+
+    def _load(self, language, stat):
+        try:
+            payload = read_cache(cache_path_for(self.cache_base, language), self.source_path)
+            if payload is None:
+                payload = self._rebuild(language)
+            self._install(language, payload)
+        except Exception as e:
+            # poškodený translate.json - ostáva starý index
+            print(f"[Translations] Error loading {self.source_path}: {e}")
+            self._packs.setdefault(language, {})
+        self._pack_stats[language] = stat
+
+    def _rebuild(self, language):
+        """Skompiluje všetky jazyky naraz a zapíše ich balíčky; vráti balíček pre language."""
+        header = {"version": CACHE_VERSION, "source": _source_key(self.source_path)}
+        packs = compile_translations(self.source_path, languages=(language,))
+        for lang, pack in packs.items():
+            try:
+                write_cache(cache_path_for(self.cache_base, lang), header, pack)
+            except Exception as e:
+                print(f"[Translations] Error writing cache for {lang}: {e}")
+        # jazyk bez prekladov má iba zdieľané polia, názvy sa doplnia z asset path
+        return packs[language]
+
+    def _install(self, language, payload):
+        _DECODERS.update(payload.get("decoders", {}))
+        with self._lock:
+            self._packs.pop(language, None)
+            self._packs[language] = payload.get("quests", {})
+            while len(self._packs) > MAX_LOADED_LANGUAGES:
+                oldest = next(iter(self._packs))
+                del self._packs[oldest]
+                self._pack_stats.pop(oldest, None)
+        self.version += 1
+
+
+_PROVIDERS = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(source_path, cache_base=None):
+    """Jeden provider na zdrojový súbor - zdieľajú ho všetky inštancie widgetu."""
+    key = os.path.abspath(source_path)
+    with _providers_lock:
+        provider = _PROVIDERS.get(key)
+        if provider is None:
+            provider = TranslationProvider(source_path, cache_base)
+            _PROVIDERS[key] = provider
+        return provider
@@ -0,0 +1,38 @@
+# Spoločné fixtures pre testy widgetov: headless Qt (QT_QPA_PLATFORM=offscreen) a
+# widgets/custom_overlays.py načítaný bez hostiteľa - overlay_manager / shortcut_manager
+# sa nahradia prázdnymi modulmi. Bez PySide6 sa testy widgetov preskočia.
+import os
+import sys
+import types
+import importlib.util
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+MODULE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def app():
+    QApplication = pytest.importorskip("PySide6.QtWidgets").QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def custom_overlays(app, tmp_path, monkeypatch):
+    host = {
+        "overlay_manager": types.ModuleType("overlay_manager"),
+        "shortcut_manager": types.ModuleType("shortcut_manager"),
+    }
+    host["shortcut_manager"].get_bridge = lambda: None
+    for name, mod in host.items():
+        monkeypatch.setitem(sys.modules, name, sys.modules.get(name, mod))
+
+    spec = importlib.util.spec_from_file_location("aq_test_custom_overlays", os.path.join(MODULE_ROOT, "widgets", "custom_overlays.py"))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+
+    # cesty (modules/<modul>/widgets, config) sú relatívne k pracovnému priečinku hostiteľa
+    monkeypatch.chdir(tmp_path)
+    return mod
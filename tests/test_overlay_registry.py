@@ -0,0 +1,71 @@
+# OverlayRegistry (widgets/custom_overlays.py) nad JsonStore: externá úprava
+# custom_overlays.json zlúčená až pri zápise na pozadí sa musí dostať do registry
+# a ďalší save() ju nesmie prepísať.
+import json
+
+import pytest
+
+
+@pytest.fixture
+def registry(custom_overlays, tmp_path):
+    config = tmp_path / "modules" / "TestModule" / "config"
+    config.mkdir(parents=True)
+    (config / "custom_overlays.json").write_text(json.dumps({
+        "main": {"widgets": ["quest"], "x": 10, "y": 20, "bg": "rgba(0,0,0,0)", "user_visible": True},
+    }), encoding="utf-8")
+    registry = custom_overlays.OverlayRegistry("TestModule")
+    yield registry
+    registry.store.flush()
+
+
+def _write_external(registry, **changes):
+    path = registry.store.path
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["main"].update(changes)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def _read_disk(registry):
+    with open(registry.store.path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_flush_time_merge_reaches_registry(registry):
+    seen = []
+    registry.subscribe(seen.append)
+
+    # lokálna zmena čaká na debounce, medzitým overlay manager zapíše pozíciu
+    registry.overlays["main"]["bg"] = "rgba(1,2,3,4)"
+    registry.save()
+    _write_external(registry, x=300, y=400)
+    # zápis na pozadí (debounce timer) zlúči externú zmenu do store
+    registry.store.flush()
+
+    changed = registry.poll()
+    assert changed == {"main"}
+    assert seen == [{"main"}]
+    assert registry.overlays["main"]["x"] == 300
+    assert registry.overlays["main"]["bg"] == "rgba(1,2,3,4)"
+
+
+def test_save_keeps_merged_external_edits(registry):
+    registry.overlays["main"]["bg"] = "rgba(1,2,3,4)"
+    registry.save()
+    _write_external(registry, x=300)
+    registry.store.flush()
+
+    # ďalšia lokálna úprava ešte pred poll() - externé x sa nesmie stratiť
+    registry.overlays["main"]["user_visible"] = False
+    registry.save()
+    registry.store.flush()
+
+    disk = _read_disk(registry)["main"]
+    assert disk["x"] == 300
+    assert disk["user_visible"] is False
+    assert disk["bg"] == "rgba(1,2,3,4)"
+    assert registry.overlays["main"]["x"] == 300
+    # poslucháči sa o externej zmene dozvedia pri najbližšom poll()
+    assert registry.poll() == {"main"}
+    assert registry.poll() == set()
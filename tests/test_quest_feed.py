@@ -0,0 +1,66 @@
+# QuestFeed (python/quest_events.py) číta data/quest.json bez widgetu - publikuje iba pri
+# zmene súboru a rozpísaný (nevalidný) súbor skúsi znova pri ďalšom poll().
+import os
+import sys
+import json
+import importlib.util
+
+import pytest
+
+MODULE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def quest_events():
+    key = "active_quests_quest_events"
+    mod = sys.modules.get(key)
+    if mod is None:
+        spec = importlib.util.spec_from_file_location(key, os.path.join(MODULE_ROOT, "python", "quest_events.py"))
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        spec.loader.exec_module(mod)
+    return mod
+
+
+class RecordingPublisher:
+    def __init__(self):
+        self.calls = []
+
+    def publish(self, bridge, key, data, text_source, language="en"):
+        self.calls.append((key, data, language))
+        return []
+
+
+def _write(path, text, mtime):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_feed_publishes_once_per_snapshot(quest_events, tmp_path):
+    path = tmp_path / "quest.json"
+    publisher = RecordingPublisher()
+    feed = quest_events.QuestFeed(str(path), publisher=publisher)
+
+    assert feed.poll(object()) == []
+    assert publisher.calls == []
+
+    _write(path, json.dumps({"user_profile_id": 7, "timestamp": 100, "quests": []}), 1000)
+    feed.poll(object(), "sk")
+    feed.poll(object(), "sk")
+    assert [(key, language) for key, _data, language in publisher.calls] == [((1000, 7, 100), "sk")]
+
+    # rozpísaný súbor sa preskočí, opravený s tým istým mtime sa spracuje
+    _write(path, '{"user_profile_id": 7, "time', 1001)
+    feed.poll(object())
+    assert len(publisher.calls) == 1
+    _write(path, json.dumps({"user_profile_id": 7, "timestamp": 160, "quests": []}), 1001)
+    feed.poll(object())
+    assert publisher.calls[-1][0] == (1001, 7, 160)
+    assert len(publisher.calls) == 2
+
+
+def test_get_feed_is_shared_per_path(quest_events, tmp_path):
+    path = str(tmp_path / "quest.json")
+    feed = quest_events.get_feed(path)
+    assert quest_events.get_feed(path) is feed
+    assert feed.publisher is quest_events.get_publisher()
@@ -0,0 +1,55 @@
+# Služby widgetov na pozadí (widgets/custom_overlays.py sync_widget_backgrounds): bežia, kým
+# widget obsahuje aspoň jeden overlay, aj keď je overlay skrytý a widgety nie sú vytvorené.
+import pytest
+
+WIDGET_SOURCE = '''
+CALLS = []
+
+
+def start_background(module_name):
+    CALLS.append(("start", module_name))
+
+
+def stop_background(module_name):
+    CALLS.append(("stop", module_name))
+
+
+def create_widget(BaseClass, module_name):
+    return BaseClass()
+'''
+
+
+@pytest.fixture
+def background_module(custom_overlays, tmp_path):
+    widgets_dir = tmp_path / "modules" / "TestModule" / "widgets"
+    widgets_dir.mkdir(parents=True)
+    (widgets_dir / "feed.py").write_text(WIDGET_SOURCE, encoding="utf-8")
+    (widgets_dir / "plain.py").write_text("def create_widget(BaseClass, module_name):\n    return BaseClass()\n",
+                                          encoding="utf-8")
+    yield custom_overlays
+    custom_overlays.sync_widget_backgrounds("TestModule", {})
+
+
+def _calls(custom_overlays):
+    mod, _mtime = custom_overlays.load_widget_module("feed", "TestModule")
+    return mod.CALLS
+
+
+def test_background_runs_while_any_overlay_uses_widget(background_module):
+    custom_overlays = background_module
+    overlays = {
+        "hidden": {"widgets": ["feed"], "user_visible": False},
+        "other": {"widgets": ["plain", "feed"]},
+    }
+    custom_overlays.sync_widget_backgrounds("TestModule", overlays)
+    assert _calls(custom_overlays) == [("start", "TestModule")]
+
+    # ďalší sync bez zmeny služby znova nespúšťa
+    custom_overlays.sync_widget_backgrounds("TestModule", overlays)
+    del overlays["other"]
+    custom_overlays.sync_widget_backgrounds("TestModule", overlays)
+    assert _calls(custom_overlays) == [("start", "TestModule")]
+
+    overlays["hidden"]["widgets"] = ["plain"]
+    custom_overlays.sync_widget_backgrounds("TestModule", overlays)
+    assert _calls(custom_overlays) == [("start", "TestModule"), ("stop", "TestModule")]
@@ -0,0 +1,151 @@
+# Pool inštancií widgetov v widgets/custom_overlays.py: widget vrátený z poolu musí byť
+# po prestavbe overlayu znovu viditeľný a odložený quest widget nesmie reagovať na skratky.
+import os
+import sys
+import json
+import shutil
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+MODULE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+
+WIDGET_SOURCE = '''
+def create_widget(BaseClass, module_name):
+    class PooledWidget(BaseClass):
+        def __init__(self):
+            super().__init__()
+            self.suspended = 0
+            self.resumed = 0
+
+        def suspend_widget(self):
+            self.suspended += 1
+
+        def resume_widget(self):
+            self.resumed += 1
+
+    return PooledWidget()
+'''
+
+
+@pytest.fixture
+def pooled_module(custom_overlays, tmp_path):
+    widgets_dir = tmp_path / "modules" / "TestModule" / "widgets"
+    widgets_dir.mkdir(parents=True)
+    (widgets_dir / "pooled.py").write_text(WIDGET_SOURCE, encoding="utf-8")
+    yield custom_overlays
+    custom_overlays.clear_widget_pool()
+
+
+def _overlay_root():
+    root = QWidget()
+    QVBoxLayout(root)
+    return root
+
+
+def test_pooled_widget_is_visible_after_reuse(pooled_module):
+    custom_overlays = pooled_module
+    params = {"widgets": ["pooled"]}
+
+    first = _overlay_root()
+    custom_overlays.populate_overlay_root(first, params, QWidget, "TestModule")
+    first.show()
+    w = first._overlay_widgets["pooled"]
+    assert w.isVisible()
+
+    custom_overlays.release_widget("pooled", "TestModule", w)
+    first.deleteLater()
+    assert w.isHidden()
+    assert w.suspended == 1
+
+    second = _overlay_root()
+    custom_overlays.populate_overlay_root(second, params, QWidget, "TestModule")
+    second.show()
+    reused = second._overlay_widgets["pooled"]
+
+    assert reused is w
+    assert reused.resumed == 1
+    assert reused.parent() is second
+    assert not reused.isHidden()
+    assert reused.isVisible()
+    second.deleteLater()
+
+
+class StubBridge:
+    """shortcut_manager bridge: on / off / emit nad obyčajným slovníkom."""
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, name, handler):
+        self.handlers.setdefault(name, []).append(handler)
+
+    def off(self, name, handler):
+        handlers = self.handlers.get(name, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self.handlers.pop(name, None)
+
+    def emit(self, name, *args):
+        for handler in list(self.handlers.get(name, [])):
+            handler(*args)
+
+    def shortcut_handlers(self):
+        return {name: len(h) for name, h in self.handlers.items() if name.startswith("shortcut.")}
+
+
+@pytest.fixture
+def quest_module(custom_overlays, tmp_path, monkeypatch):
+    # modules/TestModule s widgets/quest.py a python/ z repozitára (MODULE_ROOT widgetu)
+    module_dir = tmp_path / "modules" / "TestModule"
+    (module_dir / "widgets").mkdir(parents=True)
+    (module_dir / "config").mkdir()
+    (module_dir / "data").mkdir()
+    shutil.copy(os.path.join(MODULE_ROOT, "widgets", "quest.py"), module_dir / "widgets" / "quest.py")
+    shutil.copytree(os.path.join(MODULE_ROOT, "python"), module_dir / "python",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    (module_dir / "config" / "quest.json").write_text(json.dumps({
+        "shortcuts": {"toggle_filter": "ctrl+alt+f", "next_page": "ctrl+alt+n"},
+    }), encoding="utf-8")
+
+    bridge = StubBridge()
+    monkeypatch.setattr(sys.modules["shortcut_manager"], "get_bridge", lambda: bridge, raising=False)
+    yield custom_overlays, bridge, module_dir
+    custom_overlays.clear_widget_pool()
+
+
+def _base_class(module_dir):
+    class HostWidget(QWidget):
+        def __init__(self, module_name):
+            super().__init__()
+
+        def get_config_path(self, name):
+            return str(module_dir / "config" / name)
+
+        def get_data_path(self, name):
+            return str(module_dir / "data" / name)
+
+    return HostWidget
+
+
+def test_pooled_quest_widget_drops_shortcuts(quest_module):
+    custom_overlays, bridge, module_dir = quest_module
+    BaseClass = _base_class(module_dir)
+
+    w = custom_overlays.acquire_widget("quest", BaseClass, "TestModule")
+    assert bridge.shortcut_handlers() == {"shortcut.ctrl+alt+f": 1, "shortcut.ctrl+alt+n": 1}
+
+    custom_overlays.release_widget("quest", "TestModule", w)
+    assert bridge.shortcut_handlers() == {}
+    bridge.emit("shortcut.ctrl+alt+f")
+    assert w._pending_actions == []
+
+    reused = custom_overlays.acquire_widget("quest", BaseClass, "TestModule")
+    assert reused is w
+    assert bridge.shortcut_handlers() == {"shortcut.ctrl+alt+f": 1, "shortcut.ctrl+alt+n": 1}
+    bridge.emit("shortcut.ctrl+alt+f")
+    assert w._pending_actions == ["toggle_filter"]
+    custom_overlays._close_child_widget(w)
@@ -0,0 +1,239 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Headless benchmark vykresľovania questov (python/render_core.py) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Vyrenderuje syntetické sady questov (10 - 5000, single / multi item, všetky prepínače
+# display, jedna stránka aj celý zoznam) bez Qt a zmeria fázy prepare / filter / sort / html
+# a veľkosť výstupu. --check porovná HTML malých prípadov s referenciou v
+# tools/render_golden.json (vytvorenou z pôvodného renderera vo widgets/quest.py).
+#
+#   python tools/bench_render.py --sizes 10 100 1000 5000 --out bench_render.json
+#   python tools/bench_render.py --check
+import os
+import sys
+import copy
+import json
+import time
+import random
+import hashlib
+import argparse
+import platform
+import tempfile
+import statistics
+import importlib.util
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULE_ROOT = os.path.dirname(TOOLS_DIR)
+GOLDEN_PATH = os.path.join(TOOLS_DIR, "render_golden.json")
+TRANSLATE_PATH = os.path.join(MODULE_ROOT, "data", "translate.json")
+CONFIG_PATH = os.path.join(MODULE_ROOT, "config", "quest.json")
+
+
+def _load(name, path):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        spec.loader.exec_module(mod)
+    return mod
+
+render_core = _load("render_core", os.path.join(MODULE_ROOT, "python", "render_core.py"))
+translations = _load("translations", os.path.join(MODULE_ROOT, "python", "translations.py"))
+gen_scum_db = _load("gen_scum_db", os.path.join(TOOLS_DIR, "gen_scum_db.py"))
+
+# Pevný čas sveta a tokeny hodín - výstup musí byť deterministický
+WORLD_TS = 5_000_000
+EXTRA_GLOBALS = {"clock_confidence": "high", "clock_rate": "1.00x", "data_state": "live"}
+DISPLAY_TOGGLES = ("show_name", "show_description", "show_requirements", "show_rewards", "show_data")
+GOLDEN_MAX_SIZE = 100
+
+
+# ////---- Vstupy ----////
+class HeadlessTextSource:
+    """Náhrada widgetu pre merge_quest_texts - preklady z rovnakého providera ako GUI."""
+
+    def __init__(self, language="en", cache_dir=None):
+        self._cache_dir = cache_dir or tempfile.mkdtemp(prefix="aq_render_")
+        provider = translations.TranslationProvider(TRANSLATE_PATH, os.path.join(self._cache_dir, "translate"))
+        self._quests = provider.wait(language, timeout=60)
+
+    def get_cached_translations(self):
+        return self._quests
+
+
+def build_quests(count, kind, seed=1):
+    """Questy v tvare data/quest.json (ako ich zapisuje logic.py)."""
+    rng = random.Random(f"{seed}:{count}:{kind}")
+    templates = gen_scum_db.load_quest_templates(TRANSLATE_PATH)
+    if kind == "single":
+        templates = [t for t in templates if t[1] == 1]
+    elif kind == "multi":
+        templates = [t for t in templates if t[1] > 1]
+    quests = []
+    for quest_id in range(1, count + 1):
+        asset_path, items = rng.choice(templates)
+        blobs = [gen_scum_db.make_blob(rng).hex() for _ in range(items)]
+        quests.append({
+            "id": quest_id,
+            "sector": rng.choice(gen_scum_db.SECTORS),
+            "completion_deadline": WORLD_TS + rng.randint(-600, 4 * 86400),
+            "quest_data_asset_path": asset_path,
+            "auto_complete": rng.randint(0, 1),
+            "data": blobs[0] if items == 1 else blobs,
+        })
+    return quests
+
+
+def display_variants():
+    """Všetko zapnuté, postupne jeden vypnutý, všetko vypnuté."""
+    yield "all_on", {k: True for k in DISPLAY_TOGGLES}
+    for off in DISPLAY_TOGGLES:
+        yield f"no_{off[5:]}", {k: k != off for k in DISPLAY_TOGGLES}
+    yield "all_off", {k: False for k in DISPLAY_TOGGLES}
+
+
+def make_config(base_cfg, display):
+    cfg = copy.deepcopy(base_cfg)
+    cfg.setdefault("display", {}).update(display)
+    cfg["display"].pop("auto_complete", None)
+    return cfg
+
+
+def iter_cases(sizes, kinds):
+    for size in sizes:
+        for kind in kinds:
+            for display_name, display in display_variants():
+                for paging in ("page", "all"):
+                    yield {"id": f"{size}/{kind}/{display_name}/{paging}", "size": size, "kind": kind,
+                           "display": display, "paging": paging}
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Render jedného prípadu po fázach ----////
+def render_case(case, base_cfg, source, quests):
+    cfg = make_config(base_cfg, case["display"])
+    page_size = cfg.get("page_size", 10) if case["paging"] == "page" else max(1, case["size"])
+    timings = {}
+
+    quests = copy.deepcopy(quests)
+    started = time.perf_counter()
+    prepared = render_core.prepare_quests(quests)
+    timings["prepare"] = time.perf_counter() - started
+
+    active_sectors = render_core.active_filter_set(cfg, "sectors")
+    active_shops = render_core.active_filter_set(cfg, "shops")
+
+    started = time.perf_counter()
+    filtered = render_core.filter_quests(prepared, cfg, active_sectors, active_shops)
+    timings["filter"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ordered = render_core.sort_quests(filtered, cfg, WORLD_TS)
+    timings["sort"] = time.perf_counter() - started
+
+    cfg["widget_instance"] = source
+    started = time.perf_counter()
+    html_out = render_core.generate_full_html(
+        ordered, WORLD_TS, cfg, text_source=source, page=0, page_size=page_size,
+        active_sectors=active_sectors, active_shops=active_shops, extra_globals=dict(EXTRA_GLOBALS))
+    timings["html"] = time.perf_counter() - started
+    return html_out, timings
+
+
+def digest(html_out):
+    return hashlib.sha1(html_out.encode("utf-8")).hexdigest()
+# ////-----------------------------------------------------------------------------------------
+
+
+def run_bench(sizes, kinds, repeat, base_cfg, source, seed):
+    results = []
+    quest_sets = {}
+    for case in iter_cases(sizes, kinds):
+        key = (case["size"], case["kind"])
+        if key not in quest_sets:
+            quest_sets[key] = build_quests(case["size"], case["kind"], seed)
+        quests = quest_sets[key]
+
+        runs = max(1, min(repeat, 2000 // max(1, case["size"]) if case["paging"] == "all" else repeat))
+        stage_samples = {"prepare": [], "filter": [], "sort": [], "html": []}
+        html_out = ""
+        for _ in range(runs):
+            html_out, timings = render_case(case, base_cfg, source, quests)
+            for stage, seconds in timings.items():
+                stage_samples[stage].append(seconds * 1000.0)
+
+        stages = {stage: round(statistics.median(samples), 4) for stage, samples in stage_samples.items()}
+        results.append({
+            "case": case["id"],
+            "runs": runs,
+            "stages_ms": stages,
+            "total_ms": round(sum(stages.values()), 4),
+            "html_bytes": len(html_out.encode("utf-8")),
+        })
+        print(f"[bench_render] {case['id']:<40} total {results[-1]['total_ms']:9.3f} ms  html {stages['html']:9.3f} ms  "
+              f"{results[-1]['html_bytes']:>9} B")
+    return results
+
+
+def golden_cases(base_cfg, source, seed):
+    cases = {}
+    for case in iter_cases([s for s in (10, GOLDEN_MAX_SIZE)], ("single", "multi")):
+        html_out, _ = render_case(case, base_cfg, source, build_quests(case["size"], case["kind"], seed))
+        cases[case["id"]] = digest(html_out)
+    return cases
+
+
+def check_golden(source, path=GOLDEN_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        golden = json.load(f)
+    current = golden_cases(golden["config"], source, golden["seed"])
+    mismatched = [case for case, expected in golden["cases"].items() if current.get(case) != expected]
+    for case in mismatched:
+        print(f"[bench_render] MISMATCH {case}")
+    print(f"[bench_render] equivalence: {len(golden['cases']) - len(mismatched)}/{len(golden['cases'])} cases identical")
+    return not mismatched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmark of the quest HTML renderer.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000, 5000])
+    parser.add_argument("--kinds", nargs="+", default=["single", "multi"], choices=("single", "multi", "mixed"))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--out", default="bench_render.json")
+    parser.add_argument("--check", action="store_true", help="only run the equivalence check")
+    parser.add_argument("--write-golden", action="store_true", help="store current output as the reference")
+    args = parser.parse_args(argv)
+
+    source = HeadlessTextSource(args.language)
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        base_cfg = json.load(f)
+
+    if args.write_golden:
+        golden = {"seed": args.seed, "config": base_cfg, "cases": golden_cases(base_cfg, source, args.seed)}
+        with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+            json.dump(golden, f, indent=2, ensure_ascii=False)
+        print(f"[bench_render] reference written: {GOLDEN_PATH} ({len(golden['cases'])} cases)")
+        return 0
+
+    equivalent = check_golden(source) if os.path.exists(GOLDEN_PATH) else None
+    if args.check:
+        return 0 if equivalent else 1
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "equivalent": equivalent,
+        "results": run_bench(args.sizes, args.kinds, args.repeat, base_cfg, source, args.seed),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench_render] results saved to {args.out}")
+    return 0 if equivalent is not False else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
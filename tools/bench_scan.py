@@ -0,0 +1,226 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Benchmark scan slučky (python/logic.py) nad syntetickou SCUM.db ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Pre každý profil (tools/gen_scum_db.py) zmeria:
+#   scan_noindex_cold/warm - scan bez našich indexov (nové spojenie / opakovane),
+#   index_build            - IndexBuilder z python/db_indexes.py,
+#   scan_cold / scan_warm  - scan s indexmi,
+#   json_write             - quest_list + save_quests_to_json (ako main_loop pri zmene).
+# Scan je logic.QuestReader.read() - ten istý kód ako main_loop, vrátane QuestSnapshot.
+# "cold" = nové spojenie cez logic.open_reader s prázdnou page cache SQLite
+# (OS cache sa nepreplachuje).
+# Výsledky idú do JSON; --compare vypíše rozdiel voči staršiemu behu.
+#
+#   python tools/bench_scan.py --profiles fresh small medium --out bench_scan.json
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import platform
+import argparse
+import tempfile
+import statistics
+import importlib.util
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULE_ROOT = os.path.dirname(TOOLS_DIR)
+
+
+def _load(name, path):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        spec.loader.exec_module(mod)
+    return mod
+
+gen_scum_db = _load("gen_scum_db", os.path.join(TOOLS_DIR, "gen_scum_db.py"))
+logic = _load("logic", os.path.join(MODULE_ROOT, "python", "logic.py"))
+db_indexes = _load("db_indexes", os.path.join(MODULE_ROOT, "python", "db_indexes.py"))
+
+
+# ////---- Meranie ----////
+def _stats(samples_ms):
+    samples = sorted(samples_ms)
+    return {
+        "n": len(samples),
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+# readonly profil bez DB snapshotu - meria sa priamy scan nad SCUM.db
+BENCH_CONFIG = {"db_profile": "readonly", "db_snapshot": "off"}
+
+
+def open_readonly(db_path):
+    """Rovnaký profil ako logic.open_db_connection (readonly), bez logovania a indexov."""
+    conn = sqlite3.connect(logic._db_uri(db_path, "ro"), uri=True, timeout=1)
+    conn.execute("PRAGMA query_only = 1;")
+    conn.execute("PRAGMA mmap_size = 268435456;")
+    conn.execute("PRAGMA cache_size = -16384;")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def open_bench_reader(db_path):
+    reader = logic.open_reader(db_path, BENCH_CONFIG)
+    if reader is None:
+        raise RuntimeError(f"cannot open {db_path}")
+    return reader
+
+
+def scan_once(reader):
+    """Jeden scan ako v logic.main_loop (bez zápisu); None ak nie je aktívny hráč."""
+    snapshot = reader.read()
+    return snapshot if snapshot.user_profile_id else None
+
+
+def time_cold(db_path, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with open_bench_reader(db_path) as reader:
+            result = scan_once(reader)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return _stats(samples), result
+
+
+def time_warm(db_path, repeat):
+    with open_bench_reader(db_path) as reader:
+        scan_once(reader)
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            scan_once(reader)
+            samples.append((time.perf_counter() - started) * 1000.0)
+    return _stats(samples)
+
+
+def time_index_build(db_path):
+    conn = open_readonly(db_path)
+    try:
+        fingerprint = db_indexes.schema_fingerprint(conn)
+    finally:
+        conn.close()
+    started = time.perf_counter()
+    builder = db_indexes.IndexBuilder(db_path, fingerprint, log=lambda _msg: None, timeout=30)
+    builder.run()
+    elapsed = (time.perf_counter() - started) * 1000.0
+    return {
+        "ms": round(elapsed, 3),
+        "created": builder.created,
+        "complete": builder.complete,
+        "schema": fingerprint["version"],
+        "plan": [{"query": name, "plan": plan, "ok": ok} for name, plan, ok in builder.report],
+    }
+
+
+def time_json_write(snapshot, folder, repeat):
+    if not snapshot:
+        return None
+    logic.data_path = os.path.join(folder, "quest.json")
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        logic.save_quests_to_json(snapshot.user_profile_id, snapshot.timestamp, snapshot.quest_list())
+        samples.append((time.perf_counter() - started) * 1000.0)
+    result = _stats(samples)
+    result["bytes"] = os.path.getsize(logic.data_path)
+    return result
+# ////-----------------------------------------------------------------------------------------
+
+
+def bench_profile(profile, version, work_dir, repeat, seed):
+    db_path = os.path.join(work_dir, f"SCUM_{profile}_{version}.db")
+    gen = gen_scum_db.generate(db_path, profile=profile, version=version, seed=seed)
+
+    result = {"profile": profile, "version": version, "db": {k: v for k, v in gen.items() if k != "path"}}
+    result["scan_noindex_cold"], _ = time_cold(db_path, max(1, repeat // 4))
+    result["scan_noindex_warm"] = time_warm(db_path, max(1, repeat // 4))
+    result["index_build"] = time_index_build(db_path)
+    result["scan_cold"], scan_result = time_cold(db_path, repeat)
+    result["scan_warm"] = time_warm(db_path, repeat)
+    result["json_write"] = time_json_write(scan_result, work_dir, repeat)
+    result["quests_found"] = len(scan_result.quests) if scan_result else 0
+
+    os.remove(db_path)
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    return result
+
+
+def compare(current, previous):
+    """Vypíše mediány aktuálneho behu voči staršiemu JSON výsledku."""
+    old = {(r["profile"], r["version"]): r for r in previous.get("results", [])}
+    for r in current["results"]:
+        before = old.get((r["profile"], r["version"]))
+        if not before:
+            continue
+        for stage in ("scan_noindex_warm", "scan_cold", "scan_warm", "json_write"):
+            a, b = (before.get(stage) or {}).get("median_ms"), (r.get(stage) or {}).get("median_ms")
+            if a and b:
+                print(f"  {r['profile']:>7}/{r['version']} {stage:<18} {a:9.3f} -> {b:9.3f} ms ({(b - a) / a * 100:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ActiveQuests scan loop on synthetic databases.")
+    parser.add_argument("--profiles", nargs="+", default=["fresh", "small", "medium"], choices=sorted(gen_scum_db.PROFILES))
+    parser.add_argument("--versions", nargs="+", default=["v1.2"], choices=sorted(gen_scum_db.PRISONER_CLASSES))
+    parser.add_argument("--repeat", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--work-dir", help="where databases are generated (default: temp dir)")
+    parser.add_argument("--out", default="bench_scan.json")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="aq_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+    # log benchmarku nesmie prepisovať data/log.txt modulu
+    logic.log_path = os.path.join(work_dir, "log.txt")
+
+    try:
+        with open(os.path.join(MODULE_ROOT, "data", "version.txt"), "r", encoding="utf-8") as f:
+            module_version = next((line.strip() for line in reversed(f.readlines()) if line.startswith("[") and "]" in line and line[1].isdigit()), None)
+    except OSError:
+        module_version = None
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "module_version": module_version,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [],
+    }
+    try:
+        for version in args.versions:
+            for profile in args.profiles:
+                r = bench_profile(profile, version, work_dir, args.repeat, args.seed)
+                report["results"].append(r)
+                print(f"[bench_scan] {profile}/{version}: warm {r['scan_warm']['median_ms']} ms "
+                      f"(no index {r['scan_noindex_warm']['median_ms']} ms), cold {r['scan_cold']['median_ms']} ms, "
+                      f"index build {r['index_build']['ms']} ms, json {r['json_write']['median_ms'] if r['json_write'] else '-'} ms")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench_scan] results saved to {args.out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Fault injection: scan slučka pod súbehom zápisov, zámkov a poškodených súborov ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Pre každý scenár vytvorí syntetickú SCUM.db (tools/gen_scum_db.py), spustí skutočnú
+# logiku (python/logic.py, logic_main_init) v dočasnom priečinku a vedľa nej samostatný
+# proces "hry" (--writer), ktorý posúva čas sveta, mení progres questov a podľa plánu
+# vkladá poruchy:
+#   busy          - BEGIN EXCLUSIVE nad DB v rollback journal režime (SQLITE_BUSY pre čítanie),
+#   wal_hold      - dlhá zápisová transakcia nad WAL DB (držaný zápisový zámok, veľký WAL),
+#   checkpoint    - agresívne wal_checkpoint(TRUNCATE) počas zápisov,
+#   replace       - DB nahradená novým súborom (os.replace, ako atomické uloženie),
+#   truncate      - DB skrátená na 0 B a po chvíli obnovená,
+#   vanish        - DB (aj -wal/-shm) premenovaná preč a späť,
+#   torn_json     - data/quest.json zapísaný do polovice,
+#   bad_translate - data/translate.json so syntaktickou chybou.
+# Vlákno "overlay" číta quest.json ako widget (read_json_safe) a preklady cez provider.
+# Výsledok: chvost latencie scanu (trace spany), chyby v logu, recovery latencia po každej
+# poruche a podiel vzoriek, kde overlay ukazuje prázdny alebo zastaraný zoznam.
+#
+#   python tools/fault_inject.py --scenarios busy vanish torn_json --duration 20 --out faults.json
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import random
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import statistics
+import importlib.util
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULE_ROOT = os.path.dirname(TOOLS_DIR)
+
+SCENARIOS = ("busy", "wal_hold", "checkpoint", "replace", "truncate", "vanish", "torn_json", "bad_translate")
+TICK_INTERVAL = 0.25
+SAMPLE_INTERVAL = 0.1
+
+
+def _load(name, path):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        spec.loader.exec_module(mod)
+    return mod
+
+gen_scum_db = _load("gen_scum_db", os.path.join(TOOLS_DIR, "gen_scum_db.py"))
+
+
+# ////---- Proces "hry" (--writer) ----////
+class Writer:
+    def __init__(self, spec):
+        self.spec = spec
+        self.db_path = spec["db_path"]
+        self.rng = random.Random(spec.get("seed", 1))
+        self.conn = None
+        self._open()
+        player = spec["active_player"]
+        self.ts = self.conn.execute("SELECT timestamp FROM entity_system WHERE user_profile_id = ?", (player,)).fetchone()[0]
+        quest_ids = [r[0] for r in self.conn.execute("SELECT id FROM active_quest WHERE user_profile_id = ?", (player,))]
+        marks = ",".join("?" * len(quest_ids)) or "NULL"
+        self.tracking_ids = [r[0] for r in self.conn.execute(
+            f"SELECT id FROM tracking_data WHERE tracking_data_set_id IN ({marks})", quest_ids)]
+        self.ticks = 0
+
+    def _open(self):
+        self.conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+
+    def _close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def emit(self, event, **data):
+        print(json.dumps(dict(data, event=event, t=time.monotonic())), flush=True)
+
+    def _bump(self, conn):
+        """Posun času sveta + občas progres jedného questu (bez COMMIT)."""
+        self.ts += 1.0
+        conn.execute("UPDATE entity_system SET timestamp = ? WHERE user_profile_id = ?", (self.ts, self.spec["active_player"]))
+        self.ticks += 1
+        if self.tracking_ids and self.ticks % 4 == 0:
+            conn.execute("UPDATE tracking_data SET data = ? WHERE id = ?",
+                         (gen_scum_db.make_blob(self.rng), self.rng.choice(self.tracking_ids)))
+
+    def tick(self):
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._bump(self.conn)
+            self.conn.execute("COMMIT")
+            self.emit("commit", ts=self.ts)
+        except sqlite3.Error as e:
+            try:
+                self.conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            self.emit("writer_error", error=str(e))
+
+    def _checkpoint(self):
+        try:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchone()
+        except sqlite3.Error:
+            pass
+
+    def _ticking(self, seconds):
+        until = time.monotonic() + seconds
+        while time.monotonic() < until:
+            self.tick()
+            time.sleep(TICK_INTERVAL)
+
+    # ////---- Poruchy ----////
+    def fault(self, kind, length):
+        self.emit("fault_start", kind=kind)
+        getattr(self, f"_fault_{kind}")(length)
+        self.emit("fault_end", kind=kind)
+
+    def _fault_busy(self, length):
+        self.conn.execute("BEGIN EXCLUSIVE")
+        self._bump(self.conn)
+        time.sleep(length)
+        self.conn.execute("COMMIT")
+        self.emit("commit", ts=self.ts)
+
+    def _fault_wal_hold(self, length):
+        # locking_mode=EXCLUSIVE sa vo WAL nedá získať, kým má DB otvorenú iný proces
+        # (čitateľ drží shm) - hra preto drží zápisový zámok a prepisuje veľkú časť DB,
+        # po COMMIT čitatelia prechádzajú veľký WAL až do ďalšieho checkpointu
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._bump(self.conn)
+        self.conn.execute("UPDATE entity SET flags = flags WHERE id % 4 = 0")
+        time.sleep(length)
+        self.conn.execute("COMMIT")
+        self.emit("commit", ts=self.ts)
+
+    def _fault_checkpoint(self, length):
+        until = time.monotonic() + length
+        while time.monotonic() < until:
+            self.tick()
+            self._checkpoint()
+            time.sleep(0.02)
+
+    def _fault_replace(self, length):
+        self._checkpoint()
+        fresh = self.db_path + ".new"
+        target = sqlite3.connect(fresh)
+        self.conn.backup(target)
+        target.close()
+        self._close()
+        os.replace(fresh, self.db_path)
+        self._open()
+        self.tick()
+        time.sleep(length)
+
+    def _fault_truncate(self, length):
+        self._checkpoint()
+        self._close()
+        with open(self.db_path, "rb") as f:
+            content = f.read()
+        with open(self.db_path, "r+b") as f:
+            f.truncate(0)
+        time.sleep(length)
+        with open(self.db_path, "r+b") as f:
+            f.write(content)
+        self._open()
+        self.tick()
+
+    def _fault_vanish(self, length):
+        self._checkpoint()
+        self._close()
+        moved = []
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.rename(self.db_path + suffix, self.db_path + suffix + ".gone")
+                moved.append(suffix)
+        time.sleep(length)
+        for suffix in moved:
+            os.rename(self.db_path + suffix + ".gone", self.db_path + suffix)
+        self._open()
+        self.tick()
+
+    def _fault_torn_json(self, length):
+        try:
+            with open(self.spec["quest_json"], "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            text = "{}"
+        with open(self.spec["quest_json"], "w", encoding="utf-8") as f:
+            f.write(text[: len(text) // 2])
+        self._ticking(length)
+
+    def _fault_bad_translate(self, length):
+        path = self.spec["translate_json"]
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text[: len(text) // 2])
+        self._ticking(length)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def run(self):
+        spec = self.spec
+        started = time.monotonic()
+        next_fault = started + spec["period"]
+        self.emit("ready", ts=self.ts)
+        while time.monotonic() - started < spec["duration"]:
+            if time.monotonic() >= next_fault:
+                self.fault(spec["scenario"], spec["length"])
+                next_fault = time.monotonic() + spec["period"]
+            elif spec["scenario"] == "checkpoint":
+                self.tick()
+                self._checkpoint()
+                time.sleep(TICK_INTERVAL)
+            else:
+                self.tick()
+                time.sleep(TICK_INTERVAL)
+        self._close()
+        self.emit("done")
+
+
+def writer_main(spec_json):
+    Writer(json.loads(spec_json)).run()
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Overlay - čítanie ako widget ----////
+def read_json_safe(path, default=None):
+    """Rovnaké správanie ako widgets/quest.py: chyba parsovania = default."""
+    if not os.path.exists(path):
+        return default, "missing"
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f), "ok"
+    except Exception:
+        return default, "torn"
+
+
+class OverlaySampler(threading.Thread):
+    def __init__(self, quest_json, provider):
+        super().__init__(name="FaultOverlaySampler", daemon=True)
+        self.quest_json = quest_json
+        self.provider = provider
+        self.samples = []
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(SAMPLE_INTERVAL):
+            data, status = read_json_safe(self.quest_json, {"quests": []})
+            data = data if isinstance(data, dict) else {"quests": []}
+            quests = data.get("quests") or []
+            translated = bool(self.provider.quests("en")) if self.provider else True
+            self.samples.append({
+                "t": time.monotonic(),
+                "status": status,
+                "quests": len(quests),
+                "ts": data.get("timestamp"),
+                "stale_flag": bool(data.get("stale")),
+                "translated": translated,
+            })
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Vyhodnotenie ----////
+def _stats(samples_ms):
+    if not samples_ms:
+        return None
+    samples = sorted(samples_ms)
+    pick = lambda q: round(samples[min(len(samples) - 1, int(len(samples) * q))], 3)
+    return {"n": len(samples), "median_ms": round(statistics.median(samples), 3),
+            "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": round(samples[-1], 3)}
+
+
+def staleness(sample, commits):
+    """Ako dlho už existuje novší čas sveta, než ukazuje overlay (s)."""
+    shown = sample["ts"]
+    if shown is None:
+        return None
+    for t, ts in commits:
+        if ts > shown:
+            return max(0.0, sample["t"] - t)
+    return 0.0
+
+
+def evaluate(samples, writer_events, stale_after):
+    commits = [(e["t"], e["ts"]) for e in writer_events if e["event"] == "commit"]
+    counts = {"samples": len(samples), "empty": 0, "torn": 0, "stale": 0, "untranslated": 0}
+    for s in samples:
+        if s["status"] == "torn":
+            counts["torn"] += 1
+        if not s["quests"]:
+            counts["empty"] += 1
+            continue
+        lag = staleness(s, commits)
+        s["lag"] = lag
+        if s["stale_flag"] or (lag is not None and lag > stale_after):
+            counts["stale"] += 1
+        if not s["translated"]:
+            counts["untranslated"] += 1
+    total = max(1, counts["samples"])
+    ratios = {f"{k}_ratio": round(v / total, 4) for k, v in counts.items() if k != "samples"}
+
+    # recovery: prvá vzorka po konci poruchy, ktorá ukazuje čas zapísaný po konci poruchy
+    recoveries, unrecovered, unmeasured = [], 0, 0
+    ends = [e for e in writer_events if e["event"] == "fault_end"]
+    for end in ends:
+        first_ts = next((ts for t, ts in commits if t >= end["t"]), None)
+        if first_ts is None:
+            # po poslednej poruche už hra nič nezapísala
+            unmeasured += 1
+            continue
+        hit = next((s for s in samples if s["t"] >= end["t"] and s["quests"] and s["status"] == "ok"
+                    and s["ts"] is not None and s["ts"] >= first_ts), None)
+        if hit is None:
+            unrecovered += 1
+        else:
+            recoveries.append((hit["t"] - end["t"]) * 1000.0)
+    return dict(counts, **ratios, faults=len(ends), recovery=_stats(recoveries),
+                unrecovered=unrecovered, unmeasured=unmeasured)
+
+
+def scan_latency(tracer):
+    events = tracer.to_chrome()["traceEvents"]
+    return _stats([e["dur"] / 1000.0 for e in events if e.get("ph") == "X" and e["name"] == "scan"])
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Jeden scenár ----////
+def run_scenario(scenario, args, work_root):
+    work = os.path.join(work_root, scenario)
+    for sub in ("config", "data", "db"):
+        os.makedirs(os.path.join(work, sub), exist_ok=True)
+    db_path = os.path.join(work, "db", "SCUM.db")
+    gen = gen_scum_db.generate(db_path, profile=args.profile, seed=args.seed,
+                               journal_mode="delete" if scenario == "busy" else "wal", log=None)
+    translate_json = os.path.join(work, "data", "translate.json")
+    shutil.copy(os.path.join(MODULE_ROOT, "data", "translate.json"), translate_json)
+
+    # čerstvá inštancia logiky s cestami v dočasnom priečinku
+    for key in [k for k in sys.modules if k.startswith("active_quests_")]:
+        if key != "active_quests_gen_scum_db":
+            sys.modules.pop(key)
+    logic = _load("logic", os.path.join(MODULE_ROOT, "python", "logic.py"))
+    translations = _load("translations", os.path.join(MODULE_ROOT, "python", "translations.py"))
+    logic.config_path = os.path.join(work, "config", "config.json")
+    logic.path_ini_path = os.path.join(work, "config", "path.ini")
+    logic.data_path = os.path.join(work, "data", "quest.json")
+    logic.log_path = os.path.join(work, "data", "log.txt")
+    logic.startup_cache_path = os.path.join(work, "data", "startup_cache.json")
+    with open(logic.path_ini_path, "w", encoding="utf-8") as f:
+        f.write(f"[paths]\ndb_path = {db_path}\n")
+    with open(logic.config_path, "w", encoding="utf-8") as f:
+        json.dump({"scan_interval": args.scan_interval, "db_watch": args.watch, "trace": True, "language": "en"}, f)
+
+    stop_event = threading.Event()
+    logic_thread = threading.Thread(target=logic.logic_main_init, args=(stop_event,), name="FaultLogic", daemon=True)
+    logic_thread.start()
+
+    # prvé questy = logika beží
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        data, _ = read_json_safe(logic.data_path, {})
+        if isinstance(data, dict) and data.get("quests"):
+            break
+        time.sleep(0.1)
+
+    provider = translations.TranslationProvider(translate_json, os.path.join(work, "data", "translate_cache"))
+    provider.wait("en", timeout=60)
+    sampler = OverlaySampler(logic.data_path, provider)
+
+    spec = {
+        "db_path": db_path, "active_player": gen["active_player"], "scenario": scenario, "seed": args.seed,
+        "duration": args.duration, "period": args.period, "length": args.length,
+        "quest_json": logic.data_path, "translate_json": translate_json,
+    }
+    writer = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--writer", json.dumps(spec)],
+                              stdout=subprocess.PIPE, text=True)
+    writer_events = []
+    ready = json.loads(writer.stdout.readline())
+    writer_events.append(ready)
+    sampler.start()
+    for line in writer.stdout:
+        try:
+            writer_events.append(json.loads(line))
+        except ValueError:
+            pass
+    writer.wait()
+    time.sleep(args.settle)
+
+    sampler.stop_event.set()
+    sampler.join()
+    stop_event.set()
+    logic_thread.join(timeout=10)
+
+    logger = logic.log_writer.get_logger(logic.log_path)
+    log_lines = [line for _seq, line in logger.records()]
+    errors = [line for line in log_lines if "Chyba" in line or "error" in line.lower()]
+    result = {
+        "scenario": scenario,
+        "journal_mode": "delete" if scenario == "busy" else "wal",
+        "writer_commits": sum(1 for e in writer_events if e["event"] == "commit"),
+        "writer_errors": sum(1 for e in writer_events if e["event"] == "writer_error"),
+        "scan": scan_latency(logic.trace),
+        "overlay": evaluate(sampler.samples, writer_events, args.stale_after),
+        "log_errors": len(errors),
+        "log_error_samples": sorted(set(line.split("] ", 1)[-1] for line in errors))[:5],
+        "logic_stopped": not logic_thread.is_alive(),
+    }
+    logic.trace.clear()
+    return result
+# ////-----------------------------------------------------------------------------------------
+
+
+def main(argv=None):
+    if argv is None and len(sys.argv) == 3 and sys.argv[1] == "--writer":
+        writer_main(sys.argv[2])
+        return
+
+    parser = argparse.ArgumentParser(description="Inject DB contention and file corruption faults into the scan loop.")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--profile", default="small", choices=sorted(gen_scum_db.PROFILES))
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of writer activity per scenario")
+    parser.add_argument("--period", type=float, default=4.0, help="seconds between faults")
+    parser.add_argument("--length", type=float, default=1.5, help="fault length in seconds")
+    parser.add_argument("--scan-interval", type=float, default=1.0)
+    parser.add_argument("--watch", default="auto", choices=("auto", "inotify", "poll"))
+    parser.add_argument("--stale-after", type=float, default=3.0, help="overlay lag (s) counted as stale")
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds to keep sampling after the writer stops")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--work-dir")
+    parser.add_argument("--out", default="fault_inject.json")
+    args = parser.parse_args(argv)
+
+    work_root = args.work_dir or tempfile.mkdtemp(prefix="aq_faults_")
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("out", "work_dir")},
+        "results": [],
+    }
+    try:
+        for scenario in args.scenarios:
+            r = run_scenario(scenario, args, work_root)
+            report["results"].append(r)
+            o, scan = r["overlay"], r["scan"] or {}
+            rec = o["recovery"] or {}
+            print(f"[fault_inject] {scenario:<13} scan p50 {scan.get('median_ms')} / p99 {scan.get('p99_ms')} / max {scan.get('max_ms')} ms | "
+                  f"recovery median {rec.get('median_ms')} max {rec.get('max_ms')} ms, unrecovered {o['unrecovered']}/{o['faults']} | "
+                  f"empty {o['empty_ratio']:.1%} stale {o['stale_ratio']:.1%} torn {o['torn_ratio']:.1%} "
+                  f"untranslated {o['untranslated_ratio']:.1%} | log errors {r['log_errors']}")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[fault_inject] results saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
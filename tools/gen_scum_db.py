@@ -0,0 +1,224 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Generátor syntetickej SCUM.db pre benchmarky ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Vytvorí databázu s tabuľkami, ktoré číta python/logic.py (entity, entity_system,
+# active_quest, tracking_data), pre hráčsku entitu v1.1 (FPrisonerEntity) aj v1.2
+# (BP_Prisoner_ES). Asset path questov a počet tracking BLOBov sa berú z data/translate.json,
+# BLOBy majú progres na pozíciách, ktoré čítajú type1 dekodéry.
+#
+#   python tools/gen_scum_db.py out/SCUM.db --profile mature --version v1.2
+import os
+import sys
+import time
+import json
+import random
+import struct
+import sqlite3
+import argparse
+
+MODULE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSLATE_PATH = os.path.join(MODULE_ROOT, "data", "translate.json")
+
+PRISONER_CLASSES = {"v1.2": "BP_Prisoner_ES", "v1.1": "FPrisonerEntity"}
+SECTORS = [f"{row}{col}" for row in "ZABC" for col in range(5)]
+
+# Ostatné entity na serveri (vozidlá, predmety, základne...) - len zaberajú miesto v tabuľke
+FILLER_CLASSES = (
+    "BP_Item_ES", "BP_Vehicle_ES", "BP_BaseElement_ES", "BP_Container_ES", "BP_Zombie_ES",
+    "BP_Animal_ES", "BP_Trap_ES", "BP_Plant_ES", "BP_Flag_ES", "BP_Door_ES",
+)
+
+# Veľkosti: od čerstvého savu po dlho bežiaci server
+PROFILES = {
+    "fresh":  {"players": 1,    "entities": 2_000,     "quests": 3,  "filler_tracking": 500},
+    "small":  {"players": 10,   "entities": 50_000,    "quests": 6,  "filler_tracking": 20_000},
+    "medium": {"players": 100,  "entities": 400_000,   "quests": 8,  "filler_tracking": 200_000},
+    "mature": {"players": 500,  "entities": 2_500_000, "quests": 10, "filler_tracking": 1_000_000},
+}
+
+BATCH = 50_000
+SCHEMA = """
+CREATE TABLE entity (
+    id INTEGER PRIMARY KEY,
+    class TEXT NOT NULL,
+    flags INTEGER NOT NULL DEFAULT 0,
+    entity_system_id INTEGER,
+    payload BLOB
+);
+CREATE TABLE entity_system (
+    id INTEGER PRIMARY KEY,
+    user_profile_id INTEGER,
+    timestamp REAL
+);
+CREATE TABLE active_quest (
+    id INTEGER PRIMARY KEY,
+    user_profile_id INTEGER NOT NULL,
+    sector TEXT,
+    completion_deadline REAL,
+    quest_data_asset_path TEXT,
+    auto_complete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE tracking_data (
+    id INTEGER PRIMARY KEY,
+    tracking_data_set_id INTEGER NOT NULL,
+    data BLOB
+);
+"""
+
+
+# ////---- Questy z translate.json ----////
+def load_quest_templates(path=TRANSLATE_PATH):
+    """[(asset_path, počet tracking riadkov)] - multi-item questy majú translate_data_N."""
+    with open(path, "r", encoding="utf-8") as f:
+        quests = json.load(f).get("quests", {})
+    templates = []
+    for asset_path, entry in quests.items():
+        items = sum(1 for k in entry if k.startswith("translate_data_"))
+        if not items:
+            td = entry.get("translate_data")
+            items = sum(1 for k in td if k.startswith("translate_data_")) if isinstance(td, dict) else 0
+        templates.append((asset_path, max(1, items)))
+    return templates
+
+
+def make_blob(rng, required=None, complete=None):
+    """Tracking BLOB: complete na bajtoch 8-9, required na 12-13 (type1:8,9,12,13)."""
+    required = required if required is not None else rng.choice((1, 2, 3, 5, 10, 20, 50))
+    complete = complete if complete is not None else rng.randint(0, required)
+    header = rng.getrandbits(64).to_bytes(8, "little")
+    tail = bytes(rng.getrandbits(8) for _ in range(rng.choice((4, 8, 16))))
+    return header + struct.pack("<HHH", complete, 0, required) + tail
+# ////-----------------------------------------------------------------------------------------
+
+
+def _insert_batched(conn, sql, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            conn.executemany(sql, batch)
+            batch.clear()
+    if batch:
+        conn.executemany(sql, batch)
+
+
+# ////---- Generovanie ----////
+def generate(path, profile="small", version="v1.2", seed=1, entity_payload=48, journal_mode="wal",
+             players=None, entities=None, quests=None, filler_tracking=None, templates=None, log=print):
+    """Vytvorí DB a vráti štatistiky (počty riadkov, veľkosť, čas)."""
+    spec = dict(PROFILES[profile])
+    for key, value in (("players", players), ("entities", entities), ("quests", quests), ("filler_tracking", filler_tracking)):
+        if value is not None:
+            spec[key] = value
+
+    rng = random.Random(seed)
+    templates = templates or load_quest_templates()
+    prisoner_class = PRISONER_CLASSES[version]
+
+    started = time.perf_counter()
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF;")
+    conn.execute("PRAGMA synchronous = OFF;")
+    conn.executescript(SCHEMA)
+
+    # entity_system - jeden na hráča; herný čas ~ desiatky dní od začiatku sveta
+    world_ts = float(rng.randint(2_000_000, 9_000_000))
+    systems = [(pid, pid, world_ts) for pid in range(1, spec["players"] + 1)]
+    conn.executemany("INSERT INTO entity_system (id, user_profile_id, timestamp) VALUES (?, ?, ?)", systems)
+
+    # hráčske entity rozhádzané medzi ostatnými, aktívny hráč (flags = 0) je jediný
+    active_player = rng.randint(1, spec["players"])
+    filler_count = max(0, spec["entities"] - spec["players"])
+    player_slots = sorted(rng.sample(range(filler_count + spec["players"]), spec["players"]))
+    player_by_slot = dict(zip(player_slots, range(1, spec["players"] + 1)))
+    payload = bytes(entity_payload)
+
+    def entity_rows():
+        for slot in range(filler_count + spec["players"]):
+            pid = player_by_slot.get(slot)
+            if pid is not None:
+                yield (prisoner_class, 0 if pid == active_player else 1, pid, payload)
+            else:
+                yield (rng.choice(FILLER_CLASSES), rng.randint(0, 7), rng.randint(1, spec["players"]) + 1000, payload)
+
+    _insert_batched(conn, "INSERT INTO entity (class, flags, entity_system_id, payload) VALUES (?, ?, ?, ?)", entity_rows())
+
+    # questy všetkých hráčov + ich tracking dáta (tracking_data_set_id = active_quest.id)
+    quest_rows, tracking_rows = [], []
+    quest_id = 0
+    for pid in range(1, spec["players"] + 1):
+        for asset_path, items in rng.sample(templates, min(spec["quests"], len(templates))):
+            quest_id += 1
+            deadline = world_ts + rng.randint(600, 4 * 86400)
+            quest_rows.append((quest_id, pid, rng.choice(SECTORS), deadline, asset_path, rng.randint(0, 1)))
+            for _ in range(items):
+                tracking_rows.append((quest_id, make_blob(rng)))
+    conn.executemany(
+        "INSERT INTO active_quest (id, user_profile_id, sector, completion_deadline, quest_data_asset_path, auto_complete) "
+        "VALUES (?, ?, ?, ?, ?, ?)", quest_rows)
+
+    # tracking dáta iných systémov (zbrane, vozidlá...) - set id mimo rozsahu questov
+    def filler_tracking_rows():
+        for _ in range(spec["filler_tracking"]):
+            yield (quest_id + 1 + rng.randint(0, spec["filler_tracking"] // 4 + 1), make_blob(rng))
+
+    rows = tracking_rows + list(filler_tracking_rows())
+    rng.shuffle(rows)
+    _insert_batched(conn, "INSERT INTO tracking_data (tracking_data_set_id, data) VALUES (?, ?)", rows)
+
+    conn.commit()
+    conn.execute(f"PRAGMA journal_mode = {journal_mode};")
+    conn.close()
+
+    stats = {
+        "path": os.path.abspath(path),
+        "profile": profile,
+        "version": version,
+        "prisoner_class": prisoner_class,
+        "seed": seed,
+        "players": spec["players"],
+        "active_player": active_player,
+        "entities": filler_count + spec["players"],
+        "active_quests": len(quest_rows),
+        "tracking_rows": len(rows),
+        "size_bytes": os.path.getsize(path),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    if log:
+        log(f"[gen_scum_db] {profile}/{version}: {stats['entities']} entities, {stats['active_quests']} quests, "
+            f"{stats['tracking_rows']} tracking rows, {stats['size_bytes'] / 1048576:.1f} MiB in {stats['seconds']}s")
+    return stats
+# ////-----------------------------------------------------------------------------------------
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic SCUM.db for benchmarks.")
+    parser.add_argument("output", help="path of the database to create (overwritten)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--version", choices=sorted(PRISONER_CLASSES), default="v1.2")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--players", type=int)
+    parser.add_argument("--entities", type=int)
+    parser.add_argument("--quests", type=int, help="active quests per player")
+    parser.add_argument("--filler-tracking", type=int)
+    parser.add_argument("--entity-payload", type=int, default=48, help="bytes of filler data per entity row")
+    parser.add_argument("--journal-mode", default="wal", choices=("wal", "delete"))
+    args = parser.parse_args(argv)
+
+    stats = generate(
+        args.output, profile=args.profile, version=args.version, seed=args.seed,
+        entity_payload=args.entity_payload, journal_mode=args.journal_mode,
+        players=args.players, entities=args.entities, quests=args.quests, filler_tracking=args.filler_tracking,
+    )
+    json.dump(stats, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
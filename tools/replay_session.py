@@ -0,0 +1,346 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Replay záznamu relácie (python/session_recorder.py) s meraním renderu ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Prehrá data/session_<čas>.jsonl.gz (snapshoty, shortcut akcie, zmeny configu) v reálnom
+# alebo zrýchlenom čase a meria render (filter / sort / html) a pamäť. Hra ani SCUM.db
+# nie sú potrebné.
+#   headless (predvolené) - python/render_core.py, bez Qt; medzi udalosťami sa renderuje
+#                           každú sekundu času záznamu ako časovač widgetu,
+#   --widget              - skutočný QuestWidget (QT_QPA_PLATFORM=offscreen), potrebuje
+#                           PySide6 a shortcut_manager hostiteľskej aplikácie v PYTHONPATH.
+#
+#   python tools/replay_session.py data/session_20250101_120000.jsonl.gz --speed 0 --out replay.json
+import os
+import sys
+import copy
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+import importlib.util
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULE_ROOT = os.path.dirname(TOOLS_DIR)
+TICK_INTERVAL = 1.0
+
+
+def _load(name, path):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        spec.loader.exec_module(mod)
+    return mod
+
+render_core = _load("render_core", os.path.join(MODULE_ROOT, "python", "render_core.py"))
+session_recorder = _load("session_recorder", os.path.join(MODULE_ROOT, "python", "session_recorder.py"))
+bench_render = _load("bench_render", os.path.join(TOOLS_DIR, "bench_render.py"))
+
+
+# ////---- Meranie ----////
+def _stats(samples_ms):
+    if not samples_ms:
+        return None
+    samples = sorted(samples_ms)
+    return {
+        "n": len(samples),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def _rss_kib():
+    """Aktuálne RSS procesu (Linux /proc), inak None."""
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class Clock:
+    """Čas záznamu -> reálny čas podľa rýchlosti (0 = bez čakania)."""
+
+    def __init__(self, speed):
+        self.speed = speed
+        self._started = time.monotonic()
+
+    def wait_until(self, t):
+        if self.speed <= 0:
+            return
+        delay = t / self.speed - (time.monotonic() - self._started)
+        if delay > 0:
+            time.sleep(delay)
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Headless prehrávač (render_core) ----////
+class HeadlessPlayer:
+    def __init__(self, header, source):
+        configs = header.get("configs", {})
+        self.cfg = copy.deepcopy(configs.get("quest.json") or {})
+        self.cfg.setdefault("filter", {"enabled": True, "sectors": {}})
+        self.cfg.setdefault("sort", {"keys": ["time_remaining"], "order": "asc"})
+        app_cfg = configs.get("config.json") or {}
+        self.cfg["language"] = self.cfg.get("language") or app_cfg.get("language") or "en"
+        self.source = source
+        self.view = render_core.ViewState(page_size=self.cfg.get("page_size", 10))
+        self._reload_filters()
+        self.state = session_recorder.SnapshotState()
+        self.quests = []
+        self.snapshot_t = None
+        self.samples = {"filter": [], "sort": [], "html": [], "total": []}
+        self.html_bytes = 0
+        self.renders = 0
+
+    def _reload_filters(self):
+        self.view.active_sectors = render_core.active_filter_set(self.cfg, "sectors")
+        self.view.active_shops = render_core.active_filter_set(self.cfg, "shops")
+
+    def world_time(self, t):
+        # ako widget s jedným snapshotom: posun o uplynulý čas (rýchlosť 1x)
+        if self.state.timestamp is None:
+            return None
+        return int(self.state.timestamp + max(0.0, t - self.snapshot_t))
+
+    def handle(self, event):
+        kind = event.get("kind")
+        if kind == "snapshot":
+            self.state.apply(event)
+            self.quests = render_core.prepare_quests(copy.deepcopy(self.state.quests()))
+            self.snapshot_t = event["t"]
+        elif kind == "action":
+            render_core.apply_action(
+                event["name"], self.cfg, self.view,
+                visible_count=lambda: len(render_core.filter_quests(
+                    self.quests, self.cfg, self.view.active_sectors, self.view.active_shops)),
+            )
+        elif kind == "config" and event.get("name") == "quest.json" and isinstance(event.get("data"), dict):
+            self.cfg.update(copy.deepcopy(event["data"]))
+            self.view.page_size = self.cfg.get("page_size", self.view.page_size)
+            self._reload_filters()
+
+    def render(self, t):
+        current_ts = self.world_time(t)
+        started = time.perf_counter()
+        quests = render_core.filter_quests(self.quests, self.cfg, self.view.active_sectors, self.view.active_shops)
+        filtered = time.perf_counter()
+        quests = render_core.sort_quests(quests, self.cfg, current_ts)
+        ordered = time.perf_counter()
+        self.cfg["widget_instance"] = self.source
+        html_out = render_core.generate_full_html(
+            quests, current_ts, self.cfg, text_source=self.source,
+            page=self.view.page, page_size=self.view.page_size,
+            active_sectors=self.view.active_sectors, active_shops=self.view.active_shops,
+            extra_globals={"clock_confidence": "replay", "clock_rate": "1.00x", "data_state": "live"},
+        )
+        done = time.perf_counter()
+        self.cfg.pop("widget_instance", None)
+        for stage, a, b in (("filter", started, filtered), ("sort", filtered, ordered), ("html", ordered, done), ("total", started, done)):
+            self.samples[stage].append((b - a) * 1000.0)
+        self.html_bytes = max(self.html_bytes, len(html_out.encode("utf-8")))
+        self.renders += 1
+
+    def close(self):
+        pass
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Prehrávač so skutočným QuestWidget ----////
+class WidgetPlayer:
+    """Spúšťa widgets/quest.py v offscreen Qt; quest.json zapisuje do dočasného priečinka."""
+
+    def __init__(self, header, work_dir):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        try:
+            from PySide6.QtWidgets import QApplication, QWidget
+            import shortcut_manager  # noqa: F401 - widget si ho importuje sám
+        except ImportError as e:
+            raise SystemExit(f"[replay] --widget needs PySide6 and the host's shortcut_manager on PYTHONPATH ({e})")
+
+        self.app = QApplication.instance() or QApplication([])
+        self.work_dir = work_dir
+        config_dir = os.path.join(work_dir, "config")
+        data_dir = os.path.join(work_dir, "data")
+        os.makedirs(config_dir, exist_ok=True)
+        os.makedirs(data_dir, exist_ok=True)
+        shutil.copy(os.path.join(MODULE_ROOT, "data", "translate.json"), data_dir)
+        for name, data in (header.get("configs") or {}).items():
+            with open(os.path.join(config_dir, name), "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        self.data_path = os.path.join(data_dir, "quest.json")
+        self.config_path = os.path.join(config_dir, "quest.json")
+
+        class ReplayBase(QWidget):
+            def __init__(self, module_name):
+                super().__init__()
+                self.module_name = module_name
+
+            def get_config_path(self, name):
+                return os.path.join(config_dir, name)
+
+            def get_data_path(self, name):
+                return os.path.join(data_dir, name)
+
+        self._base_class = ReplayBase
+        self.widget = None
+        self._create_widget()
+        self.state = session_recorder.SnapshotState()
+        self.samples = {"total": []}
+        self.html_bytes = 0
+        self.renders = 0
+
+    def _create_widget(self):
+        widget_module = _load("quest_widget", os.path.join(MODULE_ROOT, "widgets", "quest.py"))
+        self.widget = widget_module.create_widget(self._base_class, "ActiveQuests")
+        self.widget.resize(480, 900)
+        self.widget.show()
+        # preklady sa inak načítajú na pozadí - prvé rendery by boli bez textov
+        self.widget._translations.wait(self.widget._config.get("language", "en"), timeout=60)
+
+    def rebuild(self, reexec=True):
+        """Ako prestavba overlayu v hostiteľovi: zruší widget, znovu vykoná widgets/quest.py a vytvorí nový."""
+        self.close()
+        if reexec:
+            sys.modules.pop("active_quests_quest_widget", None)
+        self._create_widget()
+
+    def handle(self, event):
+        kind = event.get("kind")
+        if kind == "snapshot":
+            self.state.apply(event)
+            with open(self.data_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "user_profile_id": self.state.user_profile_id,
+                    "timestamp": self.state.timestamp,
+                    "captured_monotonic": time.monotonic(),
+                    "quests": self.state.quests(),
+                }, f, ensure_ascii=False)
+            self.widget._load_data_json(force=True)
+        elif kind == "action":
+            self.widget._on_shortcut_triggered(event["name"], "")
+        elif kind == "config" and event.get("name") == "quest.json" and isinstance(event.get("data"), dict):
+            with open(self.config_path, "w", encoding="utf-8") as f:
+                json.dump(event["data"], f, indent=2, ensure_ascii=False)
+            self.widget._load_and_apply_config()
+
+    def render(self, _t):
+        started = time.perf_counter()
+        self.widget._render_quests_safe()
+        self.app.processEvents()
+        self.samples["total"].append((time.perf_counter() - started) * 1000.0)
+        self.html_bytes = max(self.html_bytes, len((self.widget._last_html or "").encode("utf-8")))
+        self.renders += 1
+
+    def close(self):
+        self.widget.close_widget()
+        self.widget.deleteLater()
+        self.app.processEvents()
+# ////-----------------------------------------------------------------------------------------
+
+
+def replay(player, events, speed, ticks=True):
+    clock = Clock(speed)
+    next_tick = TICK_INTERVAL
+    rss_samples = []
+    for event in events:
+        t = event.get("t", 0.0)
+        # časovač widgetu medzi udalosťami
+        while ticks and next_tick < t:
+            clock.wait_until(next_tick)
+            if player.renders:
+                player.render(next_tick)
+            next_tick += TICK_INTERVAL
+        clock.wait_until(t)
+        player.handle(event)
+        player.render(t)
+        rss = _rss_kib()
+        if rss:
+            rss_samples.append(rss)
+    return rss_samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded ActiveQuests session and measure rendering.")
+    parser.add_argument("session", help="data/session_<time>.jsonl.gz")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, 10 = 10x faster, 0 = no waiting (default)")
+    parser.add_argument("--widget", action="store_true", help="drive the real QuestWidget (offscreen Qt)")
+    parser.add_argument("--no-ticks", action="store_true", help="render only on recorded events")
+    parser.add_argument("--language", default=None, help="override the recorded language")
+    parser.add_argument("--out", default="replay_session.json")
+    parser.add_argument("--compare", help="previous replay results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    header, events = session_recorder.read_session(args.session)
+    if args.language:
+        for name in ("quest.json", "config.json"):
+            header.setdefault("configs", {}).setdefault(name, {})["language"] = args.language
+    language = (header.get("configs", {}).get("quest.json") or {}).get("language") \
+        or (header.get("configs", {}).get("config.json") or {}).get("language") or "en"
+
+    work_dir = tempfile.mkdtemp(prefix="aq_replay_")
+    tracemalloc.start()
+    try:
+        if args.widget:
+            player = WidgetPlayer(header, work_dir)
+        else:
+            player = HeadlessPlayer(header, bench_render.HeadlessTextSource(language, cache_dir=work_dir))
+        rss_before = _rss_kib()
+        started = time.perf_counter()
+        rss_samples = replay(player, events, args.speed, ticks=not args.no_ticks)
+        elapsed = time.perf_counter() - started
+        player.close()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "session": os.path.basename(args.session),
+        "mode": "widget" if args.widget else "headless",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "speed": args.speed,
+        "events": len(events),
+        "session_seconds": events[-1]["t"] if events else 0,
+        "replay_seconds": round(elapsed, 3),
+        "renders": player.renders,
+        "html_bytes_max": player.html_bytes,
+        "render": {stage: _stats(samples) for stage, samples in player.samples.items()},
+        "memory": {
+            "tracemalloc_peak_kib": peak // 1024,
+            "rss_start_kib": rss_before,
+            "rss_max_kib": max(rss_samples) if rss_samples else None,
+            "rss_end_kib": rss_samples[-1] if rss_samples else None,
+        },
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    total = report["render"]["total"] or {}
+    print(f"[replay] {report['events']} events, {report['renders']} renders in {report['replay_seconds']}s: "
+          f"median {total.get('median_ms')} ms, p95 {total.get('p95_ms')} ms, max {total.get('max_ms')} ms, "
+          f"peak alloc {report['memory']['tracemalloc_peak_kib']} KiB -> {args.out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            before = json.load(f)
+        for stage, now in report["render"].items():
+            old = (before.get("render") or {}).get(stage)
+            if now and old and old.get("median_ms"):
+                a, b = old["median_ms"], now["median_ms"]
+                print(f"  {stage:<6} median {a:9.3f} -> {b:9.3f} ms ({(b - a) / a * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
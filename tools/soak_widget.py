@@ -0,0 +1,309 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Soak test overlayu - rast pamäte počas (simulovaných) hodín behu ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Generuje meniace sa syntetické snapshoty (čas sveta, progres, dokončené / nové questy)
+# a zrýchlene ich prehráva cez rovnaké prehrávače ako tools/replay_session.py:
+#   headless (predvolené) - python/render_core.py bez Qt,
+#   --widget              - skutočný QuestWidget (offscreen Qt, PySide6 + shortcut_manager);
+#                           každých --rebuild-every tickov sa widget zruší a widgets/quest.py
+#                           sa vykoná znovu ako pri prestavbe overlayu v hostiteľovi.
+# Priebežne vzorkuje tracemalloc, RSS, počet objektov (gc / Qt widgety) a sys.modules.
+# Po zahriatí sa berie baseline; ak rast na konci prekročí rozpočet, vypíše top miesta
+# alokácií (tracemalloc compare) a skončí s kódom 1.
+#
+#   python tools/soak_widget.py --hours 8 --budget-kib 2048 --out soak.json
+import os
+import gc
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+import importlib.util
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULE_ROOT = os.path.dirname(TOOLS_DIR)
+TICK_SECONDS = 1.0
+
+
+def _load(name, path):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        spec.loader.exec_module(mod)
+    return mod
+
+replay_session = _load("replay_session", os.path.join(TOOLS_DIR, "replay_session.py"))
+bench_render = sys.modules["active_quests_bench_render"]
+gen_scum_db = sys.modules["active_quests_gen_scum_db"]
+translations = sys.modules["active_quests_translations"]
+
+
+# ////---- Syntetické dáta ----////
+class SnapshotFeed:
+    """Snapshoty ako zo scan slučky: čas beží, progres sa mení, questy sa dokončujú a pribúdajú."""
+
+    def __init__(self, quests, seed=1):
+        self.rng = random.Random(seed)
+        self.templates = gen_scum_db.load_quest_templates(bench_render.TRANSLATE_PATH)
+        self.quests = {q["id"]: q for q in quests}
+        self.next_id = max(self.quests, default=0) + 1
+        self.ts = bench_render.WORLD_TS
+
+    def _new_quest(self):
+        asset_path, items = self.rng.choice(self.templates)
+        blobs = [gen_scum_db.make_blob(self.rng).hex() for _ in range(items)]
+        quest = {
+            "id": self.next_id,
+            "sector": self.rng.choice(gen_scum_db.SECTORS),
+            "completion_deadline": self.ts + self.rng.randint(600, 4 * 86400),
+            "quest_data_asset_path": asset_path,
+            "auto_complete": self.rng.randint(0, 1),
+            "data": blobs[0] if items == 1 else blobs,
+        }
+        self.next_id += 1
+        return quest
+
+    def next(self, seconds):
+        self.ts += seconds
+        changed = []
+        for quest in self.rng.sample(list(self.quests.values()), min(2, len(self.quests))):
+            quest = dict(quest)
+            if isinstance(quest["data"], list):
+                quest["data"] = [gen_scum_db.make_blob(self.rng).hex() for _ in quest["data"]]
+            else:
+                quest["data"] = gen_scum_db.make_blob(self.rng).hex()
+            self.quests[quest["id"]] = quest
+            changed.append(quest)
+        dropped = []
+        # občas quest zmizne (odovzdaný / vypršaný) a pribudne nový s novým id
+        if self.rng.random() < 0.05 or any(q["completion_deadline"] < self.ts for q in self.quests.values()):
+            expired = [q["id"] for q in self.quests.values() if q["completion_deadline"] < self.ts]
+            dropped = expired or [self.rng.choice(list(self.quests))]
+            for quest_id in dropped:
+                del self.quests[quest_id]
+                replacement = self._new_quest()
+                self.quests[replacement["id"]] = replacement
+                changed.append(replacement)
+        return {"kind": "snapshot", "uid": 1, "ts": self.ts, "set": changed, "drop": dropped, "order": list(self.quests)}
+# ////-----------------------------------------------------------------------------------------
+
+
+# ////---- Vzorky pamäte ----////
+def _qt_counts():
+    # iba ak Qt už načítal prehrávač - import PySide6 z harnessu (headless) by bol rast po baseline
+    qt_widgets, qt_core = sys.modules.get("PySide6.QtWidgets"), sys.modules.get("PySide6.QtCore")
+    if qt_widgets is None or qt_core is None:
+        return {}
+    QApplication, QObject = qt_widgets.QApplication, qt_core.QObject
+    app = QApplication.instance()
+    if app is None:
+        return {}
+    return {
+        "qt_widgets": len(QApplication.allWidgets()),
+        "qt_objects": sum(1 for o in gc.get_objects() if isinstance(o, QObject)),
+    }
+
+
+def take_sample(tick, player, filters):
+    """Vzorka pamäte; traced_kib bez alokácií samotného harnessu (rovnako ako rozpočet)."""
+    gc.collect()
+    _current, peak = tracemalloc.get_traced_memory()
+    traced = sum(stat.size for stat in tracemalloc.take_snapshot().filter_traces(filters).statistics("filename"))
+    render = player.samples.get("total") or []
+    sample = {
+        "tick": tick,
+        "hours": round(tick * TICK_SECONDS / 3600.0, 3),
+        "traced_kib": traced // 1024,
+        "traced_peak_kib": peak // 1024,
+        "rss_kib": replay_session._rss_kib(),
+        "gc_objects": len(gc.get_objects()),
+        "modules": len(sys.modules),
+        "render_median_ms": round(statistics.median(render), 3) if render else None,
+    }
+    sample.update(_qt_counts())
+    # okno meraní renderu - zoznamy prehrávača nesmú rásť počas celého testu
+    for samples in player.samples.values():
+        samples.clear()
+    return sample
+
+
+def prime_tracemalloc(filters):
+    """
+    Prvé take_snapshot / statistics / compare_to harnessu dotiahne importy a linecache
+    (alokácie pod importlib, enum, linecache) - bez zahodeného kola by to vyzeralo ako rast po baseline.
+    """
+    snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+    snapshot.statistics("filename")
+    snapshot.compare_to(snapshot, "lineno")
+    del snapshot
+    gc.collect()
+
+
+def slope_per_hour(samples, key):
+    points = [(s["hours"], s[key]) for s in samples if s.get(key) is not None]
+    if len(points) < 3:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in points) / var, 2)
+
+
+def top_growth(baseline, final, limit):
+    stats = final.compare_to(baseline, "lineno")
+    return [{
+        "site": f"{os.path.relpath(s.traceback[0].filename, MODULE_ROOT)}:{s.traceback[0].lineno}",
+        "size_diff_kib": round(s.size_diff / 1024, 1),
+        "count_diff": s.count_diff,
+    } for s in stats[:limit] if s.size_diff > 0]
+# ////-----------------------------------------------------------------------------------------
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak the quest overlay and track memory growth.")
+    parser.add_argument("--hours", type=float, default=2.0, help="simulated hours (1 widget tick = 1 s)")
+    parser.add_argument("--quests", type=int, default=30)
+    parser.add_argument("--refresh-interval", type=int, default=4, help="ticks between new snapshots (widget refresh_interval)")
+    parser.add_argument("--sample-every", type=int, default=600, help="ticks between memory samples")
+    parser.add_argument("--warmup", type=float, default=0.1, help="share of the run before the baseline is taken")
+    parser.add_argument("--translation-reload-every", type=int, default=3600, help="ticks between translate.json changes (0 = off)")
+    parser.add_argument("--widget", action="store_true", help="drive the real QuestWidget (offscreen Qt)")
+    parser.add_argument("--rebuild-every", type=int, default=1800, help="widget mode: ticks between overlay rebuilds (0 = off)")
+    parser.add_argument("--budget-kib", type=int, default=2048, help="allowed tracemalloc growth after warmup")
+    parser.add_argument("--rss-budget-kib", type=int, default=32768, help="allowed RSS growth after warmup")
+    parser.add_argument("--qt-budget", type=int, default=0, help="allowed growth of live Qt widgets after warmup")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--frames", type=int, default=1, help="tracemalloc frames per allocation (more = slower)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="soak_widget.json")
+    args = parser.parse_args(argv)
+
+    with open(bench_render.CONFIG_PATH, "r", encoding="utf-8") as f:
+        quest_cfg = json.load(f)
+    header = {"configs": {"quest.json": quest_cfg, "config.json": {"language": "en"}}}
+    feed = SnapshotFeed(bench_render.build_quests(args.quests, "mixed", args.seed), args.seed)
+    total_ticks = int(args.hours * 3600 / TICK_SECONDS)
+    baseline_tick = int(total_ticks * args.warmup)
+
+    work_dir = tempfile.mkdtemp(prefix="aq_soak_")
+    translate_json = os.path.join(work_dir, "translate.json")
+    shutil.copy(bench_render.TRANSLATE_PATH, translate_json)
+
+    tracemalloc.start(args.frames)
+    # meracie zoznamy harnessu nie sú únik v module
+    harness_filters = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, replay_session.__file__),
+                       tracemalloc.Filter(False, tracemalloc.__file__)]
+    samples, rebuilds, reloads = [], 0, 0
+    baseline_snapshot = baseline_sample = None
+    started = time.perf_counter()
+    try:
+        if args.widget:
+            player = replay_session.WidgetPlayer(header, work_dir)
+            translate_json = os.path.join(work_dir, "data", "translate.json")
+            provider = player.widget._translations
+        else:
+            source = bench_render.HeadlessTextSource("en", cache_dir=work_dir)
+            player = replay_session.HeadlessPlayer(header, source)
+            # headless zdroj používa rovnaký provider ako widget, nad kópiou translate.json
+            provider = translations.TranslationProvider(translate_json, os.path.join(work_dir, "translate"))
+            source.get_cached_translations = lambda: provider.quests("en")
+            provider.wait("en", timeout=60)
+
+        player.handle(dict(feed.next(0), t=0.0))
+        prime_tracemalloc(harness_filters)
+        for tick in range(1, total_ticks + 1):
+            t = tick * TICK_SECONDS
+            if tick % args.refresh_interval == 0:
+                player.handle(dict(feed.next(args.refresh_interval * TICK_SECONDS), t=t))
+            if args.translation_reload_every and tick % args.translation_reload_every == 0:
+                # zmena translate.json -> provider prestaví balíček na pozadí
+                os.utime(translate_json, ns=(time.time_ns(), time.time_ns()))
+                provider.quests("en")
+                reloads += 1
+            if args.widget and args.rebuild_every and tick % args.rebuild_every == 0:
+                player.rebuild(reexec=True)
+                rebuilds += 1
+            player.render(t)
+
+            if tick == baseline_tick or tick % args.sample_every == 0 or tick == total_ticks:
+                is_baseline = tick == baseline_tick or baseline_snapshot is None
+                if is_baseline:
+                    # baseline snapshot ostáva v pamäti do konca - RSS baseline sa meria až s ním
+                    # (predbežný baseline z vzorky pred koncom zahriatia sa najprv uvoľní)
+                    baseline_snapshot = None
+                    gc.collect()
+                    baseline_snapshot = tracemalloc.take_snapshot().filter_traces(harness_filters)
+                sample = take_sample(tick, player, harness_filters)
+                samples.append(sample)
+                if is_baseline:
+                    baseline_sample = sample
+                print(f"[soak] {sample['hours']:7.2f} h  traced {sample['traced_kib']:>7} KiB  rss {sample['rss_kib']} KiB  "
+                      f"objects {sample['gc_objects']:>8}  render {sample['render_median_ms']} ms"
+                      + (f"  qt widgets {sample.get('qt_widgets')}" if args.widget else ""))
+        provider.wait("en", timeout=60)
+        final_sample = take_sample(total_ticks, player, harness_filters)
+        final_snapshot = tracemalloc.take_snapshot().filter_traces(harness_filters)
+        player.close()
+    finally:
+        tracemalloc.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    traced_growth = sum(s.size_diff for s in final_snapshot.compare_to(baseline_snapshot, "filename")) // 1024
+    rss_growth = (final_sample["rss_kib"] - baseline_sample["rss_kib"]) if final_sample["rss_kib"] and baseline_sample["rss_kib"] else None
+    qt_growth = (final_sample.get("qt_widgets", 0) - baseline_sample.get("qt_widgets", 0)) if args.widget else None
+    failures = []
+    if traced_growth > args.budget_kib:
+        failures.append(f"tracemalloc growth {traced_growth} KiB > {args.budget_kib} KiB")
+    if rss_growth is not None and rss_growth > args.rss_budget_kib:
+        failures.append(f"RSS growth {rss_growth} KiB > {args.rss_budget_kib} KiB")
+    if qt_growth is not None and qt_growth > args.qt_budget:
+        failures.append(f"live Qt widgets grew by {qt_growth} > {args.qt_budget}")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "mode": "widget" if args.widget else "headless",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {k: v for k, v in vars(args).items() if k != "out"},
+        "ticks": total_ticks,
+        "wall_seconds": round(time.perf_counter() - started, 1),
+        "rebuilds": rebuilds,
+        "translation_reloads": reloads,
+        "growth": {
+            "traced_kib": traced_growth,
+            "rss_kib": rss_growth,
+            "qt_widgets": qt_growth,
+            "traced_kib_per_hour": slope_per_hour([s for s in samples if s["tick"] >= baseline_tick], "traced_kib"),
+            "rss_kib_per_hour": slope_per_hour([s for s in samples if s["tick"] >= baseline_tick], "rss_kib"),
+        },
+        "failures": failures,
+        "top_allocations": top_growth(baseline_snapshot, final_snapshot, args.top),
+        "samples": samples,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"[soak] growth after warmup: traced {traced_growth} KiB, rss {rss_growth} KiB"
+          + (f", qt widgets {qt_growth}" if args.widget else "") + f" -> {args.out}")
+    if failures:
+        print("[soak] FAILED: " + "; ".join(failures))
+        print("[soak] top allocation sites since baseline:")
+        for site in report["top_allocations"]:
+            print(f"  {site['size_diff_kib']:>9} KiB  {site['count_diff']:>+7}  {site['site']}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
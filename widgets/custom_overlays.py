@@ -7,14 +7,17 @@
 # ////---- Importovanie potrebných knižníc ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
 import os
+import sys
 import json
+import copy
+import time
 import importlib.util
 import glob
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QLabel, QListWidget, QListWidgetItem,
     QHBoxLayout, QSpinBox, QMessageBox, QApplication, QColorDialog, QLineEdit
 )
-from PySide6.QtCore import Qt, QEvent
+from PySide6.QtCore import Qt, QEvent, QTimer
 from PySide6.QtGui import QPixmap, QPalette, QColor
 import overlay_manager
 from shortcut_manager import get_bridge
@@ -22,6 +25,28 @@ from shortcut_manager import get_bridge
 DEAD_KEYS = {"ˇ", "´", "`", "^", "˚", "¨", "¸", "~"}
 INVALID_CHARS = {"?", "_", "ˇ"}
 
+MODULE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ////---- Zdieľané moduly z python/ (jedna inštancia pre celý proces) ----////
+def _load_shared(name):
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        path = os.path.join(MODULE_ROOT, "python", f"{name}.py")
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        try:
+            spec.loader.exec_module(mod)
+        except Exception:
+            sys.modules.pop(key, None)
+            raise
+    return mod
+
+shortcut_registry = _load_shared("shortcut_registry")
+json_store = _load_shared("json_store")
+# ////-----------------------------------------------------------------------------------------
+
 # /////////////////////////////////////////////////////////////////////////////////////////////
 # ////---- Pomocné funkcie ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
@@ -72,54 +97,279 @@ def get_default_overlay_params():
         "widgets": [],
         "widget_bgs": {},
         "user_visible": True,
-        "shortcut": ""
+        "shortcut": "",
+        "idle_unload": 0
     }
 # ////-----------------------------------------------------------------------------------------
 
+# ////---- Pamäťový register overlayov s odloženým zápisom ----////
+# Register je autoritatívny zdroj konfigurácie overlayov. Zmeny sa zapisujú do
+# custom_overlays.json s oneskorením (ťahanie RGBA spinboxu = jeden zápis) a externé
+# úpravy súboru sa pri poll() zlúčia a ohlásia odberateľom.
+OVERLAY_SAVE_DEBOUNCE = 0.75
+
+class OverlayRegistry:
+    def __init__(self, module_name):
+        self.module_name = module_name
+        self.store = json_store.JsonStore(get_config_path(module_name), debounce=OVERLAY_SAVE_DEBOUNCE)
+        self.overlays = self.store.load()
+        self._listeners = []
+        # stav store pri poslednej synchronizácii (základ pre zlúčenie externých zmien)
+        self._synced = copy.deepcopy(self.overlays)
+        self._external_seen = self.store.external
+        self._pending = set()
+
+    def subscribe(self, callback):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _absorb_external(self):
+        """
+        Premietne do overlays externé zmeny, ktoré store zlúčil (poll alebo zápis na pozadí
+        pred flushom). Lokálne neuložené úpravy ostávajú - trojcestne voči _synced.
+        """
+        external = self.store.external
+        if external == self._external_seen:
+            return set()
+        self._external_seen = external
+        disk = self.store.snapshot()
+        merged = json_store.merge_external(self._synced, self.overlays, disk)
+        self._synced = disk
+        changed = set()
+        for cname in list(self.overlays.keys()):
+            if cname not in merged:
+                del self.overlays[cname]
+                changed.add(cname)
+        for cname, params in merged.items():
+            current = self.overlays.get(cname)
+            if current == params:
+                continue
+            changed.add(cname)
+            if isinstance(current, dict) and isinstance(params, dict):
+                # in-place, aby ostali platné referencie na params (lenivé overlaye)
+                current.clear()
+                current.update(params)
+            else:
+                self.overlays[cname] = params
+        return changed
+
+    def save(self):
+        """Odovzdá aktuálny stav do store - na disk sa zapíše po debounce."""
+        # externé zmeny zlúčené na pozadí sa nesmú prepísať; poslucháči sa dozvedia pri poll()
+        self._pending |= self._absorb_external()
+        self.store.replace(self.overlays)
+        self._synced = copy.deepcopy(self.overlays)
+
+    def flush(self):
+        self.save()
+        self.store.flush()
+
+    def poll(self):
+        """Zlúči externé úpravy súboru; vráti množinu zmenených overlayov."""
+        self.store.poll()
+        changed = self._pending | self._absorb_external()
+        self._pending = set()
+        if changed:
+            for callback in list(self._listeners):
+                try:
+                    callback(changed)
+                except Exception as e:
+                    print(f"[CustomOverlays] Registry listener error: {e}")
+        return changed
+
+_OVERLAY_REGISTRIES = {}
+
+def get_overlay_registry(module_name):
+    registry = _OVERLAY_REGISTRIES.get(module_name)
+    if registry is None:
+        registry = OverlayRegistry(module_name)
+        _OVERLAY_REGISTRIES[module_name] = registry
+    return registry
+
 # ////---- Načítanie a uloženie vlastných overlayov ----////
 def load_custom_overlays(module_name):
-    path = get_config_path(module_name)
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+    return get_overlay_registry(module_name).overlays
 
 def save_custom_overlays(module_name, data):
-    path = get_config_path(module_name)
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    registry = get_overlay_registry(module_name)
+    if data is not registry.overlays:
+        registry.overlays.clear()
+        registry.overlays.update(data)
+    registry.save()
 # ////-----------------------------------------------------------------------------------------
 
-# ////---- Načítanie widgetu podľa názvu ----////
-def load_widget(widget_name, BaseClass, module_name):
-    widget_path = os.path.join("modules", module_name, "widgets", f"{widget_name}.py")
-    if not os.path.exists(widget_path):
-        print(f"Widget {widget_name} for module {module_name} does not exist.")
+# ////---- Cache modulov widgetov (kľúč = cesta, platnosť = mtime) ----////
+# widget_path -> (mtime_ns, module). Modul sa vykoná iba raz; pri zmene súboru sa
+# znova načíta (hot-reload) a staré inštancie v poole sa zahodia.
+_WIDGET_MODULES = {}
+
+# (module_name, widget_name) -> [(mtime_ns, widget), ...] - odložené inštancie na znovupoužitie
+_WIDGET_POOL = {}
+WIDGET_POOL_LIMIT = 2
+
+def _widget_path(widget_name, module_name):
+    return os.path.join("modules", module_name, "widgets", f"{widget_name}.py")
+
+def _widget_mtime(widget_path):
+    try:
+        return os.stat(widget_path).st_mtime_ns
+    except OSError:
         return None
 
+def load_widget_module(widget_name, module_name):
+    widget_path = _widget_path(widget_name, module_name)
+    mtime = _widget_mtime(widget_path)
+    if mtime is None:
+        _WIDGET_MODULES.pop(os.path.abspath(widget_path), None)
+        return None, None
+
+    key = os.path.abspath(widget_path)
+    cached = _WIDGET_MODULES.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1], mtime
+
     spec = importlib.util.spec_from_file_location(widget_name, widget_path)
     mod = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(mod)
+    if cached:
+        print(f"[CustomOverlays] Reloaded widget module {widget_name} (file changed)")
+    _WIDGET_MODULES[key] = (mtime, mod)
+    return mod, mtime
+
+# ////---- Načítanie widgetu podľa názvu ----////
+def load_widget(widget_name, BaseClass, module_name):
+    mod, _mtime = load_widget_module(widget_name, module_name)
+    if mod is None:
+        print(f"Widget {widget_name} for module {module_name} does not exist.")
+        return None
 
     if hasattr(mod, "create_widget"):
         return mod.create_widget(BaseClass, module_name)
     return None
 # ////-----------------------------------------------------------------------------------------
 
-# ////---- Vytvorenie overlay okna ----////
-def build_overlay_window(name, params, BaseClass, module_name, parent_widget):
-    # create overlay root widget
-    overlay_widget = QWidget()
-    vbox = QVBoxLayout(overlay_widget)
-    overlay_widget.setStyleSheet(f"background-color: {params.get('bg','rgba(0,0,0,0)')}; border: none;")
+# ////---- Služby widgetov na pozadí (start_background / stop_background) ----////
+# Widget modul môže definovať start_background(module_name) a stop_background(module_name).
+# Služba beží, kým widget obsahuje aspoň jeden overlay - aj skrytý bez vytvorených widgetov.
+# module_name -> set(widget_name) so spustenou službou
+_WIDGET_BACKGROUNDS = {}
+
+def _call_background_hook(widget_name, module_name, hook_name):
+    try:
+        mod, _mtime = load_widget_module(widget_name, module_name)
+        hook = getattr(mod, hook_name, None)
+        if callable(hook):
+            hook(module_name)
+    except Exception as e:
+        print(f"[CustomOverlays] {hook_name} failed for widget {widget_name}: {e}")
+
+def sync_widget_backgrounds(module_name, overlays):
+    """Spustí služby widgetov použitých v overlays a zastaví služby tých, ktoré už nie sú."""
+    wanted = {w for params in overlays.values() for w in params.get("widgets", [])}
+    running = _WIDGET_BACKGROUNDS.setdefault(module_name, set())
+    for widget_name in sorted(wanted - running):
+        _call_background_hook(widget_name, module_name, "start_background")
+        running.add(widget_name)
+    for widget_name in sorted(running - wanted):
+        _call_background_hook(widget_name, module_name, "stop_background")
+        running.discard(widget_name)
+# ////-----------------------------------------------------------------------------------------
+
+# Ako často sa kontrolujú skryté overlaye na uvoľnenie (idle_unload)
+IDLE_CHECK_INTERVAL_MS = 5000
+# Ako často sa kontroluje externá úprava custom_overlays.json
+REGISTRY_POLL_INTERVAL_MS = 1000
+
+# ////---- Pool inštancií widgetov pre prestavbu overlayov ----////
+def _close_child_widget(w):
+    try:
+        if hasattr(w, "close_widget") and callable(w.close_widget):
+            w.close_widget()
+        elif hasattr(w, "cleanup") and callable(w.cleanup):
+            w.cleanup()
+    except Exception:
+        pass
+    try:
+        w.deleteLater()
+    except Exception:
+        pass
+
+def acquire_widget(widget_name, BaseClass, module_name):
+    """Vráti inštanciu widgetu z poolu (ak je z aktuálnej verzie modulu), inak vytvorí novú."""
+    current_mtime = _widget_mtime(_widget_path(widget_name, module_name))
+    pooled = _WIDGET_POOL.get((module_name, widget_name), [])
+    while pooled:
+        mtime, w = pooled.pop()
+        if mtime != current_mtime:
+            _close_child_widget(w)
+            continue
+        try:
+            if hasattr(w, "resume_widget") and callable(w.resume_widget):
+                w.resume_widget()
+        except Exception:
+            pass
+        return w
+    return load_widget(widget_name, BaseClass, module_name)
+
+def release_widget(widget_name, module_name, w):
+    """Odloží inštanciu widgetu do poolu namiesto zničenia (pozastaví jej časovače)."""
+    key = (module_name, widget_name)
+    pooled = _WIDGET_POOL.setdefault(key, [])
+    mtime = _widget_mtime(_widget_path(widget_name, module_name))
+    if mtime is None or len(pooled) >= WIDGET_POOL_LIMIT:
+        _close_child_widget(w)
+        return
+    try:
+        if hasattr(w, "suspend_widget") and callable(w.suspend_widget):
+            w.suspend_widget()
+        w.hide()
+        w.setParent(None)
+    except Exception:
+        _close_child_widget(w)
+        return
+    pooled.append((mtime, w))
+
+def release_overlay_widgets(win, pool=True):
+    """Vyberie widgety z overlay okna pred jeho odstránením - do poolu alebo ich zatvorí."""
+    root = getattr(win, "_overlay_root", None)
+    widgets = getattr(root, "_overlay_widgets", None) if root is not None else None
+    if widgets is None:
+        # overlay bez evidencie widgetov - starý spôsob cleanupu
+        try:
+            for child in win.findChildren(QWidget):
+                if hasattr(child, "close_widget") or hasattr(child, "cleanup"):
+                    _close_child_widget(child)
+        except Exception:
+            pass
+        return
+    for widget_name, w in list(widgets.items()):
+        if pool:
+            release_widget(widget_name, root._overlay_module, w)
+        else:
+            _close_child_widget(w)
+    widgets.clear()
+
+def clear_widget_pool():
+    for pooled in _WIDGET_POOL.values():
+        for _mtime, w in pooled:
+            _close_child_widget(w)
+    _WIDGET_POOL.clear()
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Naplnenie overlay okna widgetmi ----////
+def populate_overlay_root(overlay_widget, params, BaseClass, module_name):
+    vbox = overlay_widget.layout()
+    overlay_widget._overlay_widgets = {}
+    saved_state = getattr(overlay_widget, "_saved_state", None) or {}
 
     for widget_name in params.get("widgets", []):
-        w = load_widget(widget_name, BaseClass, module_name)
+        w = acquire_widget(widget_name, BaseClass, module_name)
         if w:
+            overlay_widget._overlay_widgets[widget_name] = w
             try:
                 w.setObjectName(widget_name)
             except Exception:
@@ -132,7 +382,79 @@ def build_overlay_window(name, params, BaseClass, module_name, parent_widget):
                     w.setStyleSheet(f"background-color: {bg}; border: none;")
             except Exception:
                 pass
+            # obnov stav z predchádzajúcej inštancie (stránka a pod.)
+            if widget_name in saved_state and hasattr(w, "set_widget_state"):
+                try:
+                    w.set_widget_state(saved_state[widget_name])
+                except Exception:
+                    pass
             vbox.addWidget(w)
+            # widget z poolu bol explicitne skrytý (release_widget) - po zmene rodiča ostáva skrytý
+            w.show()
+
+    overlay_widget._saved_state = {}
+    overlay_widget._overlay_pending = False
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Lenivé vytvorenie a uvoľnenie skrytých overlayov ----////
+def ensure_overlay_populated(win):
+    """Skrytý overlay je v manageri iba ako prázdny placeholder - widgety vytvor pri prvom zobrazení."""
+    root = getattr(win, "_overlay_root", None)
+    if root is None or not getattr(root, "_overlay_pending", False):
+        return False
+    BaseClass, params = root._overlay_factory
+    populate_overlay_root(root, params, BaseClass, root._overlay_module)
+    win._hidden_since = None
+    return True
+
+def teardown_overlay(win):
+    """Zničí widgety dlho skrytého overlayu, ich stav si odloží pre ďalšie zobrazenie."""
+    root = getattr(win, "_overlay_root", None)
+    if root is None or getattr(root, "_overlay_pending", False):
+        return False
+    saved_state = {}
+    for widget_name, w in list(getattr(root, "_overlay_widgets", {}).items()):
+        if hasattr(w, "get_widget_state"):
+            try:
+                saved_state[widget_name] = w.get_widget_state()
+            except Exception:
+                pass
+    release_overlay_widgets(win, pool=False)
+    root._saved_state = saved_state
+    root._overlay_pending = True
+    return True
+
+def set_overlay_user_visible(win, state, mgr):
+    if state:
+        ensure_overlay_populated(win)
+        win._hidden_since = None
+    else:
+        win._hidden_since = time.monotonic()
+    win.user_visible = state
+    try:
+        win.set_overlay_visible(state and mgr.global_show)
+    except Exception:
+        try:
+            win.setVisible(state and mgr.global_show)
+        except Exception:
+            pass
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Vytvorenie overlay okna ----////
+def build_overlay_window(name, params, BaseClass, module_name, parent_widget):
+    # create overlay root widget
+    overlay_widget = QWidget()
+    QVBoxLayout(overlay_widget)
+    overlay_widget.setStyleSheet(f"background-color: {params.get('bg','rgba(0,0,0,0)')}; border: none;")
+    overlay_widget._overlay_widgets = {}
+    overlay_widget._overlay_factory = (BaseClass, params)
+    overlay_widget._overlay_module = module_name
+
+    # skrytý overlay = iba placeholder, widgety sa vytvoria pri prvom zobrazení
+    if params.get("user_visible", True):
+        populate_overlay_root(overlay_widget, params, BaseClass, module_name)
+    else:
+        overlay_widget._overlay_pending = True
 
     mgr = overlay_manager.start_overlay_manager()
     full_name = f"{module_name}:{name}"
@@ -157,6 +479,7 @@ def build_overlay_window(name, params, BaseClass, module_name, parent_widget):
     win = mgr.overlays.get(full_name)
     if win is not None:
         win.user_visible = params.get("user_visible", True)
+        win._hidden_since = None if win.user_visible else time.monotonic()
         try:
             win.set_overlay_visible(win.user_visible and mgr.global_show)
         except Exception:
@@ -213,8 +536,10 @@ def create_widget(BaseClass, module_name):
 
             # Bridge and handler datastore
             self.bridge = get_bridge()
-            # maps normalized combo string -> handler callable
-            self._bridge_handlers = {}
+            # normalized combo -> overlay full_name, registers only changed bindings
+            self._shortcuts = shortcut_registry.ShortcutRegistry(
+                self.bridge, lambda full_name, _combo: self._on_shortcut_for_overlay(full_name),
+                owner="CustomOverlays")
             # maps overlay cname -> full_name in overlay_manager
             self._overlay_fullnames = {}
 
@@ -319,6 +644,10 @@ def create_widget(BaseClass, module_name):
             btn_create.clicked.connect(self.create_overlay)
             layout.addWidget(btn_create)
 
+            btn_apply = QPushButton("Apply widgets to selected overlay")
+            btn_apply.clicked.connect(self.apply_widgets_to_selected_overlay)
+            layout.addWidget(btn_apply)
+
             btn_delete = QPushButton("Delete selected overlay")
             btn_delete.clicked.connect(self.delete_selected_overlay)
             layout.addWidget(btn_delete)
@@ -331,58 +660,47 @@ def create_widget(BaseClass, module_name):
             layout.addWidget(QLabel("Edit mode: left mouse drag to move, right mouse drag to resize"))
 
             self.selected_overlay = None
-            self.custom_overlays = load_custom_overlays(module_name)
+            self._registry = get_overlay_registry(module_name)
+            self.custom_overlays = self._registry.overlays
 
             # build existing overlays and remember fullnames
             mgr = overlay_manager.start_overlay_manager()
             for cname, params in self.custom_overlays.items():
                 overlay_root, full_name = build_overlay_window(cname, params, BaseClass, module_name, self)
                 self._overlay_fullnames[cname] = full_name
+            sync_widget_backgrounds(module_name, self.custom_overlays)
 
             # register shortcuts based on JSON
             self._register_shortcuts()
 
+            # periodické uvoľňovanie dlho skrytých overlayov (params "idle_unload" v sekundách)
+            self._idle_timer = QTimer(self)
+            self._idle_timer.setInterval(IDLE_CHECK_INTERVAL_MS)
+            self._idle_timer.timeout.connect(self._unload_idle_overlays)
+            self._idle_timer.start()
+
+            # sledovanie externých úprav custom_overlays.json
+            self._registry.subscribe(self._on_registry_changed)
+            self._registry_timer = QTimer(self)
+            self._registry_timer.setInterval(REGISTRY_POLL_INTERVAL_MS)
+            self._registry_timer.timeout.connect(self._registry.poll)
+            self._registry_timer.start()
+
             # populate UI list
             self.refresh_overlay_list()
 
         # ----- Shortcut management -----
         def _normalize_combo(self, combo: str) -> str:
-            if not combo:
-                return ""
-            return combo.replace(" ", "").lower()
+            return shortcut_registry.normalize_combo(combo)
 
         def _register_shortcuts(self):
-            # unregister old handlers
-            try:
-                for combo_norm, handler in list(self._bridge_handlers.items()):
-                    try:
-                        self.bridge.off(f"shortcut.{combo_norm}", handler)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-            self._bridge_handlers.clear()
-
-            # read fresh from JSON (self.custom_overlays should already be current but read to be safe)
-            overlays_cfg = load_custom_overlays(self.module_name)
-            self.custom_overlays = overlays_cfg
-
-            for cname, params in overlays_cfg.items():
+            # diff against current bindings - unchanged shortcuts stay registered
+            mapping = {}
+            for cname, params in self.custom_overlays.items():
                 combo = params.get("shortcut", "")
-                combo_norm = self._normalize_combo(combo)
-                if not combo_norm:
-                    continue
-                # create zero-arg handler that toggles the specific overlay
-                def make_handler(fullname):
-                    return lambda: self._on_shortcut_for_overlay(fullname)
-                full_name = f"{self.module_name}:{cname}"
-                handler = make_handler(full_name)
-                event_name = f"shortcut.{combo_norm}"
-                try:
-                    self.bridge.on(event_name, handler)
-                    self._bridge_handlers[combo_norm] = handler
-                except Exception:
-                    pass
+                if combo:
+                    mapping[f"{self.module_name}:{cname}"] = combo
+            self._shortcuts.sync(mapping)
 
         def _on_shortcut_for_overlay(self, full_name: str):
             """Called in main thread by QtBridge when a shortcut is triggered."""
@@ -392,25 +710,12 @@ def create_widget(BaseClass, module_name):
                 # overlay not present (maybe deleted) - nothing to do
                 return
             new_state = not getattr(win, 'user_visible', True)
-            win.user_visible = new_state
-            try:
-                win.set_overlay_visible(new_state and mgr.global_show)
-            except Exception:
-                try:
-                    win.setVisible(new_state and mgr.global_show)
-                except Exception:
-                    pass
-            # update JSON persistently
+            set_overlay_user_visible(win, new_state, mgr)
+            # update registry (written to JSON after debounce)
             module_name, cname = full_name.split(":", 1)
-            try:
-                cfg = load_custom_overlays(module_name)
-                if cname in cfg:
-                    cfg[cname]['user_visible'] = new_state
-                    save_custom_overlays(module_name, cfg)
-                    # update in-memory copy
-                    self.custom_overlays = cfg
-            except Exception:
-                pass
+            if cname in self.custom_overlays:
+                self.custom_overlays[cname]['user_visible'] = new_state
+                self._registry.save()
             # refresh UI
             self.refresh_overlay_list()
 
@@ -507,7 +812,6 @@ def create_widget(BaseClass, module_name):
         def refresh_overlay_list(self):
             self.overlay_list.clear()
             mgr = overlay_manager.start_overlay_manager()
-            self.custom_overlays = load_custom_overlays(self.module_name)
             for cname, params in self.custom_overlays.items():
                 name = f"{self.module_name}:{cname}"
                 if name in mgr.overlays:
@@ -547,6 +851,7 @@ def create_widget(BaseClass, module_name):
             if full_name not in mgr.overlays:
                 overlay_root, fullname = build_overlay_window(name, params, BaseClass, self.module_name, self)
                 self._overlay_fullnames[name] = fullname
+            sync_widget_backgrounds(self.module_name, self.custom_overlays)
             # re-register shortcuts because new overlay might have shortcut
             self._register_shortcuts()
 
@@ -596,6 +901,7 @@ def create_widget(BaseClass, module_name):
             # vyčisti mapovanie
             if self.selected_overlay in self._overlay_fullnames:
                 del self._overlay_fullnames[self.selected_overlay]
+            sync_widget_backgrounds(self.module_name, self.custom_overlays)
 
             # odregistrovať všetky skratky z bridge
             self._register_shortcuts()
@@ -603,6 +909,106 @@ def create_widget(BaseClass, module_name):
             # obnoviť UI
             self.refresh_overlay_list()
 
+        def _on_registry_changed(self, changed):
+            """custom_overlays.json bol upravený externe - premietni zmeny do overlay okien."""
+            mgr = overlay_manager.start_overlay_manager()
+            for cname in changed:
+                full_name = f"{self.module_name}:{cname}"
+                win = mgr.overlays.get(full_name)
+                params = self.custom_overlays.get(cname)
+                if params is None:
+                    if win is not None:
+                        release_overlay_widgets(win, pool=False)
+                        mgr.remove_overlay(full_name)
+                    self._overlay_fullnames.pop(cname, None)
+                    continue
+                if win is None:
+                    overlay_root, fullname = build_overlay_window(cname, params, BaseClass, self.module_name, self)
+                    self._overlay_fullnames[cname] = fullname
+                    continue
+                root = getattr(win, "_overlay_root", None)
+                built = list(getattr(root, "_overlay_widgets", {}).keys()) if root is not None else []
+                if root is not None and not getattr(root, "_overlay_pending", False) and built != params.get("widgets", []):
+                    self.rebuild_overlay(cname)
+                    continue
+                if getattr(win, "user_visible", True) != params.get("user_visible", True):
+                    set_overlay_user_visible(win, params.get("user_visible", True), mgr)
+                bg = params.get("bg", "rgba(0,0,0,0)")
+                try:
+                    win.params['bg'] = bg
+                    if root is not None:
+                        root.setStyleSheet(f"background-color: {bg}; border: none;")
+                except Exception:
+                    pass
+            sync_widget_backgrounds(self.module_name, self.custom_overlays)
+            self._register_shortcuts()
+            self.refresh_overlay_list()
+            if self.selected_overlay in changed:
+                self.refresh_widget_list_from_json(self.selected_overlay)
+
+        def _unload_idle_overlays(self):
+            mgr = overlay_manager.start_overlay_manager()
+            now = time.monotonic()
+            for cname, params in self.custom_overlays.items():
+                idle_unload = params.get("idle_unload", 0) or 0
+                if idle_unload <= 0:
+                    continue
+                win = mgr.overlays.get(f"{self.module_name}:{cname}")
+                if win is None or getattr(win, "user_visible", True):
+                    continue
+                hidden_since = getattr(win, "_hidden_since", None)
+                if hidden_since is not None and now - hidden_since >= idle_unload:
+                    if teardown_overlay(win):
+                        print(f"[CustomOverlays] Unloaded widgets of hidden overlay {cname}")
+
+        def apply_widgets_to_selected_overlay(self):
+            # zaškrtnuté widgety sa do vybraného overlayu zapíšu až tlačidlom - samotné
+            # zaškrtávanie ostáva výberom pre "Create new overlay" (aj podľa existujúceho overlayu)
+            if not self.selected_overlay:
+                return
+            params = self.custom_overlays.get(self.selected_overlay)
+            if params is None:
+                return
+            widgets = []
+            for i in range(self.widget_list.count()):
+                it = self.widget_list.item(i)
+                if it.checkState() == Qt.Checked:
+                    widgets.append(it.data(Qt.UserRole))
+            if not widgets:
+                QMessageBox.warning(self, "Error", "Select at least one widget!")
+                return
+            if widgets == params.get("widgets", []):
+                return
+            params["widgets"] = widgets
+            widget_bgs = params.setdefault("widget_bgs", {})
+            for w in widgets:
+                widget_bgs.setdefault(w, self.get_widget_bg(w))
+            save_custom_overlays(self.module_name, self.custom_overlays)
+            self.rebuild_overlay(self.selected_overlay)
+            sync_widget_backgrounds(self.module_name, self.custom_overlays)
+
+        def rebuild_overlay(self, cname):
+            """Prestavia overlay po zmene konfigurácie - widgety sa znovupoužijú z poolu."""
+            params = self.custom_overlays.get(cname)
+            if params is None:
+                return
+            mgr = overlay_manager.start_overlay_manager()
+            full_name = f"{self.module_name}:{cname}"
+            win = mgr.overlays.get(full_name)
+            if win is not None:
+                # zachovaj aktuálnu pozíciu, veľkosť a viditeľnosť okna
+                try:
+                    geo = win.geometry()
+                    params.update({"x": geo.x(), "y": geo.y(), "w": geo.width(), "h": geo.height()})
+                except Exception:
+                    pass
+                params["user_visible"] = getattr(win, "user_visible", params.get("user_visible", True))
+                self._registry.save()
+                release_overlay_widgets(win, pool=True)
+                mgr.remove_overlay(full_name)
+            overlay_root, fullname = build_overlay_window(cname, params, BaseClass, self.module_name, self)
+            self._overlay_fullnames[cname] = fullname
+
         def toggle_selected_overlay(self):
             items = self.overlay_list.selectedItems()
             if not items:
@@ -610,18 +1016,16 @@ def create_widget(BaseClass, module_name):
             cname = items[0].data(Qt.UserRole)
             mgr = overlay_manager.start_overlay_manager()
             full_name = f"{self.module_name}:{cname}"
+            new_state = None
             if full_name in mgr.overlays:
                 win = mgr.overlays[full_name]
                 new_state = not getattr(win, 'user_visible', True)
-                win.user_visible = new_state
-                try:
-                    win.set_overlay_visible(new_state and mgr.global_show)
-                except Exception:
-                    win.setVisible(new_state and mgr.global_show)
-            self.custom_overlays = load_custom_overlays(self.module_name)
+                set_overlay_user_visible(win, new_state, mgr)
             if cname in self.custom_overlays:
-                self.custom_overlays[cname]['user_visible'] = not self.custom_overlays[cname].get('user_visible', True)
-                save_custom_overlays(self.module_name, self.custom_overlays)
+                if new_state is None:
+                    new_state = not self.custom_overlays[cname].get('user_visible', True)
+                self.custom_overlays[cname]['user_visible'] = new_state
+                self._registry.save()
             self.refresh_overlay_list()
 
         def update_widget_bg(self, widget_name):
@@ -714,11 +1118,7 @@ def create_widget(BaseClass, module_name):
                 if full_name in mgr.overlays:
                     win = mgr.overlays[full_name]
                     new_state = not getattr(win, "user_visible", True)
-                    win.user_visible = new_state
-                    try:
-                        win.set_overlay_visible(new_state and mgr.global_show)
-                    except Exception:
-                        win.setVisible(new_state and mgr.global_show)
+                    set_overlay_user_visible(win, new_state, mgr)
 
                 if cname in self.custom_overlays:
                     self.custom_overlays[cname]['user_visible'] = not self.custom_overlays[cname].get('user_visible', True)
@@ -727,16 +1127,19 @@ def create_widget(BaseClass, module_name):
                 self.refresh_overlay_list()
 
         def close_widget(self):
+            try:
+                self._idle_timer.stop()
+                self._registry_timer.stop()
+                self._registry.unsubscribe(self._on_registry_changed)
+                self._registry.flush()
+            except Exception:
+                pass
+            sync_widget_backgrounds(self.module_name, {})
             # cleanup handlers
             try:
-                for combo_norm, handler in list(self._bridge_handlers.items()):
-                    try:
-                        self.bridge.off(f"shortcut.{combo_norm}", handler)
-                    except Exception:
-                        pass
+                self._shortcuts.clear()
             except Exception:
                 pass
-            self._bridge_handlers.clear()
 
         def showEvent(self, event):
             super().showEvent(event)
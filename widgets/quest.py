@@ -4,17 +4,48 @@
 
 import os
 import json
-import html
-import re
-import copy
 import time
+import sys
+import importlib.util
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QTextBrowser, QSizePolicy, QApplication
 from PySide6.QtCore import Qt, QTimer, QMutex, QMutexLocker, QThread, QMetaObject
 from PySide6.QtGui import QFont
 from shortcut_manager import get_bridge
 
+MODULE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # ---------- Helper functions ----------
 
+def _load_shared(name):
+    """Načíta zdieľaný modul z python/ raz pre celý proces (logika aj všetky widgety)."""
+    key = f"active_quests_{name}"
+    mod = sys.modules.get(key)
+    if mod is None:
+        path = os.path.join(MODULE_ROOT, "python", f"{name}.py")
+        spec = importlib.util.spec_from_file_location(key, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[key] = mod
+        try:
+            spec.loader.exec_module(mod)
+        except Exception:
+            sys.modules.pop(key, None)
+            raise
+    return mod
+
+
+json_store = _load_shared("json_store")
+shortcut_registry = _load_shared("shortcut_registry")
+translations = _load_shared("translations")
+game_clock = _load_shared("game_clock")
+startup_cache = _load_shared("startup_cache")
+tracer = _load_shared("tracer")
+render_core = _load_shared("render_core")
+session_recorder = _load_shared("session_recorder")
+quest_events = _load_shared("quest_events")
+trace = tracer.get_tracer()
+recorder = session_recorder.get_recorder()
+
+
 def ensure_dir(path):
     try:
         os.makedirs(path, exist_ok=True)
@@ -32,520 +63,29 @@ def read_json_safe(path, default=None):
         return default
 
 
-def format_time_remaining(seconds, fmt="%dd %hh %mm %ss"):
-    if seconds is None:
-        return "N/A"
-    if seconds < 0:
-        seconds = 0
-    days = seconds // 86400
-    hours = (seconds % 86400) // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
-    return (
-        fmt.replace("%dd", f"{days:02}d")
-        .replace("%hh", f"{hours:02}h")
-        .replace("%mm", f"{minutes:02}m")
-        .replace("%ss", f"{secs:02}s")
-        .replace("%d", f"{days:02}")
-        .replace("%h", f"{hours:02}")
-        .replace("%m", f"{minutes:02}")
-        .replace("%s", f"{secs:02}")
-    )
-
-
-def get_time_color(seconds_left, color_rules):
-    try:
-        keys = sorted([int(k) for k in color_rules.keys()], reverse=True)
-        for k in keys:
-            if seconds_left >= k:
-                return color_rules[str(k)]
-        return color_rules[str(keys[-1])] if keys else "#ffffff"
-    except Exception:
-        return "#ffffff"
-
-
-def load_translations(widget):
-    try:
-        if hasattr(widget, 'get_cached_translations'):
-            return widget.get_cached_translations()
-        
-        base_path = getattr(widget, "_data_path", None)
-        if not base_path:
-            return {}
-        folder = os.path.dirname(base_path)
-        translate_path = os.path.join(folder, "translate.json")
-
-        if not os.path.exists(translate_path):
-            return {}
-
-        with open(translate_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data.get("quests", {}) if isinstance(data, dict) else {}
-    except Exception:
-        return {}
-
-def merge_quest_texts(widget, combined, language="en"):
-    quest_id = None
-    for candidate in ("quest_data_asset_path", "translate_key", "quest_key", "id"):
-        if isinstance(combined, dict) and combined.get(candidate):
-            quest_id = combined.get(candidate)
-            break
-    if not quest_id:
-        return {}
-
-    base = quest_id.replace("QuestSetup:", "")
-    parts = base.split("_")
-
-    tier = parts[0] if len(parts) > 0 else ""
-    shop = parts[1] if len(parts) > 1 else ""
-    raw_name = "_".join(parts[2:]) if len(parts) > 2 else ""
-    fallback_name = raw_name.replace("_", " ").strip()
-
-    result = {
-        "tier": tier,
-        "shop": shop,
-        "name": fallback_name,
-        "description": "",
-        "requirements": "",
-        "rewards": "",
-        "req_data": {}
-    }
-
-    translations = load_translations(widget)
-    entry = translations.get(quest_id, {}) if isinstance(translations, dict) else {}
-
-    if entry:
-        if isinstance(entry.get("name"), dict):
-            result["name"] = entry["name"].get(language, fallback_name)
-        else:
-            if isinstance(entry.get("name"), str):
-                result["name"] = entry.get("name")
-
-        desc_val = entry.get("description")
-        if isinstance(desc_val, dict):
-            result["description"] = desc_val.get(language, "")
-        elif isinstance(desc_val, str):
-            result["description"] = desc_val
-
-        if isinstance(entry.get("requirements"), dict):
-            result["requirements"] = entry["requirements"].get(language, "")
-        elif isinstance(entry.get("requirements"), str):
-            result["requirements"] = entry.get("requirements")
-
-        for k, v in entry.items():
-            if isinstance(k, str) and k.startswith("requirements_"):
-                if isinstance(v, dict):
-                    result[k] = v.get(language, "")
-                else:
-                    result[k] = v
-
-        if isinstance(entry.get("rewards"), dict):
-            result["rewards"] = entry["rewards"].get(language, "")
-        elif isinstance(entry.get("rewards"), str):
-            result["rewards"] = entry.get("rewards")
-
-        if isinstance(entry.get("translate_data"), dict):
-            td = entry.get("translate_data")
-            result["req_data"] = td
-            for inner_k, inner_v in td.items():
-                if inner_k == "completion_text":
-                    result["completion_text"] = inner_v
-                    continue
-                result[inner_k] = inner_v
-
-    return result
-
-
-def apply_translation(quest, translations, language="en"):
-    if not isinstance(quest, dict):
-        return quest
-    q_key = quest.get("quest_key") or quest.get("id")
-    entry = translations.get(q_key, {}) if translations else {}
-
-    for key in ["name", "description", "requirements", "rewards"]:
-        if key in entry:
-            val = entry[key].get(language) if isinstance(entry[key], dict) else entry[key]
-            if val:
-                quest[key] = val
-
-    if "tier" in entry:
-        quest.setdefault("tier", entry.get("tier"))
-    if "rewards" in entry:
-        quest.setdefault("rewards", entry.get("rewards"))
-    if "req_data" in entry:
-        quest.setdefault("req_data", entry.get("req_data"))
-
-    return quest
-
-# ============================================================================
-# Smart Binary Data Parser
-# ============================================================================
-
-def parse_smart_translate_key(hex_data: str, translate_key: str, flat: dict) -> str:
-    """
-    Parsuje špeciálne translate kľúče typu:
-    "type1:0,1,8,9": "template|completion_suffix"
-    """
-    try:
-        if ":" not in translate_key:
-            return None
-        
-        parser_type, positions = translate_key.split(":", 1)
-        
-        if parser_type != "type1":
-            return None
-        
-        pos_parts = positions.split(",")
-        if len(pos_parts) != 4:
-            return None
-        
-        complete_pos = [int(pos_parts[0]), int(pos_parts[1])]
-        required_pos = [int(pos_parts[2]), int(pos_parts[3])]
-        
-        if not hex_data or len(hex_data) % 2 != 0:
-            return None
-        
-        bytes_data = bytes.fromhex(hex_data)
-        
-        if complete_pos[1] >= len(bytes_data):
-            return None
-        complete_bytes = bytes_data[complete_pos[0]:complete_pos[1]+1]
-        complete = int.from_bytes(complete_bytes, byteorder='little')
-        
-        if required_pos[1] >= len(bytes_data):
-            return None
-        required_bytes = bytes_data[required_pos[0]:required_pos[1]+1]
-        required = int.from_bytes(required_bytes, byteorder='little')
-        
-        return {
-            "complete": complete,
-            "required": required,
-            "is_complete": complete >= required
-        }
-        
-    except Exception as e:
-        print(f"[SmartParser] Error parsing {translate_key}: {e}")
-        return None
-
-
-def apply_smart_template(template: str, parsed_data: dict, flat: dict) -> str:
-    """
-    Aplikuje šablónu s inteligentnými tokenmi.
-    """
-    parts = template.split(" ## ", 1)
-    incomplete_template = parts[0]
-    complete_suffix = parts[1] if len(parts) > 1 else ""
-    
-    if parsed_data["is_complete"] and complete_suffix:
-        result = complete_suffix
-    else:
-        result = incomplete_template
-    
-    result = result.replace("%complete%", str(parsed_data["complete"]))
-    result = result.replace("%required%", str(parsed_data["required"]))
-    
-    for key, val in flat.items():
-        token = f"%{key}%"
-        if token in result:
-            result = result.replace(token, str(val) if val is not None else "")
-    
-    return result
-
-# ============================================================================
-# 🔧 FIX: MULTI-ITEM QUEST SUPPORT - pridaný fallback na hlavný translate_data
-# ============================================================================
-
-def check_all_requirements_complete(quest_data_list: list, flat: dict) -> bool:
-    """
-    Skontroluje či sú všetky requirements splnené.
-    🆕 NOVÉ: Podporuje fallback na hlavný translate_data ak neexistujú translate_data_X
-    """
-    if not isinstance(quest_data_list, list) or not quest_data_list:
-        return False
-    
-    for idx, hex_data in enumerate(quest_data_list):
-        key = f"translate_data_{idx + 1}"
-        
-        # 🆕 FALLBACK: Ak neexistuje translate_data_X, skús hlavný translate_data
-        if key not in flat:
-            if "translate_data" in flat and isinstance(flat["translate_data"], dict):
-                translate_data = flat["translate_data"]
-            else:
-                return False
-        else:
-            translate_data = flat[key]
-        
-        if not isinstance(translate_data, dict):
-            continue
-        
-        is_complete = False
-        for translate_key, translate_template in translate_data.items():
-            if translate_key.startswith("type1:"):
-                parsed = parse_smart_translate_key(hex_data, translate_key, flat)
-                if parsed and parsed.get("is_complete", False):
-                    is_complete = True
-                    break
-        
-        if not is_complete:
-            return False
-    
-    return True
-
-
-def process_multi_item_quest(quest_data_list: list, flat: dict) -> str:
-    """
-    Spracuje quest s viacerými tracking items.
-    """
-    result_parts = []
-    
-    for idx, hex_data in enumerate(quest_data_list):
-        req_key = f"requirements_{idx + 1}"
-        data_key = f"translate_data_{idx + 1}"
-        
-        requirement_text = flat.get(req_key, "")
-        
-        if data_key not in flat:
-            if requirement_text:
-                result_parts.append(f"{requirement_text}: {hex_data}")
-            continue
-        
-        translate_data = flat[data_key]
-        if not isinstance(translate_data, dict):
-            continue
-        
-        matched_value = None
-        for translate_key, translate_template in translate_data.items():
-            if translate_key.startswith("type1:"):
-                parsed = parse_smart_translate_key(hex_data, translate_key, flat)
-                if parsed:
-                    matched_value = apply_smart_template(translate_template, parsed, flat)
-                    break
-        
-        if matched_value is None and hex_data in translate_data:
-            matched_value = translate_data[hex_data]
-        
-        if matched_value is None and hex_data:
-            for tk in translate_data.keys():
-                if not tk.startswith("type1:") and hex_data.startswith(tk):
-                    matched_value = translate_data[tk]
-                    break
-        
-        if requirement_text:
-            item_result = f"{requirement_text}: {matched_value if matched_value else hex_data}"
-        else:
-            item_result = matched_value if matched_value else hex_data
-        
-        result_parts.append(item_result)
-    
-    result = "<br>".join(result_parts)
-    flat["requirements"] = ""
-    
-    return result
-
-
-# ============================================================================
-# 🔧 OPRAVA: completion_text s vnorénymi tokenmi a dvoma režimami farieb
-# ============================================================================
-
-# REŽIM 1: token_colors["completion_text"] JE nastavená
-# → Celý completion_text má túto farbu (vrátane vnorených tokenov)
-# Príklad: "TURN IN TO C1 ARMORER" → celé zelené
-
-# REŽIM 2: token_colors["completion_text"] NIE JE nastavená
-# → completion_text má line_color, ale vnorené tokeny majú svoje farby
-# Príklad: "TURN IN TO C1 ARMORER" → "TURN IN TO" (biela) "C1" (žltá) "ARMORER" (biela)
-
-# ============================================================================
-# NÁJDI replace_tokens_html_simple() A UPRAV SPRACOVANIE TOKENOV:
-# ============================================================================
-
-def replace_tokens_html_simple(template: str, combined: dict, globals_dict: dict, cfg: dict, remaining=None, line_color=None):
-    token_colors = cfg.get("token_colors", {}) if isinstance(cfg, dict) else {}
-    out = html.escape(template)
-
-    out = out.replace("\r\n", "\n").replace("\r", "\n").replace("\n", "<br>")
-
-    flat = {}
-    if isinstance(globals_dict, dict):
-        flat.update(globals_dict)
-    if isinstance(combined, dict):
-        flat.update(combined)
-
-    widget_instance = cfg.get("widget_instance") if isinstance(cfg, dict) else None
-    candidate_keys = ("quest_data_asset_path", "translate_key", "quest_key", "id")
-    if widget_instance and any(k in flat for k in candidate_keys):
-        try:
-            quest_texts = {}
-            if hasattr(widget_instance, "get_quest_texts"):
-                qid = None
-                for k in candidate_keys:
-                    if flat.get(k):
-                        qid = flat.get(k)
-                        break
-                quest_texts = widget_instance.get_quest_texts(qid, language=cfg.get("language", "en")) or {}
-            else:
-                quest_texts = merge_quest_texts(widget_instance, flat, language=cfg.get("language", "en"))
-            if isinstance(quest_texts, dict):
-                for k, v in quest_texts.items():
-                    if k not in flat or not flat.get(k):
-                        flat[k] = v
-        except Exception:
-            pass
-
-    if "time_remaining" in flat and remaining is not None:
-        flat["time_remaining_seconds"] = remaining
-
-    for key, val in list(flat.items()):
-        token = f"%{key}%"
-        if token in out:
-            # 🆕 ŠPECIÁLNE SPRACOVANIE PRE completion_text
-            if key == "completion_text" and isinstance(val, str):
-                completion_token_color = token_colors.get("completion_text")
-                
-                if completion_token_color:
-                    # 🎨 REŽIM 1: Celý text jednou farbou (token_colors["completion_text"])
-                    # Najprv nahraď všetky vnorené tokeny (bez ich farieb)
-                    processed = val
-                    for sub_key, sub_val in flat.items():
-                        token2 = f"%{sub_key}%"
-                        if token2 in processed:
-                            sub_val_str = str(sub_val) if sub_val is not None else ""
-                            processed = processed.replace(token2, sub_val_str)
-                    
-                    safe = html.escape(processed)
-                    safe = safe.replace("&lt;br&gt;", "<br>")
-                    # Celý text má farbu z token_colors
-                    safe = f"<span style=\"color:{completion_token_color};\">{safe}</span>"
-                    out = out.replace(token, safe)
-                    continue
-                
-                else:
-                    # 🎨 REŽIM 2: Vnorené tokeny majú svoje farby, zvyšok má line_color
-                    # Rozdeľ text na časti a identifikuj tokeny
-                    import re
-                    
-                    # Najprv escapuj celý text
-                    safe_text = html.escape(val)
-                    
-                    # Nájdi všetky tokeny vo forme %xxx%
-                    token_pattern = r'%([a-zA-Z_][a-zA-Z0-9_]*)%'
-                    
-                    def replace_nested_token(match):
-                        token_name = match.group(1)
-                        token_value = flat.get(token_name, match.group(0))
-                        
-                        if token_value == match.group(0):
-                            # Token nebol nájdený, nechaj ho tak
-                            return html.escape(match.group(0))
-                        
-                        # Získaj hodnotu a escapuj ju
-                        token_value_str = str(token_value) if token_value is not None else ""
-                        safe_value = html.escape(token_value_str)
-                        
-                        # Aplikuj farbu tokenu ak existuje
-                        sub_color = token_colors.get(token_name)
-                        if sub_color:
-                            return f"<span style=\"color:{sub_color};\">{safe_value}</span>"
-                        else:
-                            return safe_value
-                    
-                    # Nahraď všetky vnorené tokeny
-                    result = re.sub(token_pattern, replace_nested_token, val)
-                    
-                    # Escapuj HTML značky (ale nie naše span tagy)
-                    # Už máme escapované cez replace_nested_token
-                    safe = result.replace("<br>", "<br>")  # Zachovaj <br>
-                    
-                    out = out.replace(token, safe)
-                    continue
-            
-            # ŠTANDARDNÉ SPRACOVANIE PRE req_data
-            if key == "req_data" and isinstance(val, dict):
-                quest_data = flat.get("data")
-                
-                if isinstance(quest_data, list):
-                    matched_value = process_multi_item_quest(quest_data, flat)
-                else:
-                    quest_data_key = quest_data if isinstance(quest_data, str) else ""
-                    matched_value = None
-                    
-                    for translate_key, translate_template in val.items():
-                        if translate_key.startswith("type1:"):
-                            parsed = parse_smart_translate_key(quest_data_key, translate_key, flat)
-                            if parsed:
-                                matched_value = apply_smart_template(translate_template, parsed, flat)
-                                break
-                    
-                    if matched_value is None and quest_data_key in val:
-                        matched_value = val[quest_data_key]
-                    
-                    if matched_value is None and quest_data_key:
-                        best_match_key = None
-                        best_match_length = 0
-                        
-                        for translate_key in val.keys():
-                            if translate_key.startswith("type1:"):
-                                continue
-                            
-                            if quest_data_key.startswith(translate_key):
-                                if len(translate_key) > best_match_length:
-                                    best_match_key = translate_key
-                                    best_match_length = len(translate_key)
-                        
-                        if best_match_key:
-                            matched_value = val[best_match_key]
-                    
-                    if matched_value is None:
-                        matched_value = quest_data_key if quest_data_key else ""
-                
-                if matched_value:
-                    val = matched_value
-                    if isinstance(val, str):
-                        for sub_key, sub_val in flat.items():
-                            token2 = f"%{sub_key}%"
-                            if token2 in val:
-                                val = val.replace(token2, str(sub_val))
-                else:
-                    val = ""
-            
-            # ŠTANDARDNÉ SPRACOVANIE PRE rewards a requirements
-            elif key in ["rewards", "requirements"] and isinstance(val, str):
-                for sub_key, sub_val in flat.items():
-                    token2 = f"%{sub_key}%"
-                    if token2 in val:
-                        val = val.replace(token2, str(sub_val))
-
-            # ŠTANDARDNÉ SPRACOVANIE PRE OSTATNÉ TOKENY
-            raw_val = "" if val is None else str(val)
-            safe = html.escape(raw_val)
-            safe = safe.replace("&lt;br&gt;", "<br>")
-
-            color = token_colors.get(key)
-            if color == "dynamic" and key == "time_remaining":
-                color = get_time_color(int(remaining or 0), cfg.get("time_remaining_colors", {}))
+# Čisté funkcie renderovania (bez Qt) sú v python/render_core.py - headless benchmark
+# (tools/bench_render.py) a widget tak zdieľajú rovnaký kód.
+format_time_remaining = render_core.format_time_remaining
+get_time_color = render_core.get_time_color
+load_translations = render_core.load_translations
+merge_quest_texts = render_core.merge_quest_texts
+apply_translation = render_core.apply_translation
+parse_smart_translate_key = render_core.parse_smart_translate_key
+apply_smart_template = render_core.apply_smart_template
+check_all_requirements_complete = render_core.check_all_requirements_complete
+process_multi_item_quest = render_core.process_multi_item_quest
+replace_tokens_html_simple = render_core.replace_tokens_html_simple
 
-            if color:
-                safe = f"<span style=\"color:{color};\">{safe}</span>"
-
-            out = out.replace(token, safe)
-
-    if line_color:
-        out = f'<span style="color:{line_color};">{out}</span>'
-
-    out = out.replace('&amp;#37;', '%')
-
-    return out
 
 def _normalize_combo(combo: str) -> str:
-    if not combo:
-        return ""
-    s = combo.replace(" ", "").lower()
-    parts = [p for p in s.split("+") if p]
-    return "+".join(parts)
+    return shortcut_registry.normalize_combo(combo)
 
 
 # ---------- Default config ----------
 
+# Oneskorenie zápisu quest.json po zmene cez shortcut (viac stlačení = jeden zápis)
+CONFIG_SAVE_DEBOUNCE = 1.0
+
 DEFAULT_CONFIG = {
     "refresh_interval": 4,
     "time_simulation_duration": 120,
@@ -563,22 +103,62 @@ DEFAULT_CONFIG = {
     "shortcuts": {}
 }
 
-SORT_KEY_OPTIONS = [
-    "id",
-    "tier",
-    "sector",
-    "shop",
-    "time_remaining",
-    "sort_name"
-]
+SORT_KEY_OPTIONS = render_core.SORT_KEY_OPTIONS
+DISPLAY_TOGGLE_OPTIONS = render_core.DISPLAY_TOGGLE_OPTIONS
+
+
+# ---------- Quest udalosti (nezávisle od widgetov) ----------
+
+# Časovač v GUI vlákne číta data/quest.json sám (python/quest_events.py QuestFeed), udalosti
+# tak chodia aj pri skrytom, ešte nevytvorenom alebo v poole odloženom widgete.
+EVENT_POLL_INTERVAL_MS = 1000
+_EVENT_DATA_PATH = os.path.join(MODULE_ROOT, "data", "quest.json")
+_EVENT_CONFIG_PATHS = (os.path.join(MODULE_ROOT, "config", "quest.json"),
+                       os.path.join(MODULE_ROOT, "config", "config.json"))
+_event_language = {"mtimes": None, "language": "en"}
+
+
+def _current_event_language():
+    """Rovnaký jazyk ako widget: config/quest.json "language" má prednosť pred config.json."""
+    mtimes = []
+    for path in _EVENT_CONFIG_PATHS:
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except OSError:
+            mtimes.append(None)
+    if mtimes != _event_language["mtimes"]:
+        quest_cfg = read_json_safe(_EVENT_CONFIG_PATHS[0], {}) or {}
+        app_cfg = read_json_safe(_EVENT_CONFIG_PATHS[1], {}) or {}
+        _event_language["mtimes"] = mtimes
+        _event_language["language"] = quest_cfg.get("language") or app_cfg.get("language") or "en"
+    return _event_language["language"]
+
+
+def _poll_quest_events(feed):
+    try:
+        feed.poll(get_bridge(), _current_event_language())
+    except Exception as e:
+        print(f"[QuestWidget] Error publishing quest events: {e}")
+
 
-DISPLAY_TOGGLE_OPTIONS = [
-    "show_name",
-    "show_description",
-    "show_requirements",
-    "show_rewards",
-    "show_data"
-]
+def start_background(module_name, owner=None):
+    """Spustí publisher quest udalostí; beží, kým ho drží aspoň jeden vlastník (overlay / widget)."""
+    feed = quest_events.get_feed(_EVENT_DATA_PATH)
+    feed.owners.add(owner if owner is not None else module_name)
+    if feed.timer is None:
+        timer = QTimer()
+        timer.setInterval(EVENT_POLL_INTERVAL_MS)
+        timer.timeout.connect(lambda: _poll_quest_events(feed))
+        timer.start()
+        feed.timer = timer
+
+
+def stop_background(module_name, owner=None):
+    feed = quest_events.get_feed(_EVENT_DATA_PATH)
+    feed.owners.discard(owner if owner is not None else module_name)
+    if not feed.owners and feed.timer is not None:
+        feed.timer.stop()
+        feed.timer = None
 
 
 # ---------- Main widget ----------
@@ -590,12 +170,16 @@ def create_widget(BaseClass, module_name):
 
             self._render_mutex = QMutex()
             self._is_closing = False
+            # True kým je widget odložený v poole overlayov (bez skratiek a renderu)
+            self._suspended = False
 
             main_layout = QVBoxLayout()
             main_layout.setAlignment(Qt.AlignTop)
 
             self.text_browser = QTextBrowser()
             self.text_browser.setReadOnly(True)
+            # setHtml pri každom renderi - história undo by len rástla
+            self.text_browser.setUndoRedoEnabled(False)
             self.text_browser.setOpenExternalLinks(False)
             self.text_browser.setStyleSheet("background: transparent; border: none; padding: 6px;")
             self.text_browser.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Minimum)
@@ -608,15 +192,17 @@ def create_widget(BaseClass, module_name):
             self._config_path = self.get_config_path("quest.json")
             self._data_path = self.get_data_path("quest.json")
 
-            self._last_config_mtime = None
             self._last_data_mtime = None
             self._config = DEFAULT_CONFIG.copy()
 
-            self._translations_cache = None
-            self._translations_mtime = None
+            self._translations = None
+            self._app_config_path = self.get_config_path("config.json")
+            self._app_config_mtime = None
 
             self._ensure_config()
-            user_cfg = read_json_safe(self._config_path, {}) or {}
+            # Pamäťová kópia quest.json - shortcut akcie ju menia a na disk sa zapíše odložene
+            self._config_store = json_store.JsonStore(self._config_path, debounce=CONFIG_SAVE_DEBOUNCE)
+            user_cfg = self._config_store.load()
             if isinstance(user_cfg, dict):
                 self._config.update(user_cfg)
             
@@ -625,11 +211,16 @@ def create_widget(BaseClass, module_name):
 
             self._page_size = self._config.get("page_size", 10)
             self._current_page = 0
+            self._load_language()
 
             self._quests = []
             self._timestamp = None
-            self._simulated_time = 0
-            self._simulation_active = True
+            # True kým sa zobrazuje posledný snapshot z predošlého behu (warm start)
+            self._stale = False
+            self._startup_cache_path = self.get_data_path("startup_cache.json")
+            self._tick_count = 0
+            # model herného času (rýchlosť + posun) z po sebe idúcich snapshotov
+            self._clock = game_clock.GameClock()
 
             self._active_sectors = set()
             self._load_active_sectors_from_config()
@@ -649,18 +240,21 @@ def create_widget(BaseClass, module_name):
             self.timer.timeout.connect(self._tick)
 
             self.bridge = get_bridge()
-            self._bridge_handlers = {}
+            self._shortcuts = shortcut_registry.ShortcutRegistry(self.bridge, self._on_shortcut_triggered, owner="QuestWidget")
 
             try:
                 self._register_shortcuts()
             except Exception:
                 pass
 
-            self._load_data_json(force=True)
+            self._load_data_json(force=True, warm_start=True)
             self._preload_translations()
+            # quest udalosti publikuje časovač modulu, nie tick widgetu (beží aj v poole)
+            start_background(module_name, owner=self)
 
             QTimer.singleShot(0, self.timer.start)
-            QTimer.singleShot(100, self.schedule_render)
+            # s dátami (aj stale) vykresli hneď, inak počkaj na layout
+            QTimer.singleShot(0 if self._quests else 100, self.schedule_render)
 
         def set_background(self, rgba_str):
             """Set background color for QTextBrowser."""
@@ -677,36 +271,32 @@ def create_widget(BaseClass, module_name):
                 print(f"[QuestWidget] Error setting background: {e}")
 
         def _preload_translations(self):
+            # index sa načíta z binárnej cache (alebo skompiluje) na pozadí
+            folder = os.path.dirname(self._data_path)
+            translate_path = os.path.join(folder, "translate.json")
+            self._translations = translations.get_provider(translate_path)
+            self._translations.quests(self._config.get("language", "en"))
+
+        def get_cached_translations(self):
             try:
-                folder = os.path.dirname(self._data_path)
-                translate_path = os.path.join(folder, "translate.json")
-                
-                if not os.path.exists(translate_path):
-                    self._translations_cache = {}
-                    return
-                
-                self._translations_mtime = os.path.getmtime(translate_path)
-                with open(translate_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self._translations_cache = data.get("quests", {}) if isinstance(data, dict) else {}
+                return self._translations.quests(self._config.get("language", "en"))
             except Exception:
-                self._translations_cache = {}
+                return {}
 
-        def get_cached_translations(self):
+        def _load_language(self):
+            """Jazyk z config/config.json (quest.json "language" má prednosť). Balíček sa načíta až pri použití."""
             try:
-                folder = os.path.dirname(self._data_path)
-                translate_path = os.path.join(folder, "translate.json")
-                
-                if not os.path.exists(translate_path):
-                    return {}
-                
-                current_mtime = os.path.getmtime(translate_path)
-                if current_mtime != self._translations_mtime:
-                    self._preload_translations()
-                
-                return self._translations_cache
+                mtime = os.path.getmtime(self._app_config_path)
             except Exception:
-                return self._translations_cache or {}
+                mtime = None
+            if mtime == self._app_config_mtime and "language" in self._config:
+                return
+            self._app_config_mtime = mtime
+            app_cfg = read_json_safe(self._app_config_path, {}) or {}
+            language = self._config_store.get("language") or app_cfg.get("language") or "en"
+            if language != self._config.get("language"):
+                self._config["language"] = language
+                self._last_html = None
 
         def _ensure_config(self):
             cfg_dir = os.path.dirname(self._config_path)
@@ -719,19 +309,13 @@ def create_widget(BaseClass, module_name):
                     pass
 
         def _load_and_apply_config(self):
-            try:
-                mtime = os.path.getmtime(self._config_path)
-            except Exception:
-                mtime = None
-            
-            if mtime and mtime == self._last_config_mtime:
+            """Aplikuje externú úpravu quest.json, ktorú už store zlúčil s pamäťovou kópiou."""
+            changed = self._config_store.poll()
+            if not changed:
                 return
-            
-            self._last_config_mtime = mtime
 
-            user_cfg = read_json_safe(self._config_path, {}) or {}
-            if isinstance(user_cfg, dict):
-                self._config.update(user_cfg)
+            self._config.update(self._config_store.snapshot())
+            recorder.config("quest.json", self._config_store.snapshot())
             
             self._config.setdefault("filter", DEFAULT_CONFIG["filter"].copy())
             self._config.setdefault("sort", DEFAULT_CONFIG["sort"].copy())
@@ -741,108 +325,71 @@ def create_widget(BaseClass, module_name):
             self._load_active_sectors_from_config()
             self._load_active_shops_from_config()
             
-            try:
-                self._register_shortcuts()
-            except Exception:
-                pass
+            if "shortcuts" in changed:
+                try:
+                    self._register_shortcuts()
+                except Exception:
+                    pass
 
         def _load_active_sectors_from_config(self):
-            try:
-                filt = self._config.get("filter", {})
-                sectors_map = filt.get("sectors", {})
-                if isinstance(sectors_map, dict):
-                    self._active_sectors = {k.upper() for k, v in sectors_map.items() if v}
-                else:
-                    self._active_sectors = set()
-            except Exception:
-                self._active_sectors = set()
+            self._active_sectors = render_core.active_filter_set(self._config, "sectors")
 
         def _load_active_shops_from_config(self):
-            try:
-                filt = self._config.get("filter", {})
-                shops_map = filt.get("shops", {})
-                if isinstance(shops_map, dict):
-                    self._active_shops = {k.upper() for k, v in shops_map.items() if v}
-                else:
-                    self._active_shops = set()
-            except Exception:
-                self._active_shops = set()
+            self._active_shops = render_core.active_filter_set(self._config, "shops")
 
         def _save_filter_to_config(self):
             try:
-                current = read_json_safe(self._config_path, {}) or {}
-                current.setdefault("filter", {})
-                current["filter"].setdefault("sectors", {})
-                current["filter"].setdefault("shops", {})
-                current["filter"]["enabled"] = bool(self._config.get("filter", {}).get("enabled", False))
+                current_filter = self._config_store.get("filter", {})
+                if not isinstance(current_filter, dict):
+                    current_filter = {}
+                current_filter["enabled"] = bool(self._config.get("filter", {}).get("enabled", False))
                 
-                sectors_map = current["filter"].get("sectors", {})
+                sectors_map = current_filter.get("sectors", {})
                 if not isinstance(sectors_map, dict):
                     sectors_map = {}
                 
                 for s in set(list(sectors_map.keys()) + list(self._active_sectors)):
                     sectors_map[s] = True if s in self._active_sectors else False
                 
-                current["filter"]["sectors"] = sectors_map
+                current_filter["sectors"] = sectors_map
                 
-                shops_map = current["filter"].get("shops", {})
+                shops_map = current_filter.get("shops", {})
                 if not isinstance(shops_map, dict):
                     shops_map = {}
                 
                 for s in set(list(shops_map.keys()) + list(self._active_shops)):
                     shops_map[s] = True if s in self._active_shops else False
                 
-                current["filter"]["shops"] = shops_map
-                current.setdefault("sort", self._config.get("sort", DEFAULT_CONFIG["sort"]))
+                current_filter["shops"] = shops_map
                 
-                ensure_dir(os.path.dirname(self._config_path))
-                with open(self._config_path, "w", encoding="utf-8") as f:
-                    json.dump(current, f, indent=2, ensure_ascii=False)
+                self._config_store.set("filter", current_filter)
+                if self._config_store.get("sort") is None:
+                    self._config_store.set("sort", self._config.get("sort", DEFAULT_CONFIG["sort"]))
                 
-                self._config["filter"] = current["filter"]
-                self._config["sort"] = current.get("sort", self._config.get("sort", DEFAULT_CONFIG["sort"]))
+                self._config["filter"] = current_filter
             except Exception as e:
                 print("[QuestWidget] Error saving filter to config:", e)
 
         def _save_sort_to_config(self):
             try:
-                current = read_json_safe(self._config_path, {}) or {}
-                current["sort"] = self._config.get("sort", DEFAULT_CONFIG["sort"])
-                
-                ensure_dir(os.path.dirname(self._config_path))
-                with open(self._config_path, "w", encoding="utf-8") as f:
-                    json.dump(current, f, indent=2, ensure_ascii=False)
-                
-                print(f"[QuestWidget] Saved sort to config: {current['sort']}")
+                self._config_store.set("sort", self._config.get("sort", DEFAULT_CONFIG["sort"]))
             except Exception as e:
                 print("[QuestWidget] Error saving sort to config:", e)
 
         def _save_display_to_config(self):
             try:
-                current = read_json_safe(self._config_path, {}) or {}
-                current["display"] = self._config.get("display", DEFAULT_CONFIG.get("display", {}))
-                
-                ensure_dir(os.path.dirname(self._config_path))
-                with open(self._config_path, "w", encoding="utf-8") as f:
-                    json.dump(current, f, indent=2, ensure_ascii=False)
-                
-                print(f"[QuestWidget] Saved display to config: {current['display']}")
+                self._config_store.set("display", self._config.get("display", DEFAULT_CONFIG.get("display", {})))
             except Exception as e:
                 print("[QuestWidget] Error saving display to config:", e)
 
         def _save_page_config(self):
             """Save page_size to config."""
             try:
-                current = read_json_safe(self._config_path, {}) or {}
-                current["page_size"] = self._page_size
-                ensure_dir(os.path.dirname(self._config_path))
-                with open(self._config_path, "w", encoding="utf-8") as f:
-                    json.dump(current, f, indent=2, ensure_ascii=False)
-                print(f"[QuestWidget] Saved page_size to config: {self._page_size}")
+                self._config_store.set("page_size", self._page_size)
             except Exception as e:
                 print(f"[QuestWidget] Error saving page config: {e}")
 
-        def _load_data_json(self, force=False):
+        def _load_data_json(self, force=False, warm_start=False):
             try:
                 mtime = os.path.getmtime(self._data_path)
             except Exception:
@@ -856,53 +403,41 @@ def create_widget(BaseClass, module_name):
             if not data:
                 data = {"user_profile_id": None, "timestamp": None, "quests": []}
 
+            if warm_start and not data.get("quests"):
+                # logika ešte nič nezapísala - posledný snapshot z data/startup_cache.json
+                try:
+                    snapshot = startup_cache.read_snapshot(self._startup_cache_path)
+                except Exception:
+                    snapshot = None
+                if snapshot:
+                    data = dict(snapshot, stale=True)
+
+            self._stale = bool(data.get("stale"))
             new_ts = data.get("timestamp", None)
             if new_ts != self._timestamp and new_ts is not None:
                 self._timestamp = new_ts
-                self._simulated_time = 0
-                self._simulation_active = True
-
-            self._quests = data.get("quests", []) or []
+                # čas zo starého snapshotu nie je vzorka aktuálneho behu hry
+                if not self._stale:
+                    self._clock.add_sample(new_ts, data.get("captured_monotonic"))
 
-            for q in self._quests:
-                ap = q.get("quest_data_asset_path", "")
-                if ap and ":" in ap:
-                    try:
-                        _, raw = ap.split(":", 1)
-                        parts = raw.split("_")
-                        if len(parts) >= 3:
-                            q["tier"] = parts[0]
-                            q["shop"] = parts[1]
-                            q["sort_name"] = " ".join(parts[2:]).replace("_", " ")
-                        else:
-                            q.setdefault("tier", "")
-                            q.setdefault("shop", "")
-                            q.setdefault("sort_name", raw)
-                    except Exception:
-                        q.setdefault("tier", "")
-                        q.setdefault("shop", "")
-                        q.setdefault("sort_name", ap)
+            self._quests = render_core.prepare_quests(data.get("quests", []) or [])
 
         def _tick(self):
             if self._is_closing:
                 return
 
-            self._simulated_time += 1
-            duration = self._config.get("time_simulation_duration", 120)
+            self._tick_count += 1
             refresh_interval = self._config.get("refresh_interval", 2)
 
             try:
-                mtime = os.path.getmtime(self._config_path)
-                if mtime != self._last_config_mtime:
-                    self._load_and_apply_config()
+                self._load_and_apply_config()
+                self._load_language()
             except Exception:
                 pass
 
-            if self._simulated_time >= duration:
-                self._simulation_active = False
-
-            if self._simulated_time % refresh_interval == 0:
-                self._load_data_json()
+            if self._tick_count % refresh_interval == 0:
+                with trace.span("load", cat="widget"):
+                    self._load_data_json()
 
             try:
                 if not self._is_closing and self.isVisible():
@@ -910,8 +445,23 @@ def create_widget(BaseClass, module_name):
             except Exception:
                 pass
 
+        def _current_world_time(self):
+            """Odhad aktuálneho času sveta z GameClock modelu."""
+            if self._timestamp is None:
+                return None
+            estimate = self._clock.now()
+            if estimate is None:
+                return self._timestamp
+            if self._clock.sample_count < 2:
+                # iba jeden snapshot - rýchlosť nepoznáme, extrapoluj max. time_simulation_duration
+                duration = self._config.get("time_simulation_duration", 120)
+                elapsed = min(self._clock.seconds_since_sample() or 0, duration)
+                return int(self._timestamp + elapsed)
+            # fit môže byť tesne pod posledným prečítaným časom - odpočet nesmie ísť späť
+            return max(int(estimate), int(self._timestamp))
+
         def schedule_render(self):
-            if self._is_closing:
+            if self._is_closing or self._suspended:
                 return
             try:
                 current_thread = QThread.currentThread()
@@ -926,7 +476,7 @@ def create_widget(BaseClass, module_name):
                 pass
 
         def _schedule_render_internal(self):
-            if self._is_closing:
+            if self._is_closing or self._suspended:
                 return
             
             now = time.time()
@@ -939,229 +489,28 @@ def create_widget(BaseClass, module_name):
                 QTimer.singleShot(0, self._render_quests_safe)
 
         def _filter_quests(self, quests):
-            if not isinstance(quests, list):
-                return []
-            filt = self._config.get("filter", {})
-            enabled = bool(filt.get("enabled", False))
-            result = []
-            for q in quests:
-                include = True
-                
-                sec = str(q.get("sector", "")).upper()
-                if enabled:
-                    cfg_sectors = filt.get("sectors", {})
-                    if isinstance(cfg_sectors, dict) and any(cfg_sectors.values()):
-                        if sec not in self._active_sectors:
-                            include = False
-                
-                shop = str(q.get("shop", "")).upper()
-                if enabled and include:
-                    cfg_shops = filt.get("shops", {})
-                    if isinstance(cfg_shops, dict) and any(cfg_shops.values()):
-                        if shop not in self._active_shops:
-                            include = False
-                
-                if include:
-                    result.append(q)
-            return result
+            return render_core.filter_quests(quests, self._config, self._active_sectors, self._active_shops)
 
         def _sort_quests(self, quests):
-            sort_cfg = self._config.get("sort", {}) or {}
-            keys = sort_cfg.get("keys", [])
-            if isinstance(keys, str):
-                keys = [keys]
-            if not keys:
-                return quests
-            order_asc = sort_cfg.get("order", "asc").lower() == "asc"
-
-            def sort_value(q, key):
-                if key == "time_remaining":
-                    completion = q.get("completion_deadline", 0) or 0
-                    current_ts = (self._timestamp + self._simulated_time) if self._timestamp else 0
-                    try:
-                        return int(completion) - int(current_ts)
-                    except Exception:
-                        return 0
-                val = q.get(key, "")
-                try:
-                    return float(val)
-                except Exception:
-                    return str(val).lower()
+            return render_core.sort_quests(quests, self._config, self._current_world_time())
 
-            try:
-                return sorted(quests, key=lambda q: tuple(sort_value(q, k) for k in keys), reverse=not order_asc)
-            except Exception:
-                return quests
-
-        # ============================================================================
-        # 🔧 FIX: _generate_full_html() - PRIDANÉ completion_text pre single-item + farby
-        # ============================================================================
         def _generate_full_html(self, quests, current_ts):
-            cfg = self._config
-            header_cfg = cfg.get("header", [])
-            lines_cfg = cfg.get("lines", [])
-            display_cfg = cfg.get("display", {})
-            if "auto_complete" not in display_cfg and "show_data" in display_cfg:
-                display_cfg["auto_complete"] = display_cfg.get("show_data", True)
-
-            parts = []
-            base_font = cfg.get("font_family", "Consolas")
-            base_size = cfg.get("default_font_size", 10)
-
-            parts.append(f"<div style='font-family: {base_font}; font-size: {base_size}pt; color: #ffffff;'>")
-
-            # Pagination info
-            total_quests = len(quests)
-            total_pages = max(1, (total_quests + self._page_size - 1) // self._page_size)
-            current_page_display = min(self._current_page + 1, total_pages)
-
-            globals_dict = {
-                "quest_count": total_quests,
-                "timestamp": current_ts,
-                "filter_enabled": str(bool(cfg.get("filter", {}).get("enabled", False))),
-                "filter_active_sectors": ", ".join(sorted(list(self._active_sectors))) if self._active_sectors else "ALL",
-                "filter_active_shops": ", ".join(sorted(list(self._active_shops))) if self._active_shops else "ALL",
-                "sort_keys": ", ".join(cfg.get("sort", {}).get("keys", [])) if cfg.get("sort", {}).get("keys") else "",
-                "sort_order": cfg.get("sort", {}).get("order", ""),
-                "page_size": self._page_size,
-                "current_page": current_page_display,
-                "total_pages": total_pages,
-                "page_info": f"Page {current_page_display}/{total_pages} ({self._page_size}/page)",
-                "display_name": "✓" if display_cfg.get("show_name", True) else "✗",
-                "display_description": "✓" if display_cfg.get("show_description", True) else "✗",
-                "display_requirements": "✓" if display_cfg.get("show_requirements", True) else "✗",
-                "display_rewards": "✓" if display_cfg.get("show_rewards", True) else "✗",
-                "display_data": "✓" if display_cfg.get("show_data", True) else "✗"
-            }
-
-            for h in header_cfg:
-                raw = h.get("data", "")
-                html_line = replace_tokens_html_simple(raw, {}, globals_dict, cfg, remaining=None, line_color=h.get("color"))
-                style = f"font-family:{h.get('font', base_font)}; font-size:{h.get('size', base_size)}pt; color:{h.get('color','#ffffff')};"
-                parts.append(f"<div style='{style} margin:2px 0;'>{html_line}</div>")
-
-            parts.append("<hr style='border: none; border-top: 1px solid #333; margin:6px 0;'/>")
-
-            # Paginate quests
-            start_idx = self._current_page * self._page_size
-            end_idx = start_idx + self._page_size
-            quests_on_page = quests[start_idx:end_idx]
-
-            for q in quests_on_page:
-                completion = q.get("completion_deadline", 0) or 0
-                if current_ts is not None:
-                    remaining = int(completion - current_ts)
-                else:
-                    remaining = 0
-
-                q_copy = dict(q)
-                q_copy["time_remaining"] = format_time_remaining(remaining, cfg.get("time_remaining_format", "%dd %hh %mm %ss"))
-                q_copy["time_remaining_seconds"] = remaining
-
-                # Merge translation texts
-                try:
-                    translations_for_q = {}
-                    if hasattr(self, "get_quest_texts"):
-                        translations_for_q = self.get_quest_texts(q_copy.get("quest_data_asset_path") or q_copy.get("quest_key") or q_copy.get("id"), language=cfg.get("language", "en")) or {}
-                    else:
-                        translations_for_q = merge_quest_texts(self, q_copy, language=cfg.get("language", "en")) or {}
-                    if isinstance(translations_for_q, dict):
-                        for tk, tv in translations_for_q.items():
-                            if tk not in q_copy or not q_copy.get(tk):
-                                q_copy[tk] = tv
-                except Exception:
-                    pass
-
-                parts.append("<div style='padding:4px 0;'>")
-                
-                # 🆕 KROK 1: ZISTI ČI JE QUEST DOKONČENÝ (PRED renderovaním lines)
-                quest_is_complete = False
-                
-                # Detekcia pre MULTI-ITEM quest
-                if isinstance(q_copy.get("data"), list):
-                    try:
-                        if check_all_requirements_complete(q_copy.get("data", []), q_copy):
-                            quest_is_complete = True
-                    except Exception:
-                        pass
-                
-                # Detekcia pre SINGLE-ITEM quest
-                else:
-                    try:
-                        quest_data_str = q_copy.get("data") if isinstance(q_copy.get("data"), str) else ""
-                        req_data = q_copy.get("req_data") if isinstance(q_copy.get("req_data"), dict) else {}
-                        
-                        for translate_key in req_data.keys():
-                            if translate_key.startswith("type1:"):
-                                parsed = parse_smart_translate_key(quest_data_str, translate_key, q_copy)
-                                if parsed and parsed.get("is_complete", False):
-                                    quest_is_complete = True
-                                    break
-                    except Exception:
-                        pass
-                
-                # 🆕 KROK 2: Pridaj quest_is_complete do q_copy aby bol dostupný v tokenoch
-                q_copy["quest_is_complete"] = quest_is_complete
-                
-                # Renderovanie riadkov
-                for line in lines_cfg:
-                    raw = line.get("data", "")
-                    line_color = line.get("color")
-
-                    # 🆕 KROK 3: Ak riadok obsahuje %completion_text%, zobraz ho LEN ak je quest dokončený
-                    if "%completion_text%" in raw:
-                        if not quest_is_complete:
-                            continue  # Preskoč tento riadok ak quest NIE JE dokončený
-
-                    # Display checks pre ostatné tokeny
-                    if ("%name%" in raw and not display_cfg.get("show_name", True)) or \
-                    ("%description%" in raw and not display_cfg.get("show_description", True)) or \
-                    ("%requirements%" in raw and not display_cfg.get("show_requirements", True)) or \
-                    ("%rewards%" in raw and not display_cfg.get("show_rewards", True)) or \
-                    ("%data%" in raw and not display_cfg.get("show_data", True)):
-                        continue
-
-                    # MULTI-ITEM QUEST
-                    if isinstance(q_copy.get("data"), list) and any(tok in raw for tok in ("%data%", "%req_data%", "%requirements%", "%translate_data%")):
-                        for idx_item, item_hex in enumerate(q_copy.get("data")):
-                            per_item = dict(q_copy)
-                            per_item["data"] = item_hex
-                            try:
-                                td_key = f"translate_data_{idx_item + 1}"
-                                req_key = f"requirements_{idx_item + 1}"
-                                
-                                if td_key in per_item and isinstance(per_item[td_key], dict):
-                                    per_item["req_data"] = per_item[td_key]
-                                elif "translate_data" in per_item and isinstance(per_item["translate_data"], dict):
-                                    per_item["req_data"] = per_item["translate_data"]
-                                else:
-                                    rd = per_item.get("req_data")
-                                    if isinstance(rd, dict) and td_key in rd and isinstance(rd[td_key], dict):
-                                        per_item["req_data"] = rd[td_key]
-
-                                if req_key in per_item:
-                                    per_item["requirements"] = per_item.get(req_key) or per_item.get("requirements", "")
-                            except Exception:
-                                pass
-
-                            html_line = replace_tokens_html_simple(raw, per_item, globals_dict, cfg, remaining=remaining, line_color=line_color)
-                            style = f"font-family:{line.get('font', base_font)}; font-size:{line.get('size', base_size)}pt; color:{line.get('color','#ffffff')};"
-                            parts.append(f"<div style='{style} margin:1px 0;'>{html_line}</div>")
-                    
-                    # SINGLE-ITEM QUEST alebo riadok s completion_text
-                    else:
-                        html_line = replace_tokens_html_simple(raw, q_copy, globals_dict, cfg, remaining=remaining, line_color=line_color)
-                        style = f"font-family:{line.get('font', base_font)}; font-size:{line.get('size', base_size)}pt; color:{line.get('color','#ffffff')};"
-                        parts.append(f"<div style='{style} margin:1px 0;'>{html_line}</div>")
-                
-                parts.append("</div>")
-                parts.append("<hr style='border: none; border-top: 1px solid rgba(255,255,255,0.03); margin:6px 0;'/>")
-
-            parts.append("</div>")
-            return "".join(parts)
+            return render_core.generate_full_html(
+                quests, current_ts, self._config,
+                text_source=self,
+                page=self._current_page,
+                page_size=self._page_size,
+                active_sectors=self._active_sectors,
+                active_shops=self._active_shops,
+                extra_globals={
+                    "clock_confidence": self._clock.confidence(),
+                    "clock_rate": f"{self._clock.rate:.2f}x",
+                    "data_state": "stale" if self._stale else "live",
+                },
+            )
 
         def _render_quests_safe(self):
-            if self._is_closing:
+            if self._is_closing or self._suspended:
                 return
             locker = QMutexLocker(self._render_mutex)
             try:
@@ -1169,26 +518,27 @@ def create_widget(BaseClass, module_name):
 
                 cfg = self._config
                 quests = self._quests or []
-                quests = self._filter_quests(quests)
-                quests = self._sort_quests(quests)
+                with trace.span("filter", cat="widget", quests=len(quests)):
+                    quests = self._filter_quests(quests)
+                with trace.span("sort", cat="widget"):
+                    quests = self._sort_quests(quests)
 
-                if self._timestamp is not None and self._simulation_active:
-                    current_ts = self._timestamp + self._simulated_time
-                else:
-                    current_ts = self._timestamp
+                current_ts = self._current_world_time()
 
                 try:
                     cfg["widget_instance"] = self
                 except Exception:
                     pass
-                html_out = self._generate_full_html(quests, current_ts)
+                with trace.span("html", cat="widget", quests=len(quests)):
+                    html_out = self._generate_full_html(quests, current_ts)
 
                 if html_out != self._last_html:
                     sb = self.text_browser.verticalScrollBar()
                     old_value = sb.value()
                     old_max = sb.maximum()
 
-                    self.text_browser.setHtml(html_out)
+                    with trace.span("setHtml", cat="widget", chars=len(html_out)):
+                        self.text_browser.setHtml(html_out)
                     self._last_html = html_out
                     
                     # Dynamic height adjustment
@@ -1224,159 +574,116 @@ def create_widget(BaseClass, module_name):
             self._pending_actions.clear()
             locker.unlock()
 
-            config_changed = False
-            
-            for action_name in actions_to_process:
-                cfg = self._config
-                
-                if action_name == "toggle_filter":
-                    cfg["filter"]["enabled"] = not cfg["filter"].get("enabled", False)
-                    config_changed = True
-
-                elif action_name.startswith("toggle_sector_"):
-                    sector_code = action_name.replace("toggle_sector_", "").upper()
-                    sectors = cfg.setdefault("filter", {}).setdefault("sectors", {})
-                    sectors[sector_code] = not sectors.get(sector_code, False)
-                    
-                    if sectors[sector_code]:
-                        self._active_sectors.add(sector_code)
-                    else:
-                        self._active_sectors.discard(sector_code)
-                    
-                    config_changed = True
-
-                elif action_name.startswith("toggle_shop_"):
-                    shop_code = action_name.replace("toggle_shop_", "").upper()
-                    shops = cfg.setdefault("filter", {}).setdefault("shops", {})
-                    shops[shop_code] = not shops.get(shop_code, False)
-                    
-                    if shops[shop_code]:
-                        self._active_shops.add(shop_code)
-                    else:
-                        self._active_shops.discard(shop_code)
-                    
-                    config_changed = True
-
-                elif action_name == "sort_order_asc":
-                    cfg.setdefault("sort", {})["order"] = "asc"
-                    config_changed = True
-                    
-                elif action_name == "sort_order_desc":
-                    cfg.setdefault("sort", {})["order"] = "desc"
-                    config_changed = True
-
-                elif action_name == "cycle_sort_key":
-                    keys = cfg.setdefault("sort", {}).setdefault("keys", [])
-                    
-                    if not keys:
-                        keys.append("id")
-                    else:
-                        last_idx = len(keys) - 1
-                        last_key = keys[last_idx]
-                        
-                        try:
-                            current_idx = SORT_KEY_OPTIONS.index(last_key)
-                            next_idx = (current_idx + 1) % len(SORT_KEY_OPTIONS)
-                            keys[last_idx] = SORT_KEY_OPTIONS[next_idx]
-                        except ValueError:
-                            keys[last_idx] = "id"
-                    
-                    cfg["sort"]["keys"] = keys
-                    config_changed = True
-
-                elif action_name == "add_sort_key":
-                    keys = cfg.setdefault("sort", {}).setdefault("keys", [])
-                    
-                    for k in SORT_KEY_OPTIONS:
-                        if k not in keys:
-                            keys.append(k)
-                            break
-                    
-                    cfg["sort"]["keys"] = keys
-                    config_changed = True
+            view = render_core.ViewState(self._current_page, self._page_size, self._active_sectors, self._active_shops)
+            changed = set()
 
-                elif action_name == "clear_sort_keys":
-                    cfg.setdefault("sort", {})["keys"] = ["id"]
-                    config_changed = True
+            for action_name in actions_to_process:
+                if action_name == "dump_trace":
+                    self._dump_trace()
+                    continue
 
-                elif action_name.startswith("toggle_display_"):
-                    display_key = action_name.replace("toggle_display_", "")
-                    if display_key in DISPLAY_TOGGLE_OPTIONS:
-                        cfg.setdefault("display", {})[display_key] = not cfg.get("display", {}).get(display_key, True)
-                        config_changed = True
+                group = render_core.apply_action(
+                    action_name, self._config, view,
+                    visible_count=lambda: len(self._filter_quests(self._quests or [])),
+                )
+                if group:
+                    changed.add(group)
 
                 # PAGINATION ACTIONS
-                elif action_name == "next_page":
-                    filtered = self._filter_quests(self._quests or [])
-                    sorted_quests = self._sort_quests(filtered)
-                    total_pages = max(1, (len(sorted_quests) + self._page_size - 1) // self._page_size)
-                    self._current_page = min(self._current_page + 1, total_pages - 1)
-                    print(f"[QuestWidget] Next page: {self._current_page + 1}/{total_pages}")
-
+                if action_name == "next_page":
+                    print(f"[QuestWidget] Next page: {view.page + 1}/{view.total_pages}")
                 elif action_name == "prev_page":
-                    self._current_page = max(0, self._current_page - 1)
-                    print(f"[QuestWidget] Prev page: {self._current_page + 1}")
-
+                    print(f"[QuestWidget] Prev page: {view.page + 1}")
                 elif action_name == "increase_page_size":
-                    self._page_size = min(50, self._page_size + 1)
-                    self._current_page = 0
-                    self._config["page_size"] = self._page_size
-                    self._save_page_config()
-                    print(f"[QuestWidget] Page size increased: {self._page_size}")
-
+                    print(f"[QuestWidget] Page size increased: {view.page_size}")
                 elif action_name == "decrease_page_size":
-                    self._page_size = max(1, self._page_size - 1)
-                    self._current_page = 0
-                    self._config["page_size"] = self._page_size
-                    self._save_page_config()
-                    print(f"[QuestWidget] Page size decreased: {self._page_size}")
-
-            if config_changed:
-                if any(a.startswith("toggle_") and not a.startswith("toggle_display_") for a in actions_to_process):
-                    self._save_filter_to_config()
-                
-                if any(a in ["sort_order_asc", "sort_order_desc", "cycle_sort_key", "add_sort_key", "clear_sort_keys"] for a in actions_to_process):
-                    self._save_sort_to_config()
-                
-                if any(a.startswith("toggle_display_") for a in actions_to_process):
-                    self._save_display_to_config()
-
-        def _register_shortcuts(self):
+                    print(f"[QuestWidget] Page size decreased: {view.page_size}")
+
+            self._current_page = view.page
+            self._page_size = view.page_size
+
+            if "filter" in changed:
+                self._save_filter_to_config()
+            if "sort" in changed:
+                self._save_sort_to_config()
+            if "display" in changed:
+                self._save_display_to_config()
+            if "page_size" in changed:
+                self._save_page_config()
+
+        def _dump_trace(self):
+            """Zapíše Chrome trace (scan + widget spany) do data/trace_<čas>.json."""
+            if not trace.enabled:
+                print('[QuestWidget] Tracing is disabled (set "trace": true in config/config.json)')
+                return
             try:
-                for combo_norm, handler in list(self._bridge_handlers.items()):
-                    try:
-                        self.bridge.off(f"shortcut.{combo_norm}", handler)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-            self._bridge_handlers.clear()
+                path = trace.dump(os.path.dirname(self._data_path))
+                print(f"[QuestWidget] Trace saved: {path}" if path else "[QuestWidget] Trace is empty")
+            except Exception as e:
+                print(f"[QuestWidget] Error saving trace: {e}")
 
+        def _register_shortcuts(self):
             shortcuts = self._config.get("shortcuts", {}) or {}
-            
-            for action, combo in shortcuts.items():
-                combo_norm = _normalize_combo(combo)
-                event_name = f"shortcut.{combo_norm}"
-
-                def make_handler(act, combo_norm_local):
-                    return lambda act=act, combo_norm=combo_norm_local: self._on_shortcut_triggered(act, combo_norm)
-
-                handler = make_handler(action, combo_norm)
-                try:
-                    self.bridge.on(event_name, handler)
-                    self._bridge_handlers[combo_norm] = handler
-                except Exception as e:
-                    print(f"[QuestWidget] Failed to register {action}: {e}")
+            self._shortcuts.sync(shortcuts)
 
         def _on_shortcut_triggered(self, action_name: str, combo_norm: str):
             try:
                 locker = QMutexLocker(self._actions_lock)
                 self._pending_actions.append(action_name)
                 locker.unlock()
+                recorder.action(action_name)
                 self.schedule_render()
             except Exception as e:
                 print(f"[QuestWidget] _on_shortcut_triggered error ({action_name}): {e}")
 
+        def get_widget_state(self):
+            """Stav, ktorý sa prenesie do novej inštancie po uvoľnení skrytého overlayu."""
+            return {
+                "current_page": self._current_page,
+                "page_size": self._page_size,
+            }
+
+        def set_widget_state(self, state):
+            if not isinstance(state, dict):
+                return
+            self._page_size = int(state.get("page_size", self._page_size) or self._page_size)
+            self._current_page = max(0, int(state.get("current_page", 0) or 0))
+            self.schedule_render()
+
+        def suspend_widget(self):
+            """Overlay odložil widget do poolu - zastav časovač a skratky, stav ostáva v pamäti."""
+            self._suspended = True
+            try:
+                self.timer.stop()
+            except Exception:
+                pass
+            # skratky by inak menili config aj z neviditeľnej inštancie (a dvakrát popri živej)
+            try:
+                self._shortcuts.clear()
+            except Exception:
+                pass
+            try:
+                self._config_store.flush()
+            except Exception:
+                pass
+
+        def resume_widget(self):
+            """Widget sa znovu použil v prestavanom overlayi."""
+            if self._is_closing:
+                return
+            self._suspended = False
+            try:
+                self._register_shortcuts()
+            except Exception:
+                pass
+            self._last_html = None
+            self._load_data_json(force=True)
+            try:
+                self.timer.start()
+            except Exception:
+                pass
+            self.schedule_render()
+
         def close_widget(self):
             self._is_closing = True
             
@@ -1385,16 +692,21 @@ def create_widget(BaseClass, module_name):
                     self.timer.stop()
             except Exception:
                 pass
+
+            try:
+                self._config_store.flush()
+            except Exception:
+                pass
+
+            try:
+                stop_background(module_name, owner=self)
+            except Exception:
+                pass
                 
             try:
-                for combo_norm, handler in list(self._bridge_handlers.items()):
-                    try:
-                        self.bridge.off(f"shortcut.{combo_norm}", handler)
-                    except Exception:
-                        pass
+                self._shortcuts.clear()
             except Exception:
                 pass
-            self._bridge_handlers.clear()
 
     return QuestWidget()
 